@@ -63,3 +63,22 @@ def build_connection_string(config_dict: dict, timeout: int = 30, trust_server_c
 EXPORT_DIR = os.getenv("EXPORT_DIR", "exports")
 MONTH_TO_EXPORT = os.getenv("MONTH_TO_EXPORT", "2025-09")  # September 2025
 
+
+# Bulk-copy loader (--loader bcp): bcp executable from the SQL Server command line utilities
+BCP_PATH = os.getenv("BCP_PATH", "bcp")
+# bcp logs in with -T (Windows/Kerberos auth). Set this to log it in with TARGET_USERNAME and -P
+# TARGET_PASSWORD instead: bcp has no other password channel, so the password is on its command
+# line, visible in the process list and in process-audit logs while bcp runs
+BCP_PASSWORD_ON_COMMAND_LINE = os.getenv("BCP_PASSWORD_ON_COMMAND_LINE", "0").lower() in ("1", "true", "yes")
+
+# Range deletes before a reload run as DELETE TOP (n) loops, committed per batch, to keep the log small
+DELETE_BATCH_ROWS = int(os.getenv("DELETE_BATCH_ROWS", "100000"))
+
+# Connection pools (utils/connection_pool.py): per-pool size, and seconds before a connection is recycled
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "16"))
+DB_POOL_MAX_LIFETIME = float(os.getenv("DB_POOL_MAX_LIFETIME", "1800"))
+
+# Per-unit checkpoints (utils/checkpoint_store.py): "sqlite" file under EXPORT_DIR, or "db" (etl_replica_progress,
+# migration 116); a running unit's lease is renewed while its run is alive and expires this many seconds after a crash
+CHECKPOINT_BACKEND = os.getenv("CHECKPOINT_BACKEND", "sqlite")
+CHECKPOINT_LEASE_SECONDS = float(os.getenv("CHECKPOINT_LEASE_SECONDS", "600"))
@@ -0,0 +1,23 @@
+-- High-water marks for incremental reference-table sync (replicate_reference_tables.py --full-table --incremental)
+-- Run this after 111_extend_replica_progress_table.sql
+
+USE MarryBrown_DW;
+GO
+
+IF OBJECT_ID('dbo.etl_replica_watermark', 'U') IS NULL
+BEGIN
+    CREATE TABLE dbo.etl_replica_watermark (
+        table_name NVARCHAR(200) NOT NULL PRIMARY KEY,
+        watermark VARBINARY(8) NOT NULL,          -- source MIN_ACTIVE_ROWVERSION() captured before the last sync
+        rows_applied BIGINT NULL,                 -- rows upserted (or loaded, for a full seed) by the last sync
+        sync_mode NVARCHAR(20) NOT NULL,          -- full, incremental
+        updated_at DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME()
+    );
+
+    PRINT 'Created dbo.etl_replica_watermark.';
+END
+ELSE
+BEGIN
+    PRINT 'dbo.etl_replica_watermark already exists.';
+END
+GO
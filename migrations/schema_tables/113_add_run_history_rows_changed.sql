@@ -0,0 +1,23 @@
+-- Record how many rows a run actually changed (T-1 hash-diff reconcile: run_replica_etl.py --t1-mode reconcile)
+-- Run this after 110_create_replica_metadata_tables.sql
+
+USE MarryBrown_DW;
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.columns
+    WHERE object_id = OBJECT_ID('dbo.replica_run_history')
+    AND name = 'rows_changed'
+)
+BEGIN
+    ALTER TABLE dbo.replica_run_history
+    ADD rows_changed BIGINT NULL,
+        run_details NVARCHAR(MAX) NULL;   -- JSON: per-table inserted/updated/deleted counts
+
+    PRINT 'Added rows_changed/run_details to replica_run_history table.';
+END
+ELSE
+BEGIN
+    PRINT 'rows_changed already exists in replica_run_history table.';
+END
+GO
@@ -0,0 +1,43 @@
+-- Convert the large sales replica tables to clustered columnstore
+-- Generated by: python scripts/generate_migration_from_schema.py --columnstore-conversion
+-- Run this after 100_create_replica_tables.sql. Load with --loader bcp or --loader tvp afterwards;
+-- executemany inserts go through the delta store instead of compressed rowgroups.
+
+USE MarryBrown_DW;
+GO
+
+IF OBJECT_ID('dbo.com_5013_APP_4_SALES', 'U') IS NOT NULL
+   AND NOT EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('dbo.com_5013_APP_4_SALES') AND type = 5)
+BEGIN
+    CREATE CLUSTERED COLUMNSTORE INDEX CCI_com_5013_APP_4_SALES ON dbo.com_5013_APP_4_SALES WITH (MAXDOP = 1);
+    PRINT 'Table dbo.com_5013_APP_4_SALES converted to clustered columnstore.';
+END
+ELSE
+BEGIN
+    PRINT 'Table dbo.com_5013_APP_4_SALES is missing or already clustered columnstore.';
+END;
+GO
+
+IF OBJECT_ID('dbo.com_5013_APP_4_SALESITEM', 'U') IS NOT NULL
+   AND NOT EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('dbo.com_5013_APP_4_SALESITEM') AND type = 5)
+BEGIN
+    CREATE CLUSTERED COLUMNSTORE INDEX CCI_com_5013_APP_4_SALESITEM ON dbo.com_5013_APP_4_SALESITEM WITH (MAXDOP = 1);
+    PRINT 'Table dbo.com_5013_APP_4_SALESITEM converted to clustered columnstore.';
+END
+ELSE
+BEGIN
+    PRINT 'Table dbo.com_5013_APP_4_SALESITEM is missing or already clustered columnstore.';
+END;
+GO
+
+IF OBJECT_ID('dbo.com_5013_APP_4_PAYMENT', 'U') IS NOT NULL
+   AND NOT EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('dbo.com_5013_APP_4_PAYMENT') AND type = 5)
+BEGIN
+    CREATE CLUSTERED COLUMNSTORE INDEX CCI_com_5013_APP_4_PAYMENT ON dbo.com_5013_APP_4_PAYMENT WITH (MAXDOP = 1);
+    PRINT 'Table dbo.com_5013_APP_4_PAYMENT converted to clustered columnstore.';
+END
+ELSE
+BEGIN
+    PRINT 'Table dbo.com_5013_APP_4_PAYMENT is missing or already clustered columnstore.';
+END;
+GO
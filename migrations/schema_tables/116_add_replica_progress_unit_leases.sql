@@ -0,0 +1,39 @@
+-- Per-unit checkpoint store (--checkpoint-store db): one row per (table, month/partition) with run ID and lease
+-- Run this after 111_extend_replica_progress_table.sql
+
+USE MarryBrown_DW;
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.columns
+    WHERE object_id = OBJECT_ID('dbo.etl_replica_progress')
+    AND name = 'unit_key'
+)
+BEGIN
+    ALTER TABLE dbo.etl_replica_progress
+    ADD unit_key NVARCHAR(100) NULL,        -- month key or adaptive partition key; NULL for other progress rows
+        run_id NVARCHAR(32) NULL,           -- run that last claimed the unit
+        lease_expires DATETIME2 NULL;       -- running units whose lease passed may be claimed by another run
+
+    PRINT 'Added unit_key/run_id/lease_expires to etl_replica_progress table.';
+END
+ELSE
+BEGIN
+    PRINT 'unit_key already exists in etl_replica_progress table.';
+END
+GO
+
+IF NOT EXISTS (
+    SELECT 1 FROM sys.indexes
+    WHERE object_id = OBJECT_ID('dbo.etl_replica_progress')
+    AND name = 'UX_etl_replica_progress_unit'
+)
+BEGIN
+    CREATE UNIQUE INDEX UX_etl_replica_progress_unit
+        ON dbo.etl_replica_progress (table_name, unit_key)
+        INCLUDE (status, run_id, lease_expires)
+        WHERE unit_key IS NOT NULL;
+
+    PRINT 'Created UX_etl_replica_progress_unit.';
+END
+GO
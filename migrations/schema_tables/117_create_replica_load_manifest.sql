@@ -0,0 +1,29 @@
+-- Load manifest: rows loaded per target table and date range, recorded when a load commits
+-- (table_already_loaded / --skip-existing look ranges up here instead of counting target rows)
+-- Run this after 110_create_replica_metadata_tables.sql
+
+USE MarryBrown_DW;
+GO
+
+IF OBJECT_ID('dbo.etl_replica_load_manifest', 'U') IS NULL
+BEGIN
+    CREATE TABLE dbo.etl_replica_load_manifest (
+        target_table NVARCHAR(256) NOT NULL,
+        range_start DATETIME2 NOT NULL,           -- full-table loads: 0001-01-01
+        range_end DATETIME2 NOT NULL,             -- exclusive; full-table loads: 9999-12-31
+        status NVARCHAR(20) NOT NULL,             -- loading, loaded
+        rows_loaded BIGINT NOT NULL,
+        source_rows BIGINT NULL,                  -- rows read from Xilnex for this load
+        id_checksum DECIMAL(38, 0) NULL,          -- SUM(ID) of the loaded rows
+        load_mode NVARCHAR(20) NULL,              -- loader / load path
+        loaded_at DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME(),
+        CONSTRAINT PK_etl_replica_load_manifest PRIMARY KEY (target_table, range_start, range_end)
+    );
+
+    PRINT 'Created dbo.etl_replica_load_manifest.';
+END
+ELSE
+BEGIN
+    PRINT 'dbo.etl_replica_load_manifest already exists.';
+END
+GO
@@ -0,0 +1,117 @@
+"""
+Micro-benchmark: legacy row conversion vs the compiled per-table RowConverter.
+
+Builds a synthetic Arrow batch shaped like a replicated table (column types from
+xilnex_full_schema.json) and measures rows/sec for:
+
+- legacy:          to_pandas -> prepare_data_for_sql -> build_row_tuple
+- compiled-pandas: RowConverter on the same pandas DataFrame
+- compiled-arrow:  RowConverter straight from the Arrow batch (streaming loaders)
+
+No database connection is required.
+
+Usage:
+    python scripts/benchmark_row_converter.py --table APP_4_SALES --rows 20000
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import pyarrow as pa  # noqa: E402
+
+from replicate_reference_tables import (  # noqa: E402
+    build_row_tuple,
+    load_schema,
+    prepare_data_for_sql,
+)
+from utils.arrow_fetch import arrow_schema_for  # noqa: E402
+from utils.row_converter import compile_row_converter  # noqa: E402
+
+
+def synthetic_value(rng: random.Random, sql_type: str, row_idx: int):
+    if rng.random() < 0.15:
+        return None
+    t = sql_type.lower()
+    if t in ("int", "bigint", "smallint", "tinyint"):
+        return row_idx if t == "bigint" else rng.randint(0, 255)
+    if t in ("decimal", "numeric"):
+        return Decimal(f"{rng.uniform(0, 1000):.4f}")
+    if t == "datetime":
+        return datetime(2025, 1, 1) + timedelta(seconds=rng.randint(0, 86400 * 365), microseconds=rng.randint(0, 999999))
+    if t == "date":
+        return date(2025, 1, 1) + timedelta(days=rng.randint(0, 364))
+    if t == "timestamp":
+        return rng.getrandbits(64).to_bytes(8, "big")
+    return f"value-{rng.randint(0, 9999)}"
+
+
+def build_batch(schema_entry: dict, rows: int, seed: int) -> pa.RecordBatch:
+    rng = random.Random(seed)
+    arrow_schema = arrow_schema_for(schema_entry)
+    arrays = []
+    for col in schema_entry["columns"]:
+        values = [synthetic_value(rng, col.get("type", ""), i) for i in range(rows)]
+        field = arrow_schema.field(col["name"])
+        if col.get("type", "").lower() in ("decimal", "numeric"):
+            arrays.append(pa.array(values).cast(field.type))
+        else:
+            arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=arrow_schema)
+
+
+def time_it(label: str, rows: int, func, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    assert len(result) == rows, f"{label}: produced {len(result)} rows, expected {rows}"
+    rate = rows / best if best else float("inf")
+    print(f"  {label:<18} {best:8.3f}s  {rate:>12,.0f} rows/sec")
+    return rate
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark legacy vs compiled row conversion.")
+    parser.add_argument("--table", default="APP_4_SALES", help="Table whose schema to mimic (default: %(default)s).")
+    parser.add_argument("--rows", type=int, default=20000, help="Rows in the synthetic batch (default: %(default)s).")
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of-N timing repeats (default: %(default)s).")
+    parser.add_argument("--seed", type=int, default=5013)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    schema = load_schema()
+    if args.table not in schema:
+        print(f"[ERROR] Table {args.table} not found in schema", file=sys.stderr)
+        sys.exit(1)
+    schema_entry = schema[args.table]
+    columns = [col["name"] for col in schema_entry["columns"]]
+
+    batch = build_batch(schema_entry, args.rows, args.seed)
+    converter = compile_row_converter(schema_entry)
+    frame = batch.to_pandas(timestamp_as_object=True)
+
+    def legacy():
+        df = prepare_data_for_sql(batch.to_pandas(timestamp_as_object=True), schema_entry)
+        return [build_row_tuple(row) for row in df[columns].itertuples(index=False, name=None)]
+
+    print(f"[BENCH] {args.table}: {len(columns)} columns x {args.rows:,} rows (best of {args.repeat})")
+    legacy_rate = time_it("legacy", args.rows, legacy, args.repeat)
+    pandas_rate = time_it("compiled-pandas", args.rows, lambda: converter.convert(frame), args.repeat)
+    arrow_rate = time_it("compiled-arrow", args.rows, lambda: converter.convert(batch), args.repeat)
+    print(f"[BENCH] speedup vs legacy: pandas x{pandas_rate / legacy_rate:.1f}, arrow x{arrow_rate / legacy_rate:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark: --transform-mode thread vs process on synthetic chunks.
+
+Simulates N month workers, each transforming its own stream of chunks:
+
+- thread:  N threads convert chunks in-process (they share the GIL)
+- process: the same N threads hand chunks to the shared process pool
+           (Arrow IPC via shared memory), as stream_month_to_target does
+
+With --render-bcp the transform also renders the bcp data file, which is what
+the bcp loader's transform stage does. No database connection is required.
+
+Usage:
+    python scripts/benchmark_transform_modes.py --table APP_4_SALESITEM --chunks 24 --workers 6 --render-bcp
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+
+from benchmark_row_converter import build_batch  # noqa: E402
+from replicate_reference_tables import load_schema  # noqa: E402
+from utils.loaders import write_bcp_file  # noqa: E402
+from utils.process_transform import RenderedBcpChunk, get_transform_pool, shutdown_transform_pool  # noqa: E402
+from utils.row_converter import compile_row_converter  # noqa: E402
+
+
+def run_thread_mode(schema_entry, batch, columns, chunks, workers, render_bcp) -> int:
+    converter = compile_row_converter(schema_entry)
+
+    def transform(_):
+        rows = converter.convert(batch, columns)
+        if render_bcp:
+            handle, path = tempfile.mkstemp(prefix="bcp_", suffix=".dat")
+            os.close(handle)
+            write_bcp_file(rows, path)
+            os.remove(path)
+        return len(rows)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return sum(executor.map(transform, range(chunks)))
+
+
+def run_process_mode(schema_entry, batch, columns, chunks, workers, render_bcp) -> int:
+    pool = get_transform_pool()
+
+    def transform(_):
+        outcome = pool.submit(schema_entry, batch, columns, render_bcp=render_bcp).result()
+        if isinstance(outcome, RenderedBcpChunk):
+            outcome.discard()
+        return len(outcome)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return sum(executor.map(transform, range(chunks)))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark thread vs process chunk transformation.")
+    parser.add_argument("--table", default="APP_4_SALESITEM", help="Table whose schema to mimic (default: %(default)s).")
+    parser.add_argument("--rows", type=int, default=10000, help="Rows per chunk (default: %(default)s).")
+    parser.add_argument("--chunks", type=int, default=24, help="Chunks transformed per mode (default: %(default)s).")
+    parser.add_argument("--workers", type=int, default=6, help="Simulated month workers (default: %(default)s).")
+    parser.add_argument(
+        "--transform-workers",
+        type=int,
+        default=None,
+        help="Process pool size (default: CPU count - 1).",
+    )
+    parser.add_argument("--render-bcp", action="store_true", help="Also render bcp data files in the transform.")
+    parser.add_argument("--seed", type=int, default=5013)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    schema = load_schema()
+    if args.table not in schema:
+        print(f"[ERROR] Table {args.table} not found in schema", file=sys.stderr)
+        sys.exit(1)
+    schema_entry = schema[args.table]
+    columns = [col["name"] for col in schema_entry["columns"]]
+    batch = build_batch(schema_entry, args.rows, args.seed)
+    expected = args.rows * args.chunks
+
+    pool = get_transform_pool(args.transform_workers)
+    # Warm-up: start the worker processes and compile their converters outside the timing
+    run_process_mode(schema_entry, batch, columns, pool.max_workers, pool.max_workers, args.render_bcp)
+
+    print(
+        f"[BENCH] {args.table}: {len(columns)} columns, {args.chunks} chunk(s) x {args.rows:,} rows, "
+        f"{args.workers} month worker(s), {pool.max_workers} transform process(es)"
+        f"{', rendering bcp files' if args.render_bcp else ''}"
+    )
+    rates = {}
+    for label, runner in (("thread", run_thread_mode), ("process", run_process_mode)):
+        start = time.perf_counter()
+        total = runner(schema_entry, batch, columns, args.chunks, args.workers, args.render_bcp)
+        elapsed = time.perf_counter() - start
+        assert total == expected, f"{label}: produced {total} rows, expected {expected}"
+        rates[label] = total / elapsed if elapsed else float("inf")
+        print(f"  {label:<8} {elapsed:8.3f}s  {rates[label]:>12,.0f} rows/sec")
+    print(f"[BENCH] process vs thread: x{rates['process'] / rates['thread']:.2f}")
+    shutdown_transform_pool()
+
+
+if __name__ == "__main__":
+    main()
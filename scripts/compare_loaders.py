@@ -0,0 +1,159 @@
+"""
+Throughput comparison of the target loaders (utils/loaders.py) per table.
+
+For each table, a sample is read once and converted to row tuples. The sample
+is either the first --rows rows from Xilnex, or a synthetic batch when
+--synthetic is given (no source connection needed). Each loader then writes the
+same chunks into a scratch copy of the target table
+(dbo.com_5013_<TABLE>__loader_bench, a heap created with SELECT TOP 0 INTO).
+The script reports rows/sec and the fastest loader for each table. It drops
+the scratch tables (and any TVP table types) when it finishes.
+
+Usage:
+    python scripts/compare_loaders.py --table APP_4_SALES --table APP_4_PAYMENT --rows 200000
+    python scripts/compare_loaders.py --table APP_4_SALESITEM --loader executemany --loader bcp --synthetic
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+
+from benchmark_row_converter import build_batch  # noqa: E402
+from replicate_reference_tables import (  # noqa: E402
+    build_select_statement,
+    create_target_loader,
+    get_source_connection,
+    get_target_connection,
+    load_schema,
+)
+from utils.arrow_fetch import PyodbcArrowBackend  # noqa: E402
+from utils.loaders import LOADERS  # noqa: E402
+from utils.row_converter import compile_row_converter  # noqa: E402
+
+DEFAULT_TABLES = ["APP_4_SALES", "APP_4_SALESITEM", "APP_4_PAYMENT"]
+
+
+def read_sample(table_name: str, schema_entry: dict, rows: int, chunk_size: int, synthetic: bool) -> List[List[tuple]]:
+    """Return the sample as converted row-tuple chunks."""
+    columns = [col["name"] for col in schema_entry["columns"]]
+    converter = compile_row_converter(schema_entry)
+    if synthetic:
+        batch = build_batch(schema_entry, rows, seed=5013)
+        return [converter.convert(batch.slice(i, chunk_size), columns) for i in range(0, batch.num_rows, chunk_size)]
+
+    query, params = build_select_statement(table_name, schema_entry, None, None, full_table=True)
+    query = query.replace("SELECT ", f"SELECT TOP ({int(rows)}) ", 1)
+    source_conn = get_source_connection()
+    try:
+        reader = PyodbcArrowBackend(source_conn)
+        return [
+            converter.convert(batch, columns)
+            for batch in reader.iter_batches(query, params, schema_entry, chunk_size)
+            if batch.num_rows
+        ]
+    finally:
+        source_conn.close()
+
+
+def time_loader(
+    name: str, conn, target_table: str, bench_table: str, columns: List[str], chunks: List[List[tuple]]
+) -> float:
+    """Load every chunk into the (empty) bench table with one loader; returns seconds."""
+    cursor = conn.cursor()
+    cursor.execute(f"TRUNCATE TABLE {bench_table}")
+    conn.commit()
+    start = time.perf_counter()
+    chunk_loader = create_target_loader(name, conn, bench_table, columns, type_table=target_table)
+    try:
+        for chunk in chunks:
+            chunk_loader.load(chunk)
+        chunk_loader.flush()
+        conn.commit()
+    finally:
+        chunk_loader.close()
+    elapsed = time.perf_counter() - start
+    cursor.execute(f"SELECT COUNT_BIG(*) FROM {bench_table}")
+    loaded = cursor.fetchone()[0]
+    expected = sum(len(chunk) for chunk in chunks)
+    if loaded != expected:
+        raise RuntimeError(f"{name}: bench table has {loaded:,} rows, expected {expected:,}")
+    return elapsed
+
+
+def compare_table(table_name: str, schema_entry: dict, args: argparse.Namespace) -> Dict[str, float]:
+    """Returns {loader: rows/sec} for one table (failed loaders are reported and left out)."""
+    columns = [col["name"] for col in schema_entry["columns"]]
+    target_table = f"dbo.com_5013_{table_name}"
+    bench_table = f"{target_table}__loader_bench"
+
+    chunks = read_sample(table_name, schema_entry, args.rows, args.chunk_size, args.synthetic)
+    total = sum(len(chunk) for chunk in chunks)
+    print(f"\n[BENCH] {table_name}: {len(columns)} columns x {total:,} rows in {len(chunks)} chunk(s)")
+    if not total:
+        return {}
+
+    conn = get_target_connection()
+    cursor = conn.cursor()
+    rates: Dict[str, float] = {}
+    try:
+        cursor.execute(f"IF OBJECT_ID('{bench_table}', 'U') IS NOT NULL DROP TABLE {bench_table}")
+        cursor.execute(f"SELECT TOP 0 {', '.join(columns)} INTO {bench_table} FROM {target_table}")
+        conn.commit()
+        for name in args.loader or list(LOADERS):
+            try:
+                best = min(time_loader(name, conn, target_table, bench_table, columns, chunks) for _ in range(args.repeat))
+            except Exception as exc:  # pylint: disable=broad-except
+                conn.rollback()
+                print(f"  {name:<12} FAILED: {exc}", file=sys.stderr)
+                continue
+            rates[name] = total / best if best else float("inf")
+            print(f"  {name:<12} {best:8.2f}s  {rates[name]:>12,.0f} rows/sec")
+    finally:
+        cursor.execute(f"IF OBJECT_ID('{bench_table}', 'U') IS NOT NULL DROP TABLE {bench_table}")
+        conn.commit()
+        conn.close()
+    return rates
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare target loader throughput per table.")
+    parser.add_argument("--table", action="append", help=f"Table(s) to compare (default: {', '.join(DEFAULT_TABLES)}).")
+    parser.add_argument("--loader", action="append", choices=LOADERS, help="Loader(s) to compare (default: all).")
+    parser.add_argument("--rows", type=int, default=100000, help="Sample rows per table (default: %(default)s).")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Rows per load() call (default: %(default)s).")
+    parser.add_argument("--repeat", type=int, default=1, help="Best-of-N timing repeats (default: %(default)s).")
+    parser.add_argument("--synthetic", action="store_true", help="Use synthetic rows instead of reading Xilnex.")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    schema = load_schema()
+    results: Dict[str, Dict[str, float]] = {}
+    for table in args.table or DEFAULT_TABLES:
+        if table not in schema:
+            print(f"[WARN] {table}: not in schema, skipping", file=sys.stderr)
+            continue
+        results[table] = compare_table(table, schema[table], args)
+
+    print(f"\n{'='*70}")
+    print("[BENCH] Fastest loader per table")
+    print(f"{'='*70}")
+    for table, rates in results.items():
+        if not rates:
+            print(f"  {table:<28} no successful loads")
+            continue
+        best = max(rates, key=rates.get)
+        baseline = rates.get("executemany")
+        speedup = f" (x{rates[best] / baseline:.1f} vs executemany)" if baseline else ""
+        print(f"  {table:<28} --loader {best:<12} {rates[best]:>12,.0f} rows/sec{speedup}")
+
+
+if __name__ == "__main__":
+    main()
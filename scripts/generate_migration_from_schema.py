@@ -1,14 +1,26 @@
 """
 Generate migration SQL from actual Xilnex schema.
 This ensures we replicate exactly what exists in Xilnex, not what we think should be there.
+
+--columnstore creates the large sales tables (utils/columnstore.COLUMNSTORE_TABLES)
+as clustered columnstore instead of heaps, and converts them if they already exist.
+--columnstore-conversion writes only that conversion, as a standalone migration
+for existing databases.
 """
+import argparse
 import json
+import sys
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from utils.columnstore import COLUMNSTORE_TABLES  # noqa: E402
+
 SCHEMA_FILE = PROJECT_ROOT / "docs" / "xilnex_full_schema.json"
 REPLICA_SCHEMA = PROJECT_ROOT / "docs" / "replica_schema.json"
 OUTPUT_FILE = PROJECT_ROOT / "migrations" / "schema_tables" / "100_create_replica_tables.sql"
+COLUMNSTORE_OUTPUT_FILE = PROJECT_ROOT / "migrations" / "schema_tables" / "114_convert_sales_tables_to_columnstore.sql"
 
 # Tables to replicate (from replica_schema.json)
 replica_data = json.loads(REPLICA_SCHEMA.read_text(encoding="utf-8"))
@@ -93,8 +105,29 @@ def sql_type_from_schema(col, table_name=None):
         return col_type
 
 
-def generate_table_sql(table_name, schema_entry):
-    """Generate CREATE TABLE SQL for a single table."""
+def generate_columnstore_sql(table_name):
+    """Convert an existing heap replica table to clustered columnstore (no-op if it already is)."""
+    target_table = f"dbo.com_5013_{table_name}"
+    index_name = f"CCI_com_5013_{table_name}"
+    return "\n".join([
+        f"IF OBJECT_ID('{target_table}', 'U') IS NOT NULL",
+        f"   AND NOT EXISTS (SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID('{target_table}') AND type = 5)",
+        "BEGIN",
+        # MAXDOP 1: a parallel build splits rows across threads and leaves trimmed rowgroups
+        f"    CREATE CLUSTERED COLUMNSTORE INDEX {index_name} ON {target_table} WITH (MAXDOP = 1);",
+        f"    PRINT 'Table {target_table} converted to clustered columnstore.';",
+        "END",
+        "ELSE",
+        "BEGIN",
+        f"    PRINT 'Table {target_table} is missing or already clustered columnstore.';",
+        "END;",
+        "GO",
+        "",
+    ])
+
+
+def generate_table_sql(table_name, schema_entry, columnstore=False):
+    """Generate CREATE TABLE SQL for a single table (clustered columnstore when columnstore=True)."""
     target_table = f"dbo.com_5013_{table_name}"
     columns = schema_entry["columns"]
     
@@ -117,6 +150,8 @@ def generate_table_sql(table_name, schema_entry):
         
         col_defs.append(f"        {col_name} {sql_type} {nullable}")
     
+    if columnstore:
+        col_defs.append(f"        INDEX CCI_com_5013_{table_name} CLUSTERED COLUMNSTORE")
     sql_lines.append(",\n".join(col_defs))
     sql_lines.append("    );")
     sql_lines.append(f"    PRINT 'Table {target_table} created.';")
@@ -128,10 +163,60 @@ def generate_table_sql(table_name, schema_entry):
     sql_lines.append("GO")
     sql_lines.append("")
     
+    if columnstore:
+        sql_lines.append(generate_columnstore_sql(table_name))
+    
     return "\n".join(sql_lines)
 
 
+def write_columnstore_migration(tables):
+    """Standalone migration converting existing replica tables to clustered columnstore."""
+    output_lines = [
+        "-- Convert the large sales replica tables to clustered columnstore",
+        "-- Generated by: python scripts/generate_migration_from_schema.py --columnstore-conversion",
+        "-- Run this after 100_create_replica_tables.sql. Load with --loader bcp or --loader tvp afterwards;",
+        "-- executemany inserts go through the delta store instead of compressed rowgroups.",
+        "",
+        "USE MarryBrown_DW;",
+        "GO",
+        "",
+    ]
+    for table_name in tables:
+        output_lines.append(generate_columnstore_sql(table_name))
+    COLUMNSTORE_OUTPUT_FILE.write_text("\n".join(output_lines), encoding="utf-8")
+    print(f"[OK] Columnstore migration written to {COLUMNSTORE_OUTPUT_FILE}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate replica table migrations from the Xilnex schema.")
+    parser.add_argument(
+        "--columnstore",
+        action="store_true",
+        help=f"Create {', '.join(COLUMNSTORE_TABLES)} as clustered columnstore tables.",
+    )
+    parser.add_argument(
+        "--columnstore-table",
+        action="append",
+        default=[],
+        help="Additional table to create as clustered columnstore (repeatable; implies --columnstore).",
+    )
+    parser.add_argument(
+        "--columnstore-conversion",
+        action="store_true",
+        help=f"Only write {COLUMNSTORE_OUTPUT_FILE.name} (convert existing tables), not {OUTPUT_FILE.name}.",
+    )
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
+    columnstore_tables = set(args.columnstore_table)
+    if args.columnstore or args.columnstore_conversion:
+        columnstore_tables.update(COLUMNSTORE_TABLES)
+    if args.columnstore_conversion:
+        write_columnstore_migration([t for t in table_names if t in columnstore_tables])
+        return
+
     print(f"Reading schema from {SCHEMA_FILE}")
     print(f"Generating migration for {len(table_names)} tables...")
     
@@ -152,9 +237,11 @@ def main():
                 continue
         
         schema_entry = full_schema[full_table_key]
-        table_sql = generate_table_sql(table_name, schema_entry)
+        columnstore = table_name in columnstore_tables
+        table_sql = generate_table_sql(table_name, schema_entry, columnstore=columnstore)
         output_lines.append(table_sql)
-        print(f"[OK] Generated SQL for {table_name} ({len(schema_entry['columns'])} columns)")
+        layout = ", clustered columnstore" if columnstore else ""
+        print(f"[OK] Generated SQL for {table_name} ({len(schema_entry['columns'])} columns{layout})")
     
     if missing_tables:
         print(f"\n[WARN] Missing tables: {', '.join(missing_tables)}")
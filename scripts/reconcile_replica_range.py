@@ -0,0 +1,236 @@
+"""
+Hash-diff reconciliation of date-based replica tables for a date range.
+
+Instead of deleting and reloading the whole range, each table is compared row by
+row via per-row hashes computed on source and target (utils/hash_diff.py). Only
+the differences are applied, in one transaction per table:
+
+- inserted/updated rows are fetched from source by ID, staged in a #temp table
+  and MERGEd on ID
+- deleted rows (in the target range but no longer on source) are removed by ID
+
+With --checksum-tree, the differing IDs are located first with bucketed
+CHECKSUM_AGG queries (utils/checksum_tree.py), so only the hashes of a few
+hundred candidate rows per changed day cross the network instead of every row's.
+
+Used by run_replica_etl.py for the T-1 back-check (--t1-mode reconcile).
+
+Usage:
+    python scripts/reconcile_replica_range.py --start-date 2025-11-24 --end-date 2025-11-25
+    python scripts/reconcile_replica_range.py --start-date 2025-11-24 --end-date 2025-11-25 --table APP_4_SALES --dry-run
+    python scripts/reconcile_replica_range.py --start-date 2025-11-01 --end-date 2025-12-01 --checksum-tree --dry-run
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+
+from replicate_reference_tables import (  # noqa: E402
+    DATE_FILTER_COLUMNS,
+    UPSERT_KEY_COLUMN,
+    build_select_statement,
+    get_source_connection,
+    get_target_connection,
+    load_schema,
+)
+from utils.arrow_fetch import PyodbcArrowBackend  # noqa: E402
+from utils.checksum_tree import ChecksumTree  # noqa: E402
+from utils.hash_diff import diff_row_hashes, fetch_row_hashes, row_hash_expression  # noqa: E402
+from utils.row_converter import compile_row_converter  # noqa: E402
+
+# IDs per source fetch / target delete statement (SQL Server allows 2100 parameters)
+KEY_BATCH_SIZE = 1000
+
+
+def _key_batches(keys: List, size: int = KEY_BATCH_SIZE):
+    for i in range(0, len(keys), size):
+        yield keys[i:i + size]
+
+
+def reconcile_table_range(
+    table_name: str,
+    schema_entry: dict,
+    start_date: str,
+    end_date: str,
+    dry_run: bool = False,
+    checksum_tree: bool = False,
+) -> Dict[str, int]:
+    """
+    Reconcile one table for [start_date, end_date).
+
+    With ``checksum_tree`` the changed keys are located with bucketed checksums
+    instead of fetching every row hash of the range.
+
+    Returns:
+        {"source_rows", "target_rows", "inserted", "updated", "deleted"}
+    """
+    date_column = DATE_FILTER_COLUMNS[table_name]
+    target_table = f"dbo.com_5013_{table_name}"
+    source_table = f"{schema_entry.get('schema', 'COM_5013')}.{table_name}"
+    columns = [col["name"] for col in schema_entry["columns"]]
+    column_list = ", ".join(columns)
+    placeholders = ", ".join(["?"] * len(columns))
+    stage_table = f"#reconcile_{table_name}"
+    hash_expr = row_hash_expression(schema_entry)
+
+    source_conn = get_source_connection()
+    target_conn = get_target_connection()
+    try:
+        hash_start = time.perf_counter()
+        if checksum_tree:
+            column_type = next(
+                ((col.get("type") or "").lower() for col in schema_entry["columns"] if col["name"] == date_column),
+                "datetime",
+            )
+            tree = ChecksumTree(
+                source_conn, target_conn, source_table, target_table, hash_expr, date_column, column_type
+            )
+            try:
+                days = tree.drill_range(start_date, end_date, label=table_name)
+            finally:
+                tree.close()
+            inserted = [key for found in days.values() for key in found["inserted"]]
+            updated = [key for found in days.values() for key in found["updated"]]
+            deleted = [key for found in days.values() for key in found["deleted"]]
+            source_rows, target_rows = tree.row_counts
+        else:
+            source_hashes = fetch_row_hashes(
+                source_conn, source_table, UPSERT_KEY_COLUMN, hash_expr, date_column, start_date, end_date
+            )
+            target_hashes = fetch_row_hashes(
+                target_conn, target_table, UPSERT_KEY_COLUMN, hash_expr, date_column, start_date, end_date
+            )
+            inserted, updated, deleted = diff_row_hashes(source_hashes, target_hashes)
+            source_rows, target_rows = len(source_hashes), len(target_hashes)
+        stats = {
+            "source_rows": source_rows,
+            "target_rows": target_rows,
+            "inserted": len(inserted),
+            "updated": len(updated),
+            "deleted": len(deleted),
+        }
+        print(
+            f"[RECONCILE] {table_name} {start_date}..{end_date}: source {stats['source_rows']:,} | "
+            f"target {stats['target_rows']:,} | +{stats['inserted']:,} ~{stats['updated']:,} -{stats['deleted']:,} "
+            f"(hashed in {time.perf_counter() - hash_start:.1f}s)"
+        )
+        if dry_run or not (inserted or updated or deleted):
+            return stats
+
+        cursor = target_conn.cursor()
+        cursor.fast_executemany = True
+        changed_keys = inserted + updated
+        if changed_keys:
+            # Pull only the changed rows from source, by ID
+            base_query, _ = build_select_statement(table_name, schema_entry, None, None, full_table=True)
+            reader = PyodbcArrowBackend(source_conn)
+            row_converter = compile_row_converter(schema_entry)
+            cursor.execute(f"IF OBJECT_ID('tempdb..{stage_table}') IS NOT NULL DROP TABLE {stage_table}")
+            cursor.execute(f"SELECT TOP 0 {column_list} INTO {stage_table} FROM {target_table}")
+            for key_batch in _key_batches(changed_keys):
+                query = f"{base_query} WHERE {UPSERT_KEY_COLUMN} IN ({', '.join(['?'] * len(key_batch))})"
+                for batch in reader.iter_batches(query, key_batch, schema_entry, KEY_BATCH_SIZE):
+                    if batch.num_rows:
+                        cursor.executemany(
+                            f"INSERT INTO {stage_table} ({column_list}) VALUES ({placeholders})",
+                            row_converter.convert(batch, columns),
+                        )
+
+            update_set = ", ".join(f"target.{col} = source.{col}" for col in columns if col != UPSERT_KEY_COLUMN)
+            source_values = ", ".join(f"source.{col}" for col in columns)
+            cursor.execute(f"""
+                MERGE {target_table} WITH (HOLDLOCK) AS target
+                USING {stage_table} AS source
+                ON target.{UPSERT_KEY_COLUMN} = source.{UPSERT_KEY_COLUMN}
+                WHEN MATCHED THEN
+                    UPDATE SET {update_set}
+                WHEN NOT MATCHED THEN
+                    INSERT ({column_list}) VALUES ({source_values});
+            """)
+
+        for key_batch in _key_batches(deleted):
+            cursor.execute(
+                f"DELETE FROM {target_table} WHERE {UPSERT_KEY_COLUMN} IN ({', '.join(['?'] * len(key_batch))})",
+                *key_batch,
+            )
+
+        target_conn.commit()
+        if changed_keys:
+            cursor.execute(f"DROP TABLE {stage_table}")
+            target_conn.commit()
+        return stats
+    except Exception:
+        target_conn.rollback()
+        raise
+    finally:
+        source_conn.close()
+        target_conn.close()
+
+
+def reconcile_range(
+    start_date: str,
+    end_date: str,
+    tables: Optional[List[str]] = None,
+    dry_run: bool = False,
+    checksum_tree: bool = False,
+) -> Dict[str, Dict[str, int]]:
+    """
+    Reconcile the given date-based tables (default: all) for [start_date, end_date).
+
+    Raises RuntimeError after processing every table if any of them failed.
+    """
+    schema = load_schema()
+    tables = tables or [table for table in DATE_FILTER_COLUMNS if table in schema]
+    results: Dict[str, Dict[str, int]] = {}
+    failures: List[str] = []
+    for table in tables:
+        if table not in DATE_FILTER_COLUMNS or table not in schema:
+            print(f"[WARN] {table}: not a date-based table in schema, skipping", file=sys.stderr)
+            continue
+        try:
+            results[table] = reconcile_table_range(
+                table, schema[table], start_date, end_date, dry_run=dry_run, checksum_tree=checksum_tree
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            failures.append(f"{table}: {exc}")
+            print(f"[ERROR] {table}: reconcile failed: {exc}", file=sys.stderr)
+
+    changed = sum(r["inserted"] + r["updated"] + r["deleted"] for r in results.values())
+    print(f"[RECONCILE] {len(results)} table(s), {changed:,} row(s) {'would change' if dry_run else 'changed'}")
+    if failures:
+        raise RuntimeError("; ".join(failures))
+    return results
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Hash-diff reconcile replica tables for a date range.")
+    parser.add_argument("--start-date", required=True, help="Start date (inclusive) in YYYY-MM-DD format.")
+    parser.add_argument("--end-date", required=True, help="End date (exclusive) in YYYY-MM-DD format.")
+    parser.add_argument("--table", action="append", help="Table(s) to reconcile (default: all date-based tables).")
+    parser.add_argument("--dry-run", action="store_true", help="Report differences without applying them.")
+    parser.add_argument(
+        "--checksum-tree",
+        action="store_true",
+        help="Locate changed rows with bucketed checksums instead of fetching every row hash.",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    try:
+        reconcile_range(
+            args.start_date, args.end_date, tables=args.table, dry_run=args.dry_run, checksum_tree=args.checksum_tree
+        )
+    except RuntimeError:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,42 @@
 """
-Orchestrate sequential replication of all sales tables using the monthly streaming pipeline.
+Orchestrate replication of all sales tables using the monthly streaming pipeline.
+
+By default every (table, month/partition) unit goes into one global queue:
+--max-streams caps concurrent source read streams across all tables, and
+--max-workers caps streams per table (target-side deadlock limit). Use
+--scheduler sequential for the old table-after-table behaviour.
 
 Usage:
     python scripts/replicate_all_sales_data.py --start-date 2025-10-01 --end-date 2025-11-30 --max-workers 2
+    python scripts/replicate_all_sales_data.py --start-date 2025-10-01 --end-date 2025-11-30 --max-streams 8 --table-max-workers APP_4_SALESITEM=3
 """
 
 import argparse
 import sys
 from pathlib import Path
+from typing import Dict, List
 
 # Ensure project root is on sys.path so we can import peer modules
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from scripts.replicate_monthly_parallel_streaming import replicate_monthly_parallel  # noqa: E402
+from scripts.replicate_monthly_parallel_streaming import (  # noqa: E402
+    disable_table_indexes,
+    prepare_table_units,
+    print_table_summary,
+    rebuild_table_indexes,
+    record_unit_result,
+    replicate_monthly_parallel,
+    report_table_rowgroups,
+    stream_unit,
+)
 import config  # noqa: E402
+from utils.arrow_fetch import FETCH_BACKENDS  # noqa: E402
+from utils.checkpoint_store import CHECKPOINT_BACKENDS  # noqa: E402
+from utils.connection_pool import report_pools  # noqa: E402
+from utils.loaders import LOADERS  # noqa: E402
+from utils.process_transform import TRANSFORM_MODES, resolve_transform_mode  # noqa: E402
+from utils.scheduler import StreamScheduler  # noqa: E402
 
 
 # Tables to process (must be present in DATE_FILTER_COLUMNS in replicate_reference_tables.py)
@@ -57,7 +79,26 @@ def parse_args() -> argparse.Namespace:
         "--max-workers",
         type=int,
         default=2,
-        help="Parallel workers per table (default: %(default)s).",
+        help="Parallel workers (source streams) per table (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--max-streams",
+        type=int,
+        default=6,
+        help="Global cap on concurrent source streams across all tables (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--table-max-workers",
+        action="append",
+        default=[],
+        metavar="TABLE=N",
+        help="Per-table stream cap overriding --max-workers (e.g., APP_4_SALESITEM=3). Can be repeated.",
+    )
+    parser.add_argument(
+        "--scheduler",
+        choices=("global", "sequential"),
+        default="global",
+        help="One cross-table queue, or tables one after another (default: %(default)s).",
     )
     parser.add_argument(
         "--chunk-size",
@@ -71,16 +112,193 @@ def parse_args() -> argparse.Namespace:
         default=100000,
         help="Rows per commit interval (default matches replicate_monthly_parallel).",
     )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=3,
+        help="Number of retries per month on transient connection failures (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--fetch-backend",
+        choices=FETCH_BACKENDS,
+        default="auto",
+        help="Columnar source reader: arrow-odbc if installed, else pyodbc (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--queue-depth",
+        type=int,
+        default=2,
+        help="Chunks buffered between fetch, transform and insert stages per month (default: %(default)s).",
+    )
     parser.add_argument(
         "--resume",
         action="store_true",
         help="Resume from checkpoint if available for each table.",
     )
+    parser.add_argument(
+        "--checkpoint-store",
+        choices=CHECKPOINT_BACKENDS,
+        default=config.CHECKPOINT_BACKEND,
+        help="Unit status store: SQLite file under EXPORT_DIR or dbo.etl_replica_progress (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--partition-mode",
+        choices=("month", "adaptive"),
+        default="month",
+        help="Calendar months or size-balanced ranges per table (see replicate_monthly_parallel_streaming.py).",
+    )
+    parser.add_argument(
+        "--target-rows-per-partition",
+        type=int,
+        default=None,
+        help="Rows per adaptive partition (default: auto).",
+    )
+    parser.add_argument(
+        "--load-mode",
+        choices=("delete", "switch"),
+        default="delete",
+        help="DELETE + INSERT per range, or staging table + partition SWITCH (partitioned targets only).",
+    )
+    parser.add_argument(
+        "--loader",
+        choices=LOADERS,
+        default="executemany",
+        help="Chunk writer: executemany, bcp or tvp (pick per table with scripts/compare_loaders.py).",
+    )
+    parser.add_argument(
+        "--adaptive-batching",
+        action="store_true",
+        help="Re-size chunk and commit interval per table from measured throughput and memory.",
+    )
+    parser.add_argument(
+        "--transform-mode",
+        choices=TRANSFORM_MODES,
+        default="thread",
+        help="Convert chunks in pipeline threads (default) or in a shared process pool (--loader bcp only).",
+    )
+    parser.add_argument(
+        "--transform-workers",
+        type=int,
+        default=None,
+        help="Processes for --transform-mode process (default: CPU count - 1).",
+    )
+    parser.add_argument(
+        "--keyset-resume",
+        action="store_true",
+        help="Read ranges ordered by (date, ID) with committed watermarks; retries continue instead of reloading.",
+    )
+    parser.add_argument(
+        "--rebuild-online",
+        action="store_true",
+        help="Rebuild disabled nonclustered indexes WITH (ONLINE = ON) once each table finishes.",
+    )
+    parser.add_argument(
+        "--rebuild-sort-in-tempdb",
+        action="store_true",
+        help="Rebuild indexes WITH (SORT_IN_TEMPDB = ON).",
+    )
+    parser.add_argument(
+        "--rebuild-maxdop",
+        type=int,
+        default=None,
+        help="MAXDOP for index rebuilds (default: server setting).",
+    )
     return parser.parse_args()
 
 
+def parse_table_limits(values: List[str]) -> Dict[str, int]:
+    limits: Dict[str, int] = {}
+    for value in values:
+        table, sep, count = value.partition("=")
+        if not sep or not count.strip().isdigit():
+            raise SystemExit(f"[ERROR] Invalid --table-max-workers value {value!r}; expected TABLE=N")
+        limits[table.strip().upper()] = int(count)
+    return limits
+
+
+def run_global_schedule(args: argparse.Namespace, tables: List[str], start_date: str, end_date: str, output_dir: Path) -> None:
+    """Queue every table's units in one scheduler with global and per-table stream caps."""
+    table_limits = parse_table_limits(args.table_max_workers)
+    scheduler = StreamScheduler(
+        max_streams=args.max_streams,
+        group_limits=table_limits,
+        default_group_limit=args.max_workers,
+    )
+
+    plans = {}
+    for table in tables:
+        print(f"\n{'='*70}")
+        print(f"[PLAN] {table}")
+        print(f"{'='*70}")
+        plan = prepare_table_units(
+            table,
+            start_date,
+            end_date,
+            output_dir,
+            max_workers=table_limits.get(table, args.max_workers),
+            resume=args.resume,
+            partition_mode=args.partition_mode,
+            target_rows_per_partition=args.target_rows_per_partition,
+            checkpoint_store=args.checkpoint_store,
+        )
+        if plan is None:
+            continue
+        plans[table] = plan
+        for month_key, month_start, month_end in plan["units_to_process"]:
+            scheduler.submit(
+                table,
+                month_key,
+                stream_unit,
+                plan,
+                month_key,
+                month_start,
+                month_end,
+                args.chunk_size,
+                args.commit_interval,
+                max_retries=args.max_retries,
+                fetch_backend=args.fetch_backend,
+                queue_depth=args.queue_depth,
+                load_mode=args.load_mode,
+                loader=args.loader,
+                adaptive_batching=args.adaptive_batching,
+                transform_mode=args.transform_mode,
+                transform_workers=args.transform_workers,
+                keyset_resume=args.keyset_resume,
+                resume=args.resume,
+            )
+
+    print(
+        f"\n[RUN] {len(scheduler.pending)} unit(s) from {len(plans)} table(s); "
+        f"{args.max_streams} global stream(s), {args.max_workers} per table"
+        + (f" (overrides: {table_limits})" if table_limits else "")
+    )
+    # Index maintenance is per table, not per unit: disable once before any unit runs,
+    # rebuild once after the whole schedule (rebuilding mid-run would block other tables' units)
+    if args.load_mode != "switch":
+        for plan in plans.values():
+            if plan["units_to_process"]:
+                disable_table_indexes(plan)
+    try:
+        scheduler.run(lambda task, result, error: record_unit_result(plans[task.group], task.key, result, error))
+    finally:
+        for plan in plans.values():
+            rebuild_table_indexes(
+                plan,
+                online=args.rebuild_online,
+                sort_in_tempdb=args.rebuild_sort_in_tempdb,
+                maxdop=args.rebuild_maxdop,
+            )
+            if plan["units_to_process"]:
+                report_table_rowgroups(plan)
+
+    for plan in plans.values():
+        print_table_summary(plan)
+    scheduler.report()
+
+
 def main():
     args = parse_args()
+    args.transform_mode = resolve_transform_mode(args.transform_mode, args.loader)
     output_dir = Path(config.EXPORT_DIR)
 
     # Parse dates to handle inclusive end date logic
@@ -97,6 +315,11 @@ def main():
 
     tables = args.table if args.table else SALES_TABLES
 
+    if args.scheduler == "global":
+        run_global_schedule(args, tables, start_date_str, end_date_str, output_dir)
+        report_pools()
+        return
+
     for table in tables:
         print(f"\n{'='*70}")
         print(f"[RUN] Replicating {table}")
@@ -110,7 +333,23 @@ def main():
             chunk_size=args.chunk_size,
             resume=args.resume,
             commit_interval=args.commit_interval,
+            max_retries=args.max_retries,
+            fetch_backend=args.fetch_backend,
+            queue_depth=args.queue_depth,
+            partition_mode=args.partition_mode,
+            target_rows_per_partition=args.target_rows_per_partition,
+            load_mode=args.load_mode,
+            loader=args.loader,
+            adaptive_batching=args.adaptive_batching,
+            transform_mode=args.transform_mode,
+            transform_workers=args.transform_workers,
+            keyset_resume=args.keyset_resume,
+            checkpoint_store=args.checkpoint_store,
+            rebuild_online=args.rebuild_online,
+            rebuild_sort_in_tempdb=args.rebuild_sort_in_tempdb,
+            rebuild_maxdop=args.rebuild_maxdop,
         )
+    report_pools()
 
 
 if __name__ == "__main__":
@@ -3,20 +3,27 @@ Monthly parallel replication script with in-memory streaming.
 
 This script streams data month-by-month directly from the source DB to the
 target DB, avoiding intermediate Parquet files. Each month is processed by a
-separate thread with independent connections. Resume is handled via a simple
-checkpoint file that records synced months.
+separate thread with independent connections. Inside a month, fetch, transform
+and insert run as a bounded-queue pipeline (reader thread -> transform thread ->
+month worker as writer) so source reads overlap target writes. Each unit's
+status (pending/running/done/failed) lives in a checkpoint store
+(utils/checkpoint_store.py), which --resume reads to skip finished units.
 
 Usage:
     python scripts/replicate_monthly_parallel_streaming.py APP_4_SALES --start-date 2024-01-01 --end-date 2024-12-31
     python scripts/replicate_monthly_parallel_streaming.py APP_4_SALES --start-date 2024-01-01 --end-date 2024-12-31 --resume
+    python scripts/replicate_monthly_parallel_streaming.py APP_4_SALES --start-date 2024-01-01 --end-date 2024-12-31 --days-from exports/reconcile.csv
 """
 
 import argparse
 import json
 import math
+import queue
 import sys
+import threading
 import time
-from datetime import date, datetime
+from collections import deque
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -33,16 +40,49 @@ from replicate_reference_tables import (
     DATE_FILTER_COLUMNS,
     DATETIME_MAX,
     DATETIME_MIN,
-    build_row_tuple,
+    FULL_SCHEMA_PATH,
+    REPLICA_SCHEMA_PATH,
+    SCHEMA_CACHE_PATH,
     build_select_statement,
+    create_target_loader,
     delete_existing_range,
     get_source_connection,
+    get_source_connection_string,
     get_target_connection,
+    get_target_connection_string,
     load_schema,
     round_to_datetime_precision,
 )
 
 import config
+from utils.arrow_fetch import ARROW_ODBC_ERRORS, FETCH_BACKENDS, create_fetch_backend, resolve_fetch_backend_name
+from utils.checkpoint_store import CHECKPOINT_BACKENDS, UnitLeasedError, get_checkpoint_store
+from utils.chunk_controller import AdaptiveBatchController
+from utils.columnstore import report_rowgroup_quality
+from utils.connection_pool import report_pools
+from utils.daily_counts import read_mismatched_days
+from utils.keyset_resume import (
+    build_keyset_statement,
+    date_key_type,
+    delete_after_key,
+    last_key,
+    load_watermark,
+    save_watermark,
+    supports_keyset,
+)
+from utils.load_manifest import id_checksum, mark_loading, record_load
+from utils.loaders import LOADERS
+from utils.partition_planner import get_plan_path, load_plan, plan_partitions, save_plan
+from utils.partition_switch import (
+    build_staging_indexes,
+    create_staging_table,
+    drop_staging_table,
+    get_switch_plan,
+    switch_in,
+)
+from utils.process_transform import TRANSFORM_MODES, RenderedBcpChunk, get_transform_pool, resolve_transform_mode
+from utils.row_converter import compile_row_converter, polars_column_expr
+from utils.schema_catalog import get_catalog
 
 
 class MonthRetryableError(Exception):
@@ -69,6 +109,70 @@ def is_connection_lost_error(error: Exception) -> bool:
     return any(token in message for token in transient_tokens)
 
 
+# End-of-stream marker passed between pipeline stages
+_PIPELINE_DONE = object()
+# How often blocked pipeline stages re-check the stop event (seconds)
+_PIPELINE_POLL_SECONDS = 0.5
+
+
+class _PipelineStage(threading.Thread):
+    """Pipeline thread that keeps its exception and stops the other stages on failure."""
+
+    def __init__(self, name: str, target, stop_event: threading.Event):
+        super().__init__(name=name, daemon=True)
+        self._target_func = target
+        self.stop_event = stop_event
+        self.error: Optional[BaseException] = None
+
+    def run(self) -> None:
+        try:
+            self._target_func()
+        except BaseException as exc:  # pylint: disable=broad-except
+            self.error = exc
+            self.stop_event.set()
+
+
+def _pipeline_put(q: queue.Queue, item, stop_event: threading.Event) -> bool:
+    """Blocking put (backpressure) that gives up once the pipeline is stopped."""
+    while not stop_event.is_set():
+        try:
+            q.put(item, timeout=_PIPELINE_POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _pipeline_get(q: queue.Queue, stop_event: threading.Event):
+    """Blocking get; returns _PIPELINE_DONE once the pipeline is stopped."""
+    while not stop_event.is_set():
+        try:
+            return q.get(timeout=_PIPELINE_POLL_SECONDS)
+        except queue.Empty:
+            continue
+    return _PIPELINE_DONE
+
+
+def _put_chunk(q: queue.Queue, chunk, stop_event: threading.Event) -> bool:
+    """_pipeline_put for transformed chunks; a bcp file that cannot be handed over is deleted."""
+    if _pipeline_put(q, chunk, stop_event):
+        return True
+    if isinstance(chunk, RenderedBcpChunk):
+        chunk.discard()
+    return False
+
+
+def _discard_queued_chunks(q: queue.Queue) -> None:
+    """Delete bcp files of chunks a stopped writer never loaded."""
+    while True:
+        try:
+            chunk = q.get_nowait()
+        except queue.Empty:
+            return
+        if isinstance(chunk, RenderedBcpChunk):
+            chunk.discard()
+
+
 def format_duration(seconds: float) -> str:
     """Format duration in seconds or mXs style."""
     if seconds < 60:
@@ -105,6 +209,94 @@ def generate_month_ranges(start_date: str, end_date: str) -> List[Tuple[str, str
     return months
 
 
+def generate_day_ranges(days: List[str], start_date: str, end_date: str) -> List[Tuple[str, str, str]]:
+    """
+    One (day, day, next day) unit per listed day inside [start_date, end_date),
+    e.g. the mismatched days of a count reconciliation.
+    """
+    start = datetime.fromisoformat(start_date).date()
+    end = datetime.fromisoformat(end_date).date()
+    units = []
+    for day in sorted(set(days)):
+        current = datetime.fromisoformat(day).date()
+        if start <= current < end:
+            units.append((current.isoformat(), current.isoformat(), (current + timedelta(days=1)).isoformat()))
+    return units
+
+
+def generate_adaptive_ranges(
+    table_name: str,
+    schema_entry: dict,
+    start_date: str,
+    end_date: str,
+    output_dir: Path,
+    max_workers: int,
+    target_rows: Optional[int] = None,
+    resume: bool = False,
+    refresh_stats: bool = False,
+) -> List[Tuple[str, str, str]]:
+    """
+    Size-balanced alternative to generate_month_ranges (see utils/partition_planner.py).
+
+    Ranges with no source rows are not returned; their target rows are cleared here
+    instead, so a full month run and an adaptive run leave the same target state,
+    and each is recorded in the load manifest as a 0-row load.
+
+    Returns:
+        List of (partition_key, start, end) tuples, largest estimated partition first.
+    """
+    date_column = DATE_FILTER_COLUMNS[table_name]
+    plan_path = get_plan_path(table_name, output_dir)
+    plan = load_plan(plan_path, start_date, end_date) if resume else None
+    if plan is not None:
+        print(f"[PLAN] {table_name}: reusing saved partition plan {plan_path.name}")
+    else:
+        source_conn = get_source_connection()
+        try:
+            plan = plan_partitions(
+                source_conn,
+                table_name,
+                schema_entry,
+                date_column,
+                start_date,
+                end_date,
+                output_dir,
+                max_workers,
+                target_rows=target_rows,
+                refresh=refresh_stats,
+            )
+        finally:
+            source_conn.close()
+        save_plan(plan_path, start_date, end_date, *plan)
+    partitions, empty_ranges = plan
+
+    if empty_ranges:
+        target_table = f"dbo.com_5013_{table_name}"
+        target_conn = get_target_connection()
+        try:
+            cursor = target_conn.cursor()
+            for range_start, range_end in empty_ranges:
+                delete_existing_range(cursor, target_table, date_column, range_start, range_end)
+                # Loaded with nothing: keeps the manifest contiguous for --skip-existing
+                record_load(
+                    cursor,
+                    target_table,
+                    range_start,
+                    range_end,
+                    rows_loaded=0,
+                    source_rows=0,
+                    checksum=0,
+                    load_mode="empty",
+                )
+            target_conn.commit()
+        finally:
+            target_conn.close()
+
+    # Largest first, so the long partitions start early and the small ones fill the tail
+    ordered = sorted(partitions, key=lambda part: part[3], reverse=True)
+    return [(key, part_start, part_end) for key, part_start, part_end, _ in ordered]
+
+
 def get_checkpoint_path(table_name: str, output_dir: Path) -> Path:
     """Get path to checkpoint file for this table."""
     return output_dir / f"{table_name.lower()}_monthly_checkpoint.json"
@@ -151,54 +343,24 @@ def _convert_datetime_value(val, is_date: bool):
 def prepare_data_for_sql_polars(pl_df: pl.DataFrame, schema_entry: dict) -> pl.DataFrame:
     """
     Prepare Polars DataFrame for SQL insertion mirroring pandas prepare_data_for_sql.
+
+    Everything runs as native Polars expressions (no per-cell Python callbacks), so
+    the transform step is no longer GIL-bound on wide tables. The expressions are
+    the same ones the compiled RowConverter uses.
     """
     if pl_df.is_empty():
         return pl_df
 
     column_type_map = {col["name"]: col.get("type", "").lower() for col in schema_entry["columns"]}
-
-    exprs = []
-
-    for col_name in pl_df.columns:
-        col_type = column_type_map.get(col_name, "")
-
-        if col_type in ("datetime", "date"):
-            is_date = col_type == "date"
-            date_expr = pl.col(col_name).map_elements(
-                lambda v: _convert_datetime_value(v, is_date),
-                skip_nulls=False,
-            )
-            exprs.append(date_expr.alias(col_name))
-        else:
-            # sanitize NaN/NaT -> None and convert scalar objects
-            def sanitize(val):
-                if val is None:
-                    return None
-                try:
-                    if isinstance(val, float) and math.isnan(val):
-                        return None
-                except Exception:
-                    pass
-                if hasattr(val, "item"):
-                    try:
-                        val = val.item()
-                    except Exception:
-                        pass
-                # Normalize binary-like to bytes
-                if isinstance(val, memoryview):
-                    val = bytes(val)
-                elif isinstance(val, bytearray):
-                    val = bytes(val)
-                return val
-
-            exprs.append(pl.col(col_name).map_elements(sanitize, skip_nulls=False).alias(col_name))
-
-    cleaned = pl_df.select(exprs)
-    return cleaned
+    exprs = [
+        polars_column_expr(col_name, dtype, column_type_map.get(col_name, ""))
+        for col_name, dtype in pl_df.schema.items()
+    ]
+    return pl_df.select(exprs)
 
 
-def get_nonclustered_indexes(cursor: pyodbc.Cursor, target_table: str) -> List[str]:
-    """Return nonclustered index names (not disabled) for a given table."""
+def get_nonclustered_indexes(cursor: pyodbc.Cursor, target_table: str, disabled: bool = False) -> List[str]:
+    """Return nonclustered index names for a given table (enabled ones, or disabled ones with disabled=True)."""
     try:
         if "." in target_table:
             schema_name, table_only = target_table.split(".", 1)
@@ -211,10 +373,11 @@ def get_nonclustered_indexes(cursor: pyodbc.Cursor, target_table: str) -> List[s
             FROM sys.indexes i
             JOIN sys.objects o ON i.object_id = o.object_id
             JOIN sys.schemas s ON o.schema_id = s.schema_id
-            WHERE s.name = ? AND o.name = ? AND i.type_desc = 'NONCLUSTERED' AND i.is_disabled = 0
+            WHERE s.name = ? AND o.name = ? AND i.type_desc = 'NONCLUSTERED' AND i.is_disabled = ?
             """,
             schema_name,
             table_only,
+            1 if disabled else 0,
         )
         return [row[0] for row in cursor.fetchall()]
     except Exception as exc:
@@ -241,23 +404,126 @@ def disable_nonclustered_indexes(cursor: pyodbc.Cursor, target_table: str) -> Li
     return disabled
 
 
-def rebuild_indexes(cursor: pyodbc.Cursor, target_table: str, indexes: List[str]) -> None:
-    """Rebuild the provided indexes; swallows errors to avoid failing the load."""
+def rebuild_indexes(
+    cursor: pyodbc.Cursor,
+    target_table: str,
+    indexes: List[str],
+    online: bool = False,
+    sort_in_tempdb: bool = False,
+    maxdop: Optional[int] = None,
+) -> Dict[str, float]:
+    """
+    Rebuild the provided indexes; swallows errors to avoid failing the load.
+
+    Returns {index: seconds} for the indexes that were rebuilt. An ONLINE rebuild
+    the server refuses (e.g. not Enterprise edition) is retried offline.
+    """
+    timings: Dict[str, float] = {}
     if not indexes:
-        return
+        return timings
+    options = []
+    if sort_in_tempdb:
+        options.append("SORT_IN_TEMPDB = ON")
+    if maxdop is not None:
+        options.append(f"MAXDOP = {int(maxdop)}")
     for idx in indexes:
-        try:
-            cursor.execute(f"ALTER INDEX [{idx}] ON {target_table} REBUILD")
-        except Exception as exc:
-            print(f"[WARN] Could not rebuild index {idx} on {target_table}: {exc}", file=sys.stderr)
+        start = time.perf_counter()
+        # Once the server refuses ONLINE, later indexes go straight to offline
+        attempts = [options + ["ONLINE = ON"], options] if online else [options]
+        for attempt_options in attempts:
+            with_clause = f" WITH ({', '.join(attempt_options)})" if attempt_options else ""
+            try:
+                cursor.execute(f"ALTER INDEX [{idx}] ON {target_table} REBUILD{with_clause}")
+                cursor.connection.commit()
+                timings[idx] = time.perf_counter() - start
+                break
+            except Exception as exc:
+                level = "retrying offline" if attempt_options is not attempts[-1] else "leaving it disabled"
+                print(f"[WARN] Could not rebuild index {idx} on {target_table} ({level}): {exc}", file=sys.stderr)
+                if attempt_options is not attempts[-1]:
+                    online = False
+                try:
+                    cursor.connection.rollback()
+                except Exception:
+                    pass
+    return timings
+
+
+def disable_table_indexes(plan: Dict) -> None:
+    """
+    Disable the table's nonclustered indexes once, before any of its units run.
+
+    Indexes left disabled by an interrupted earlier run are picked up too, so
+    rebuild_table_indexes() restores them. Switch-mode runs skip this (SWITCH
+    needs the target's indexes to match the staging table).
+    """
+    target_table = f"dbo.com_5013_{plan['table_name']}"
+    start = time.perf_counter()
+    conn = get_target_connection()
     try:
-        cursor.connection.commit()
+        cursor = conn.cursor()
+        leftover = get_nonclustered_indexes(cursor, target_table, disabled=True)
+        if leftover:
+            print(f"[INFO] {plan['table_name']}: indexes already disabled by an earlier run: {leftover}")
+        plan["disabled_indexes"] = leftover + disable_nonclustered_indexes(cursor, target_table)
     except Exception as exc:
-        print(f"[WARN] Commit after rebuilding indexes on {target_table} failed: {exc}", file=sys.stderr)
+        print(f"[WARN] {plan['table_name']}: index disable failed, continuing without: {exc}", file=sys.stderr)
+        plan.setdefault("disabled_indexes", [])
+    finally:
+        conn.close()
+    plan["index_disable_time"] = time.perf_counter() - start
+    if plan["disabled_indexes"]:
+        print(
+            f"[INDEX] {plan['table_name']}: disabled {len(plan['disabled_indexes'])} nonclustered index(es) "
+            f"in {format_duration(plan['index_disable_time'])}"
+        )
+
+
+def rebuild_table_indexes(
+    plan: Dict,
+    online: bool = False,
+    sort_in_tempdb: bool = False,
+    maxdop: Optional[int] = None,
+) -> None:
+    """Rebuild the indexes disable_table_indexes() disabled, once, after all units finished."""
+    indexes = plan.get("disabled_indexes") or []
+    if not indexes:
+        return
+    target_table = f"dbo.com_5013_{plan['table_name']}"
+    start = time.perf_counter()
+    conn = get_target_connection()
+    try:
+        timings = rebuild_indexes(
+            conn.cursor(), target_table, indexes, online=online, sort_in_tempdb=sort_in_tempdb, maxdop=maxdop
+        )
+    finally:
+        conn.close()
+    plan["index_rebuild_time"] = time.perf_counter() - start
+    plan["index_rebuild_timings"] = timings
+    plan["disabled_indexes"] = [idx for idx in indexes if idx not in timings]
+    for idx, seconds in timings.items():
+        print(f"[INDEX] {plan['table_name']}: rebuilt {idx} in {format_duration(seconds)}")
+    if plan["disabled_indexes"]:
+        print(
+            f"[ERROR] {plan['table_name']}: indexes still disabled, rebuild manually or rerun: {plan['disabled_indexes']}",
+            file=sys.stderr,
+        )
+
+
+def report_table_rowgroups(plan: Dict) -> None:
+    """Rowgroup quality of a clustered columnstore target after its units finished (no-op for rowstore)."""
+    target_table = f"dbo.com_5013_{plan['table_name']}"
+    conn = get_target_connection()
+    try:
+        plan["rowgroup_quality"] = report_rowgroup_quality(conn.cursor(), target_table)
+    except Exception as exc:
+        print(f"[WARN] {plan['table_name']}: rowgroup report failed: {exc}", file=sys.stderr)
+    finally:
+        conn.close()
 
 
 def load_checkpoint(table_name: str, output_dir: Path) -> Dict:
-    """Load checkpoint data if exists."""
+    """Load a legacy JSON checkpoint (imported into the checkpoint store once)."""
     checkpoint_path = get_checkpoint_path(table_name, output_dir)
     if checkpoint_path.exists():
         try:
@@ -272,23 +538,6 @@ def load_checkpoint(table_name: str, output_dir: Path) -> Dict:
     return {}
 
 
-def save_checkpoint(
-    table_name: str,
-    output_dir: Path,
-    synced_months: List[str],
-    failed_months: List[str],
-) -> None:
-    """Save checkpoint data."""
-    checkpoint_path = get_checkpoint_path(table_name, output_dir)
-    checkpoint = {
-        "table": table_name,
-        "synced_months": synced_months,
-        "failed_months": failed_months,
-        "last_updated": datetime.utcnow().isoformat() + "Z",
-    }
-    checkpoint_path.write_text(json.dumps(checkpoint, indent=2), encoding="utf-8")
-
-
 def stream_month_to_target(
     table_name: str,
     schema_entry: dict,
@@ -298,13 +547,48 @@ def stream_month_to_target(
     chunk_size: int,
     commit_interval: int,
     max_retries: int = 3,
+    fetch_backend: str = "auto",
+    queue_depth: int = 2,
+    load_mode: str = "delete",
+    loader: str = "executemany",
+    adaptive_batching: bool = False,
+    transform_mode: str = "thread",
+    transform_workers: Optional[int] = None,
+    keyset_resume: bool = False,
+    resume: bool = False,
 ) -> Tuple[str, int]:
     """
     Stream one month of data directly from source to target using in-memory chunks.
 
-    Retries the whole month on transient connection issues to avoid partial duplicates.
+    Fetch, transform and insert overlap through bounded queues of ``queue_depth``
+    chunks each. Retries the whole month on transient connection issues to avoid
+    partial duplicates.
+
+    load_mode="switch" loads into a private staging table and swaps it into the
+    month's partition (utils/partition_switch.py); ranges that are not exactly one
+    partition fall back to DELETE + INSERT.
+
+    ``loader`` picks how chunks are written (utils/loaders.py): executemany, bcp or tvp.
+    With ``adaptive_batching`` the fetch chunk size and commit interval start from
+    ``chunk_size`` / ``commit_interval`` and are re-sized from measured throughput
+    and memory (utils/chunk_controller.py).
+
+    transform_mode="process" hands each chunk's conversion to the shared process
+    pool (utils/process_transform.py) through Arrow IPC in shared memory; up to
+    ``queue_depth`` chunks per month are in flight there, and the workers render
+    the bcp data files. It needs an unbuffered bcp loader; with any other loader
+    the month converts in-thread.
+
+    With ``keyset_resume`` the range is read ordered by (date column, ID) and the
+    last committed key is kept in the unit's dbo.etl_replica_progress row (utils/keyset_resume.py).
+    A retry continues after that key instead of deleting the range again; so does
+    the first attempt when ``resume`` is set and an earlier run left a watermark.
+
+    Nonclustered indexes are not touched here: the table run disables them once
+    before its first unit and rebuilds them after the last (disable_table_indexes /
+    rebuild_table_indexes).
     """
-    query, params = build_select_statement(
+    base_query, base_params = build_select_statement(
         table_name,
         schema_entry,
         month_start,
@@ -312,155 +596,333 @@ def stream_month_to_target(
         full_table=False,
     )
 
-    columns = [col["name"] for col in schema_entry["columns"]]
-    placeholders = ", ".join(["?"] * len(columns))
-    column_list = ", ".join(columns)
+    # Precompiled by the schema catalog when this is the entry load_schema() returned
+    artifacts = get_catalog(REPLICA_SCHEMA_PATH, FULL_SCHEMA_PATH, SCHEMA_CACHE_PATH).tables.get(table_name)
+    if artifacts is not None and artifacts.schema_entry is schema_entry:
+        columns, column_list = artifacts.columns, artifacts.column_list
+        row_converter = artifacts.converter()
+    else:
+        columns = [col["name"] for col in schema_entry["columns"]]
+        column_list = ", ".join(columns)
+        row_converter = compile_row_converter(schema_entry)
     target_table = f"dbo.com_5013_{table_name}"
-    insert_sql = f"INSERT INTO {target_table} WITH (TABLOCK) ({column_list}) VALUES ({placeholders})"
-
-    # Build Polars schema from SQL types
-    def map_sql_type_to_polars(sql_type: str) -> pl.DataType:
-        t = (sql_type or "").lower()
-        if t in ("int", "bigint", "smallint", "tinyint"):
-            return pl.Int64
-        if t in ("decimal", "numeric", "float", "real", "money"):
-            return pl.Float64
-        if t in ("date",):
-            return pl.Date
-        if t in ("datetime", "datetime2", "smalldatetime"):
-            return pl.Datetime
-        if t in ("bit",):
-            return pl.Boolean
-        if t in ("timestamp", "binary", "varbinary"):
-            return pl.Binary
-        # default string
-        return pl.Utf8
-
-    polars_schema_base = {
-        col["name"]: map_sql_type_to_polars(col.get("type", ""))
-        for col in schema_entry["columns"]
-    }
+
+    fetch_backend_name = resolve_fetch_backend_name(fetch_backend)
+    queue_depth = max(1, queue_depth)
+    batch_controller = (
+        AdaptiveBatchController.for_table(table_name, f"{table_name} {month_key}", chunk_size, commit_interval)
+        if adaptive_batching
+        else None
+    )
+    fetch_size = (lambda: batch_controller.chunk_rows) if batch_controller else chunk_size
+
+    date_column = DATE_FILTER_COLUMNS.get(table_name)
+    if keyset_resume and not supports_keyset(schema_entry, date_column):
+        print(f"[WARN] {table_name}: keyset resume needs {date_column} and ID columns; restarting months on retry", file=sys.stderr)
+        keyset_resume = False
+    # Last committed key and row count of this range: {"key": (date, id), "rows": n}
+    watermark = None
+    watermark_checked = not resume
 
     attempt = 1
     while attempt <= max_retries:
         source_conn = None
         target_conn = None
         cursor = None
-        disabled_indexes: List[str] = []
-        delete_time = disable_time = insert_time = rebuild_time = 0.0
+        chunk_loader = None
+        switch_plan = None
+        delete_time = insert_time = writer_wait = switch_time = 0.0
+        rows_deleted = 0
+        use_keyset = False
         total_start = time.perf_counter()
         try:
-            source_conn = get_source_connection()
+            if fetch_backend_name == "pyodbc":
+                source_conn = get_source_connection()
             target_conn = get_target_connection()
             cursor = target_conn.cursor()
-            cursor.fast_executemany = True
 
-            delete_start = time.perf_counter()
-            delete_existing_range(
-                cursor,
-                target_table,
-                DATE_FILTER_COLUMNS.get(table_name),
-                month_start,
-                month_end,
-            )
-            target_conn.commit()
-            delete_time = time.perf_counter() - delete_start
+            if load_mode == "switch":
+                staging_suffix = "".join(ch if ch.isalnum() else "_" for ch in month_key)
+                switch_plan, reason = get_switch_plan(cursor, target_table, month_start, month_end, staging_suffix)
+                if switch_plan is None:
+                    print(f"[WARN] {table_name} {month_key}: partition switch unavailable ({reason}); using DELETE", file=sys.stderr)
+
+            if switch_plan is not None:
+                # Private staging table: no range DELETE, no lock contention with other workers
+                mark_loading(cursor, target_table, month_start, month_end)
+                create_staging_table(cursor, switch_plan, column_list)
+                target_conn.commit()
+                insert_table = switch_plan.staging_table
+            else:
+                insert_table = target_table
+                use_keyset = keyset_resume
+                if use_keyset and not watermark_checked:
+                    watermark = load_watermark(cursor, table_name, month_key, month_start, month_end)
+                    watermark_checked = True
+                delete_start = time.perf_counter()
+                if use_keyset and watermark:
+                    # Only rows beyond the committed key go (e.g. a bcp chunk committed before the failure)
+                    rows_deleted = delete_after_key(
+                        cursor,
+                        target_table,
+                        date_column,
+                        month_start,
+                        month_end,
+                        watermark["key"],
+                        date_type=date_key_type(schema_entry, date_column),
+                    )
+                    target_conn.commit()
+                    print(
+                        f"[RESUME] {table_name} {month_key}: continuing after {watermark['rows']:,} committed rows "
+                        f"(key {watermark['key'][0]} / ID {watermark['key'][1]})"
+                    )
+                else:
+                    if use_keyset:
+                        # A stale watermark must not outlive the range it described
+                        save_watermark(cursor, table_name, month_key, month_start, month_end, None, 0, state="pending")
+                        target_conn.commit()
+                    # Batched DELETE TOP (n), committed per batch (config.DELETE_BATCH_ROWS)
+                    _, rows_deleted = delete_existing_range(
+                        cursor,
+                        target_table,
+                        date_column,
+                        month_start,
+                        month_end,
+                    )
+                delete_time = time.perf_counter() - delete_start
 
-            try:
-                disable_start = time.perf_counter()
-                disabled_indexes = disable_nonclustered_indexes(cursor, target_table)
-                disable_time = time.perf_counter() - disable_start
-                if disabled_indexes:
-                    print(f"[INFO] {table_name} {month_key}: disabled indexes {disabled_indexes}")
-            except Exception as exc:
-                disable_time = time.perf_counter() - disable_start if 'disable_start' in locals() else 0.0
-                print(f"[WARN] {table_name} {month_key}: index disable failed, continuing without: {exc}", file=sys.stderr)
+            chunk_loader = create_target_loader(
+                loader, target_conn, insert_table, columns, table_lock=True, type_table=target_table
+            )
 
-            total_loaded = 0
+            if use_keyset:
+                query, params = build_keyset_statement(
+                    f"{schema_entry.get('schema', 'COM_5013')}.{table_name}",
+                    columns,
+                    date_column,
+                    month_start,
+                    month_end,
+                    after=watermark["key"] if watermark else None,
+                    date_type=date_key_type(schema_entry, date_column),
+                )
+            else:
+                query, params = base_query, base_params
+            # Key of the last row written to the target, and the rows up to it
+            flushed_key, flushed_rows = (watermark["key"], watermark["rows"]) if use_keyset and watermark else (None, 0)
+            # Last-row key of every chunk handed to the writer, in queue order
+            chunk_keys: deque = deque()
+            loaded_key = flushed_key
+            resumed_rows = flushed_rows
+            # Rows (and SUM(ID)) the reader delivered in this attempt, for the load manifest
+            read_stats = {"rows": 0, "ids": 0}
+
+            total_loaded = flushed_rows
             rows_since_commit = 0
 
             insert_start = time.perf_counter()
-            # Use cursor-based fetch to avoid pandas read_sql; wrap rows in Polars then pandas for existing prep.
-            cursor_src = source_conn.cursor()
-            cursor_src.execute(query, params or [])
-            chunk_idx = 0
-            fetched_columns = [desc[0] for desc in cursor_src.description] if cursor_src.description else columns
-            # If schema mismatch, prefer actual fetched columns but try to align order to expected when possible.
-            if len(fetched_columns) != len(columns):
-                print(
-                    f"[WARN] {table_name} {month_key}: fetched {len(fetched_columns)} columns but expected {len(columns)}; using fetched schema order",
-                    file=sys.stderr,
-                )
-            selected_columns = columns if set(columns).issubset(set(fetched_columns)) else fetched_columns
-            polars_schema = {col: polars_schema_base.get(col, pl.Utf8) for col in fetched_columns}
-            while True:
-                rows = cursor_src.fetchmany(chunk_size)
-                if not rows:
-                    break
-                # Ensure pyodbc.Row -> tuple for Polars
-                rows = [tuple(r) for r in rows]
-                # Create Polars DataFrame for downstream prep.
-                try:
-                    pl_chunk = pl.DataFrame(rows, schema=polars_schema, orient="row")
-                except Exception as e:
-                    print(f"[DEBUG] {table_name} {month_key}: Polars DataFrame creation failed", file=sys.stderr)
-                    print(f"[DEBUG] Error: {e}", file=sys.stderr)
-                    print(f"[DEBUG] Fetched columns ({len(fetched_columns)}): {fetched_columns[:10]}...", file=sys.stderr)
-                    print(f"[DEBUG] First row sample ({len(rows[0])} values): {rows[0][:10] if rows else 'no rows'}...", file=sys.stderr)
-                    print(f"[DEBUG] Expected columns ({len(columns)}): {columns[:10]}...", file=sys.stderr)
-                    raise
-                if pl_chunk.is_empty():
-                    continue
-                chunk_pl = prepare_data_for_sql_polars(pl_chunk, schema_entry)
-                batch_data = [
-                    build_row_tuple(row)
-                    for row in chunk_pl.select(selected_columns).rows()
-                ]
+            # Columnar fetch: source rows land in Arrow batches, converted to tuples in one vectorized pass.
+            source_reader = create_fetch_backend(
+                fetch_backend_name,
+                connection=source_conn,
+                connection_string=get_source_connection_string(),
+            )
 
+            # Pipeline: reader thread -> batch_queue -> transform thread -> rows_queue -> writer (this thread).
+            # Bounded queues give backpressure: a slow target stalls the reader instead of buffering the month.
+            stop_event = threading.Event()
+            batch_queue: queue.Queue = queue.Queue(maxsize=queue_depth)
+            rows_queue: queue.Queue = queue.Queue(maxsize=queue_depth)
+
+            def read_batches():
                 try:
-                    cursor.executemany(insert_sql, batch_data)
-                except Exception as e:
-                    if is_connection_lost_error(e):
-                        raise MonthRetryableError(
-                            f"Connection lost during insert for chunk {chunk_idx}: {e}"
-                        ) from e
-                    raise
-
-                total_loaded += len(batch_data)
-                rows_since_commit += len(batch_data)
-                chunk_idx += 1
-
-                if rows_since_commit >= commit_interval:
-                    target_conn.commit()
-                    rows_since_commit = 0
+                    for batch in source_reader.iter_batches(query, params, schema_entry, fetch_size):
+                        read_stats["rows"] += batch.num_rows
+                        read_stats["ids"] += id_checksum(batch)
+                        if not _pipeline_put(batch_queue, batch, stop_event):
+                            return
+                finally:
+                    _pipeline_put(batch_queue, _PIPELINE_DONE, stop_event)
+
+            transform_pool = None
+            if transform_mode == "process":
+                # Workers can write bcp files only for an unbuffered bcp loader (see BufferedLoader);
+                # without them the process round trip is slower than converting in-thread
+                if hasattr(chunk_loader, "load_file"):
+                    transform_pool = get_transform_pool(transform_workers)
+                else:
                     print(
-                        f"  [LOAD] {table_name} {month_key}: committed {total_loaded:,} rows",
-                        end="\r",
-                        flush=True,
+                        f"[WARN] {table_name} {month_key}: process transform needs an unbuffered bcp loader; "
+                        "converting chunks in-thread",
+                        file=sys.stderr,
                     )
+            render_bcp = transform_pool is not None
+
+            def hand_over(pending, key) -> bool:
+                chunk = pending.result()
+                if use_keyset:
+                    chunk_keys.append(key)
+                return _put_chunk(rows_queue, chunk, stop_event)
+
+            def transform_batches():
+                fetched_columns = None
+                selected_columns = columns
+                in_flight: deque = deque()
+                try:
+                    while True:
+                        batch = _pipeline_get(batch_queue, stop_event)
+                        if batch is _PIPELINE_DONE:
+                            break
+                        if fetched_columns is None:
+                            fetched_columns = batch.schema.names
+                            # If schema mismatch, prefer actual fetched columns but try to align order to expected when possible.
+                            if len(fetched_columns) != len(columns) + (1 if use_keyset else 0):
+                                print(
+                                    f"[WARN] {table_name} {month_key}: fetched {len(fetched_columns)} columns but expected {len(columns)}; using fetched schema order",
+                                    file=sys.stderr,
+                                )
+                            selected_columns = columns if set(columns).issubset(set(fetched_columns)) else fetched_columns
+                        if batch.num_rows == 0:
+                            continue
+                        if batch_controller:
+                            batch_controller.observe_batch(batch.num_rows, batch.nbytes)
+                        key = last_key(batch) if use_keyset else None
+                        if transform_pool is None:
+                            rows = row_converter.convert(batch, selected_columns)
+                            if use_keyset:
+                                chunk_keys.append(key)
+                            if not _pipeline_put(rows_queue, rows, stop_event):
+                                return
+                            continue
+                        in_flight.append((transform_pool.submit(schema_entry, batch, selected_columns, render_bcp), key))
+                        if len(in_flight) > queue_depth and not hand_over(*in_flight.popleft()):
+                            return
+                    # Source exhausted (or stopped): hand over what the workers still hold, in order
+                    while in_flight and not stop_event.is_set():
+                        if not hand_over(*in_flight.popleft()):
+                            return
+                finally:
+                    for pending, _ in in_flight:
+                        pending.cancel()
+                    _pipeline_put(rows_queue, _PIPELINE_DONE, stop_event)
 
+            stages = [
+                _PipelineStage(f"{table_name}-{month_key}-reader", read_batches, stop_event),
+                _PipelineStage(f"{table_name}-{month_key}-transform", transform_batches, stop_event),
+            ]
+            for stage in stages:
+                stage.start()
+
+            chunk_idx = 0
+            try:
+                while True:
+                    wait_start = time.perf_counter()
+                    batch_data = _pipeline_get(rows_queue, stop_event)
+                    writer_wait += time.perf_counter() - wait_start
+                    if batch_data is _PIPELINE_DONE:
+                        break
+
+                    try:
+                        load_start = time.perf_counter()
+                        if isinstance(batch_data, RenderedBcpChunk):
+                            written = chunk_loader.load_file(batch_data.path, batch_data.row_count)
+                        else:
+                            written = chunk_loader.load(batch_data)
+                        # Buffered (columnstore) chunks that wrote nothing say nothing about insert speed
+                        if batch_controller and written:
+                            batch_controller.record_insert(written, time.perf_counter() - load_start)
+                    except Exception as e:
+                        if is_connection_lost_error(e):
+                            raise MonthRetryableError(
+                                f"Connection lost during insert for chunk {chunk_idx}: {e}"
+                            ) from e
+                        raise
+
+                    total_loaded += len(batch_data)
+                    rows_since_commit += len(batch_data)
+                    chunk_idx += 1
+                    chunk_key = chunk_keys.popleft() if use_keyset else None
+                    if chunk_key is not None:
+                        loaded_key = chunk_key
+                    if chunk_key is not None and written:
+                        # Buffered loaders write everything held so far once they write at all
+                        flushed_key, flushed_rows = chunk_key, total_loaded
+                        if chunk_loader.separate_session:
+                            # bcp has already committed this chunk in its own session
+                            save_watermark(cursor, table_name, month_key, month_start, month_end, flushed_key, flushed_rows)
+                            target_conn.commit()
+                            watermark = {"key": flushed_key, "rows": flushed_rows}
+
+                    if rows_since_commit >= (batch_controller.commit_interval if batch_controller else commit_interval):
+                        if use_keyset and flushed_key is not None and not chunk_loader.separate_session:
+                            # Same transaction as the rows it covers
+                            save_watermark(cursor, table_name, month_key, month_start, month_end, flushed_key, flushed_rows)
+                        target_conn.commit()
+                        if use_keyset and flushed_key is not None:
+                            watermark = {"key": flushed_key, "rows": flushed_rows}
+                        rows_since_commit = 0
+                        print(
+                            f"  [LOAD] {table_name} {month_key}: committed {total_loaded:,} rows",
+                            end="\r",
+                            flush=True,
+                        )
+            finally:
+                # Writer failure (or normal end): release the stages, then wait so the source
+                # connection is idle before it is closed.
+                stop_event.set()
+                for stage in stages:
+                    stage.join()
+                _discard_queued_chunks(rows_queue)
+
+            # Surface reader/transform failures in the month worker so the retry logic sees them
+            for stage in stages:
+                if stage.error is not None:
+                    raise stage.error
+
+            chunk_loader.flush()
+            if use_keyset:
+                save_watermark(cursor, table_name, month_key, month_start, month_end, loaded_key, total_loaded, state="done")
             target_conn.commit()
             insert_time = time.perf_counter() - insert_start
-            try:
-                rebuild_start = time.perf_counter()
-                rebuild_indexes(cursor, target_table, disabled_indexes)
-                rebuild_time = time.perf_counter() - rebuild_start
-            except Exception as exc:
-                rebuild_time = time.perf_counter() - rebuild_start
-                print(f"[WARN] {table_name} {month_key}: index rebuild failed: {exc}", file=sys.stderr)
-            else:
-                disabled_indexes = []
+
+            if switch_plan is not None:
+                switch_start = time.perf_counter()
+                build_staging_indexes(cursor, switch_plan)
+                target_conn.commit()
+                switch_in(cursor, switch_plan)
+                target_conn.commit()
+                drop_staging_table(cursor, switch_plan)
+                target_conn.commit()
+                switch_time = time.perf_counter() - switch_start
+                print(f"[INFO] {table_name} {month_key}: switched into partition {switch_plan.partition_number}")
+                switch_plan = None
+
+            record_load(
+                cursor,
+                target_table,
+                month_start,
+                month_end,
+                rows_loaded=total_loaded,
+                source_rows=resumed_rows + read_stats["rows"],
+                # IDs of rows committed by an earlier attempt were not summed here
+                checksum=None if resumed_rows else read_stats["ids"],
+                load_mode=chunk_loader.name,
+            )
+            target_conn.commit()
 
             total_time = time.perf_counter() - total_start
             print(f"[LOAD] {table_name} {month_key}: loaded {total_loaded:,} rows")
             print(
                 f"[TIMING] {table_name} {month_key}: "
-                f"DELETE {format_duration(delete_time)} | "
-                f"DISABLE_IDX {format_duration(disable_time)} | "
-                f"INSERT {format_duration(insert_time)} | "
-                f"REBUILD_IDX {format_duration(rebuild_time)} | "
+                f"DELETE {format_duration(delete_time)} ({rows_deleted:,} rows) | "
+                f"INSERT {format_duration(insert_time)} via {chunk_loader.name} (writer idle {format_duration(writer_wait)}) | "
+                f"SWITCH {format_duration(switch_time)} | "
                 f"TOTAL {format_duration(total_time)}"
             )
+            if batch_controller:
+                print(f"[ADAPT] {table_name} {month_key}: settled on {batch_controller.summary()}")
+                batch_controller.remember()
+            if transform_pool is not None:
+                print(f"[TRANSFORM] {table_name} {month_key}: process pool totals {transform_pool.summary()}")
             return month_key, total_loaded
         except MonthRetryableError as retry_err:
             attempt += 1
@@ -471,7 +933,7 @@ def stream_month_to_target(
             )
             time.sleep(min(5, attempt))
             continue
-        except pyodbc.Error as err:
+        except (pyodbc.Error, *ARROW_ODBC_ERRORS) as err:
             if is_connection_lost_error(err) and attempt < max_retries:
                 attempt += 1
                 print(
@@ -485,56 +947,97 @@ def stream_month_to_target(
         finally:
             if source_conn:
                 source_conn.close()
+            if chunk_loader:
+                chunk_loader.close()
             if target_conn:
-                if disabled_indexes and cursor:
+                if switch_plan is not None and cursor:
                     try:
-                        rebuild_indexes(cursor, target_table, disabled_indexes)
-                        rebuild_time = time.perf_counter() - rebuild_start if 'rebuild_start' in locals() else rebuild_time
+                        target_conn.rollback()
+                        drop_staging_table(cursor, switch_plan)
+                        target_conn.commit()
                     except Exception as exc:
-                        print(f"[WARN] {table_name} {month_key}: index rebuild during cleanup failed: {exc}", file=sys.stderr)
+                        print(f"[WARN] {table_name} {month_key}: staging table cleanup failed: {exc}", file=sys.stderr)
                 target_conn.close()
 
     raise RuntimeError(f"{table_name} {month_key}: failed after {max_retries} attempts")
 
 
-def replicate_monthly_parallel(
+def prepare_table_units(
     table_name: str,
     start_date: str,
     end_date: str,
     output_dir: Path,
     max_workers: int = 12,
-    chunk_size: int = 10000,
     resume: bool = False,
-    commit_interval: int = 100000,
-    max_retries: int = 3,
-) -> None:
+    partition_mode: str = "month",
+    target_rows_per_partition: Optional[int] = None,
+    refresh_partition_stats: bool = False,
+    checkpoint_store: str = config.CHECKPOINT_BACKEND,
+    days: Optional[List[str]] = None,
+) -> Optional[Dict]:
     """
-    Main function: replicate table month-by-month with parallel workers using streaming.
+    Resolve the units of work (months, adaptive partitions, or the given ``days``)
+    for one table.
+
+    Returns None when the table cannot be replicated by this script; otherwise a
+    dict with schema_entry, all_units, units_to_process, table_output_dir, the
+    checkpoint store and the synced/failed sets read from it (with ``resume``).
     """
     schema = load_schema()
     if table_name not in schema:
         print(f"[ERROR] Table {table_name} not found in schema", file=sys.stderr)
-        return
+        return None
 
     if table_name not in DATE_FILTER_COLUMNS:
         print(
             f"[ERROR] Table {table_name} does not support date filtering (not in DATE_FILTER_COLUMNS)",
             file=sys.stderr,
         )
-        return
+        return None
 
     schema_entry = schema[table_name]
-    months = generate_month_ranges(start_date, end_date)
-    print(f"[INFO] Processing {len(months)} months for {table_name}")
-    print(f"[INFO] Date range: {start_date} to {end_date}")
-    print()
-
     table_output_dir = output_dir / table_name.lower()
     table_output_dir.mkdir(parents=True, exist_ok=True)
 
-    checkpoint = load_checkpoint(table_name, table_output_dir) if resume else {}
-    synced_months = set(checkpoint.get("synced_months", []))
-    failed_months = set(checkpoint.get("failed_months", []))
+    if days is not None:
+        months = generate_day_ranges(days, start_date, end_date)
+        print(f"[INFO] Processing {len(months)} day(s) for {table_name}")
+    elif partition_mode == "adaptive":
+        months = generate_adaptive_ranges(
+            table_name,
+            schema_entry,
+            start_date,
+            end_date,
+            table_output_dir,
+            max_workers,
+            target_rows=target_rows_per_partition,
+            resume=resume,
+            refresh_stats=refresh_partition_stats,
+        )
+        print(f"[INFO] Processing {len(months)} partitions for {table_name}")
+    else:
+        months = generate_month_ranges(start_date, end_date)
+        print(f"[INFO] Processing {len(months)} months for {table_name}")
+    print(f"[INFO] Date range: {start_date} to {end_date}")
+    print()
+
+    store = get_checkpoint_store(
+        checkpoint_store,
+        output_dir,
+        # Unpooled: the store holds its own connection while workers hold pooled ones
+        connect=lambda: pyodbc.connect(get_target_connection_string()),
+        lease_seconds=config.CHECKPOINT_LEASE_SECONDS,
+    )
+    store.register(table_name, months)
+    finished = store.finished_units(table_name) if resume else {}
+    if resume and not finished:
+        legacy = load_checkpoint(table_name, table_output_dir)
+        if legacy.get("synced_months") or legacy.get("failed_months"):
+            store.import_finished(table_name, legacy.get("synced_months", []), legacy.get("failed_months", []))
+            finished = store.finished_units(table_name)
+            print(f"[INFO] Imported {len(finished)} unit(s) from {get_checkpoint_path(table_name, table_output_dir)}")
+    synced_months = {key for key, status in finished.items() if status == "done"}
+    failed_months = {key for key, status in finished.items() if status == "failed"}
 
     months_to_process = [
         (month_key, month_start, month_end)
@@ -549,43 +1052,69 @@ def replicate_monthly_parallel(
         print(f"[INFO] Synced months: {sorted(synced_months)}")
         print()
 
-        month_results = []
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {
-                executor.submit(
-                    stream_month_to_target,
-                    table_name,
-                    schema_entry,
-                    month_key,
-                    month_start,
-                    month_end,
-                    chunk_size,
-                    commit_interval,
-                    max_retries,
-                ): month_key
-                for month_key, month_start, month_end in months_to_process
-            }
+    return {
+        "table_name": table_name,
+        "schema_entry": schema_entry,
+        "all_units": months,
+        "units_to_process": months_to_process,
+        "table_output_dir": table_output_dir,
+        "synced": synced_months,
+        "failed": failed_months,
+        "skipped": set(),
+        "resume": resume,
+        "store": store,
+    }
+
+
+def record_unit_result(
+    plan: Dict,
+    month_key: str,
+    result: Optional[Tuple[str, int]],
+    error: Optional[BaseException],
+) -> None:
+    """Record one finished month/partition: one status transition in the checkpoint store."""
+    table_name = plan["table_name"]
+    store = plan["store"]
+    if isinstance(error, UnitLeasedError):
+        plan["skipped"].add(month_key)
+        print(f"[SKIP] {table_name} {month_key}: {error}")
+        return
+    if error is not None:
+        plan["failed"].add(month_key)
+        print(f"[ERROR] {table_name} {month_key}: {error}", file=sys.stderr)
+        recorded = store.fail(table_name, month_key, str(error))
+    else:
+        result_month, rows_loaded = result
+        plan["synced"].add(result_month)
+        plan["failed"].discard(result_month)
+        if rows_loaded == 0:
+            print(f"[INFO] {table_name} {result_month}: No data for this month")
+        else:
+            print(f"[SYNC] {table_name} {result_month}: {rows_loaded:,} rows streamed")
+        recorded = store.complete(table_name, result_month, rows_loaded)
+    if not recorded:
+        print(f"[WARN] {table_name} {month_key}: lease was lost to another run; status not recorded", file=sys.stderr)
 
-            for future in as_completed(futures):
-                month_key = futures[future]
-                try:
-                    result_month, rows_loaded = future.result()
-                    synced_months.add(result_month)
-                    if rows_loaded == 0:
-                        print(f"[INFO] {table_name} {result_month}: No data for this month")
-                    else:
-                        print(f"[SYNC] {table_name} {result_month}: {rows_loaded:,} rows streamed")
-                except Exception as e:  # pylint: disable=broad-except
-                    failed_months.add(month_key)
-                    print(f"[ERROR] {table_name} {month_key}: {e}", file=sys.stderr)
-                finally:
-                    save_checkpoint(
-                        table_name,
-                        table_output_dir,
-                        sorted(synced_months),
-                        sorted(failed_months),
-                    )
 
+def stream_unit(plan: Dict, month_key: str, month_start: str, month_end: str, *args, **kwargs) -> Tuple[str, int]:
+    """
+    Claim one unit in the checkpoint store, then stream it.
+
+    Extra arguments go to stream_month_to_target after month_end. Raises
+    UnitLeasedError while another run holds the unit.
+    """
+    plan["store"].claim(plan["table_name"], month_key)
+    return stream_month_to_target(
+        plan["table_name"], plan["schema_entry"], month_key, month_start, month_end, *args, **kwargs
+    )
+
+
+def print_table_summary(plan: Dict) -> None:
+    """Print the end-of-run summary for one table."""
+    table_name = plan["table_name"]
+    months = plan["all_units"]
+    synced_months = plan["synced"]
+    failed_months = plan["failed"]
     print(f"\n{'='*70}")
     print(f"[SUMMARY] {table_name}")
     print(f"{'='*70}")
@@ -596,11 +1125,154 @@ def replicate_monthly_parallel(
         print(f"  Completed: {', '.join(sorted(synced_months))}")
     if failed_months:
         print(f"  Failed: {', '.join(sorted(failed_months))}")
+    if plan.get("skipped"):
+        print(f"  Skipped (running in another run): {', '.join(sorted(plan['skipped']))}")
     if not synced_months:
         print("  Status: No months synced yet")
+    if plan.get("index_rebuild_timings") or plan.get("disabled_indexes"):
+        print(
+            f"  Index maintenance: disable {format_duration(plan.get('index_disable_time', 0.0))} | "
+            f"rebuild {format_duration(plan.get('index_rebuild_time', 0.0))}"
+            f" ({len(plan.get('index_rebuild_timings', {}))} index(es))"
+        )
+    quality = plan.get("rowgroup_quality")
+    if quality:
+        print(
+            f"  Columnstore: {quality['compressed_rowgroups']:,} compressed rowgroup(s), "
+            f"avg {quality['avg_compressed_rows']:,.0f} rows | {quality['delta_rows']:,} rows in delta store | "
+            f"{quality['deleted_ratio']:.1%} deleted"
+        )
     print(f"{'='*70}")
 
 
+def replicate_monthly_parallel(
+    table_name: str,
+    start_date: str,
+    end_date: str,
+    output_dir: Path,
+    max_workers: int = 12,
+    chunk_size: int = 10000,
+    resume: bool = False,
+    commit_interval: int = 100000,
+    max_retries: int = 3,
+    fetch_backend: str = "auto",
+    queue_depth: int = 2,
+    partition_mode: str = "month",
+    target_rows_per_partition: Optional[int] = None,
+    refresh_partition_stats: bool = False,
+    load_mode: str = "delete",
+    loader: str = "executemany",
+    adaptive_batching: bool = False,
+    rebuild_online: bool = False,
+    rebuild_sort_in_tempdb: bool = False,
+    rebuild_maxdop: Optional[int] = None,
+    transform_mode: str = "thread",
+    transform_workers: Optional[int] = None,
+    keyset_resume: bool = False,
+    checkpoint_store: str = config.CHECKPOINT_BACKEND,
+    days: Optional[List[str]] = None,
+) -> None:
+    """
+    Main function: replicate table month-by-month with parallel workers using streaming.
+
+    With partition_mode="adaptive" the calendar months are replaced by size-balanced
+    day/hour ranges planned from cached per-day source counts. With ``days`` only
+    those days are reloaded, one unit each (targeted repair after a reconciliation).
+
+    Nonclustered indexes are disabled once before the workers start and rebuilt
+    once after every month finished (with the rebuild_* options), not per month.
+    A ``days`` repair leaves them in place: rebuilding every index of the table
+    would cost far more than loading a few days into it.
+    """
+    plan = prepare_table_units(
+        table_name,
+        start_date,
+        end_date,
+        output_dir,
+        max_workers=max_workers,
+        resume=resume,
+        partition_mode=partition_mode,
+        target_rows_per_partition=target_rows_per_partition,
+        refresh_partition_stats=refresh_partition_stats,
+        checkpoint_store=checkpoint_store,
+        days=days,
+    )
+    if plan is None:
+        return
+
+    if plan["units_to_process"]:
+        if load_mode != "switch" and days is None:
+            disable_table_indexes(plan)
+        try:
+            run_table_units(
+                plan,
+                max_workers,
+                chunk_size,
+                commit_interval,
+                max_retries,
+                fetch_backend,
+                queue_depth,
+                load_mode,
+                loader,
+                adaptive_batching,
+                transform_mode,
+                transform_workers,
+                keyset_resume,
+            )
+        finally:
+            rebuild_table_indexes(
+                plan, online=rebuild_online, sort_in_tempdb=rebuild_sort_in_tempdb, maxdop=rebuild_maxdop
+            )
+        report_table_rowgroups(plan)
+
+    print_table_summary(plan)
+
+
+def run_table_units(
+    plan: Dict,
+    max_workers: int,
+    chunk_size: int,
+    commit_interval: int,
+    max_retries: int,
+    fetch_backend: str,
+    queue_depth: int,
+    load_mode: str,
+    loader: str,
+    adaptive_batching: bool,
+    transform_mode: str = "thread",
+    transform_workers: Optional[int] = None,
+    keyset_resume: bool = False,
+) -> None:
+    """Stream every pending unit of one table on a worker pool, checkpointing as they finish."""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                stream_unit,
+                plan,
+                month_key,
+                month_start,
+                month_end,
+                chunk_size,
+                commit_interval,
+                max_retries,
+                fetch_backend,
+                queue_depth,
+                load_mode,
+                loader,
+                adaptive_batching,
+                transform_mode,
+                transform_workers,
+                keyset_resume,
+                plan.get("resume", False),
+            ): month_key
+            for month_key, month_start, month_end in plan["units_to_process"]
+        }
+
+        for future in as_completed(futures):
+            error = future.exception()
+            record_unit_result(plan, futures[future], None if error else future.result(), error)
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Replicate table month-by-month with parallel workers using streaming."
@@ -647,17 +1319,119 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Resume from checkpoint if available.",
     )
+    parser.add_argument(
+        "--checkpoint-store",
+        choices=CHECKPOINT_BACKENDS,
+        default=config.CHECKPOINT_BACKEND,
+        help="Where unit status lives: SQLite file in --output-dir, or dbo.etl_replica_progress (migration 116) "
+        "(default: %(default)s, CHECKPOINT_BACKEND in .env).",
+    )
     parser.add_argument(
         "--max-retries",
         type=int,
         default=3,
         help="Number of retries per month on transient connection failures (default: %(default)s).",
     )
+    parser.add_argument(
+        "--fetch-backend",
+        choices=FETCH_BACKENDS,
+        default="auto",
+        help="Columnar source reader: arrow-odbc if installed, else pyodbc (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--queue-depth",
+        type=int,
+        default=2,
+        help="Chunks buffered between fetch, transform and insert stages per month (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--partition-mode",
+        choices=("month", "adaptive"),
+        default="month",
+        help="Unit of work: calendar months, or size-balanced day/hour ranges from source row counts (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--days-from",
+        default=None,
+        help="Reload only the MISSING/EXTRA days this table has in a reconciliation report "
+        "(tests/verify_daily_row_counts.py --output), one day per unit, within --start-date/--end-date.",
+    )
+    parser.add_argument(
+        "--target-rows-per-partition",
+        type=int,
+        default=None,
+        help="Rows per adaptive partition (default: sized so each worker gets a few partitions).",
+    )
+    parser.add_argument(
+        "--refresh-partition-stats",
+        action="store_true",
+        help="Ignore cached per-day row counts and recount the whole range on source.",
+    )
+    parser.add_argument(
+        "--load-mode",
+        choices=("delete", "switch"),
+        default="delete",
+        help="Replace each range with DELETE + INSERT, or load a staging table and SWITCH it into the partition (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--loader",
+        choices=LOADERS,
+        default="executemany",
+        help="How chunks are written: pyodbc executemany, bcp file handoff, or table-valued parameter (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--adaptive-batching",
+        action="store_true",
+        help="Start from --chunk-size/--commit-interval and re-size them per chunk from measured rows/sec, bytes per row and process RSS.",
+    )
+    parser.add_argument(
+        "--transform-mode",
+        choices=TRANSFORM_MODES,
+        default="thread",
+        help="Where chunks are converted: 'thread' (pipeline thread, default) or 'process' "
+        "(shared process pool, Arrow IPC via shared memory, workers render the bcp files; --loader bcp only, "
+        "other loaders fall back to threads).",
+    )
+    parser.add_argument(
+        "--transform-workers",
+        type=int,
+        default=None,
+        help="Processes for --transform-mode process (default: CPU count - 1).",
+    )
+    parser.add_argument(
+        "--keyset-resume",
+        action="store_true",
+        help="Read each range ordered by (date, ID) and commit a watermark to its dbo.etl_replica_progress row; "
+        "retries (and --resume) continue after it instead of reloading the range.",
+    )
+    parser.add_argument(
+        "--rebuild-online",
+        action="store_true",
+        help="Rebuild the disabled nonclustered indexes WITH (ONLINE = ON) after the run (Enterprise/Developer; falls back to offline).",
+    )
+    parser.add_argument(
+        "--rebuild-sort-in-tempdb",
+        action="store_true",
+        help="Rebuild indexes WITH (SORT_IN_TEMPDB = ON).",
+    )
+    parser.add_argument(
+        "--rebuild-maxdop",
+        type=int,
+        default=None,
+        help="MAXDOP for index rebuilds (default: server setting).",
+    )
     return parser.parse_args()
 
 
 def main():
     args = parse_args()
+    args.transform_mode = resolve_transform_mode(args.transform_mode, args.loader)
+    days = None
+    if args.days_from:
+        days = read_mismatched_days(Path(args.days_from)).get(args.table, [])
+        if not days:
+            print(f"[INFO] {args.table}: no mismatched days in {args.days_from}, nothing to repair")
+            return
 
     replicate_monthly_parallel(
         table_name=args.table,
@@ -669,7 +1443,24 @@ def main():
         resume=args.resume,
         commit_interval=args.commit_interval,
         max_retries=args.max_retries,
+        fetch_backend=args.fetch_backend,
+        queue_depth=args.queue_depth,
+        partition_mode=args.partition_mode,
+        target_rows_per_partition=args.target_rows_per_partition,
+        refresh_partition_stats=args.refresh_partition_stats,
+        load_mode=args.load_mode,
+        loader=args.loader,
+        adaptive_batching=args.adaptive_batching,
+        rebuild_online=args.rebuild_online,
+        rebuild_sort_in_tempdb=args.rebuild_sort_in_tempdb,
+        rebuild_maxdop=args.rebuild_maxdop,
+        transform_mode=args.transform_mode,
+        transform_workers=args.transform_workers,
+        keyset_resume=args.keyset_resume,
+        checkpoint_store=args.checkpoint_store,
+        days=days,
     )
+    report_pools()
 
 
 if __name__ == "__main__":
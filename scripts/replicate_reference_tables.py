@@ -8,6 +8,7 @@ keeping existing Parquet-based flows and helpers for compatibility.
 import argparse
 import json
 import sys
+import time
 import psutil
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from contextlib import contextmanager
@@ -19,50 +20,43 @@ from typing import Dict, Iterator, List, Optional, Tuple
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-import numpy as np
 import pandas as pd
 import pyarrow as pa
 import pyarrow.parquet as pq
 import pyodbc
 
 import config
+from utils.arrow_fetch import FETCH_BACKENDS, create_fetch_backend, resolve_fetch_backend_name
+from utils.chunk_controller import AdaptiveBatchController
+from utils.columnstore import COLUMNSTORE_MIN_BATCH_ROWS, is_columnstore_table, report_rowgroup_quality
+from utils.connection_pool import get_pool, report_pools
+from utils.load_manifest import (
+    ID_COLUMN,
+    column_checksum,
+    find_covering_load,
+    has_manifest_rows,
+    id_checksum,
+    manifest_range,
+    mark_loading,
+    partition_row_count,
+    record_load,
+)
+from utils.loaders import LOADERS, BufferedLoader, create_loader
+from utils.row_converter import (  # noqa: F401  (DATETIME_* / rounding re-exported for other scripts)
+    DATETIME_MAX,
+    DATETIME_MIN,
+    compile_row_converter,
+    merge_null_counts,
+    normalize_nulls,
+    report_null_counts,
+    round_to_datetime_precision,
+)
+from utils.schema_catalog import get_catalog
 
 REPLICA_SCHEMA_PATH = PROJECT_ROOT / "docs" / "replica_schema.json"
 FULL_SCHEMA_PATH = PROJECT_ROOT / "docs" / "xilnex_full_schema.json"
-
-# SQL Server DATETIME range limits
-DATETIME_MIN = datetime(1753, 1, 1, 0, 0, 0)
-DATETIME_MAX = datetime(9999, 12, 31, 23, 59, 59)
-
-
-def round_to_datetime_precision(dt: datetime) -> datetime:
-    """
-    Round datetime to SQL Server DATETIME precision.
-    
-    DATETIME has precision of 1/300 second (approximately 3.33ms).
-    This function rounds microseconds to the nearest 1/300 second increment.
-    
-    Example:
-    - 123456 microseconds → rounds to nearest 3333 microsecond increment
-    - Result: datetime with microseconds rounded to valid DATETIME precision
-    """
-    if dt.microsecond == 0:
-        return dt
-    
-    # DATETIME precision: 1/300 second = 3333.33... microseconds
-    # Round to nearest 3333 microsecond increment
-    increment = 1000000 / 300  # Approximately 3333.33 microseconds
-    rounded_microseconds = round(dt.microsecond / increment) * increment
-    
-    # Ensure we don't exceed 999999 microseconds
-    if rounded_microseconds >= 1000000:
-        # Round up to next second, reset microseconds to 0
-        return dt.replace(microsecond=0) + timedelta(seconds=1)
-    
-    # Round to integer microseconds
-    rounded_microseconds = int(rounded_microseconds)
-    
-    return dt.replace(microsecond=rounded_microseconds)
+# Compiled catalog of the two files above (rebuilt when either changes)
+SCHEMA_CACHE_PATH = PROJECT_ROOT / ".cache" / "schema_catalog.pickle"
 
 # Tables that support date filtering and the column to use
 DATE_FILTER_COLUMNS = {
@@ -82,6 +76,11 @@ DATE_FILTER_COLUMNS = {
     "APP_4_VOUCHER": "DATETIME__VOUCHER_DATE",
 }
 
+# Incremental reference sync: rowversion column, upsert key, and where high-water marks live
+ROWVERSION_COLUMN = "UPDATE_TIMESTAMP"
+UPSERT_KEY_COLUMN = "ID"
+WATERMARK_TABLE = "dbo.etl_replica_watermark"
+
 # Compression mapping
 COMPRESSION_MAP = {
     "snappy": "snappy",
@@ -116,48 +115,46 @@ class ConnectionManager:
 
 
 def load_schema() -> Dict[str, dict]:
-    """Load actual table schemas from xilnex_full_schema.json."""
-    # Get table names from replica_schema.json
-    replica_data = json.loads(REPLICA_SCHEMA_PATH.read_text(encoding="utf-8"))
-    table_names = [t["name"] for t in replica_data["tables"]]
-    
-    # Load full Xilnex schema
-    full_schema = json.loads(FULL_SCHEMA_PATH.read_text(encoding="utf-8"))
-    
-    # Extract schemas for our tables
-    result = {}
-    for table_name in table_names:
-        full_table_key = f"COM_5013.{table_name}"
-        if full_table_key not in full_schema:
-            # Try to find it
-            for key in full_schema.keys():
-                if key.endswith(f".{table_name}"):
-                    full_table_key = key
-                    break
-            else:
-                print(f"[WARN] Table {table_name} not found in xilnex_full_schema.json", file=sys.stderr)
-                continue
-        
-        schema_entry = full_schema[full_table_key]
-        # Convert to format expected by rest of code
-        result[table_name] = {
-            "name": table_name,
-            "schema": schema_entry.get("schema", "COM_5013"),
-            "columns": sorted(schema_entry["columns"], key=lambda x: x.get("ordinal_position", 999))
-        }
-    
-    return result
+    """
+    Load actual table schemas from xilnex_full_schema.json.
+
+    Served by the compiled schema catalog (utils/schema_catalog.py): the JSON is
+    only parsed when it changed since the cached compile. The entries are shared
+    by every caller in the process; copy one before modifying it.
+    """
+    return get_catalog(REPLICA_SCHEMA_PATH, FULL_SCHEMA_PATH, SCHEMA_CACHE_PATH).schema()
+
+
+def get_source_connection_string() -> str:
+    return config.build_connection_string(config.AZURE_SQL_CONFIG)
+
+
+def get_target_connection_string() -> str:
+    # Trust server certificate for local connections
+    return config.build_connection_string(config.TARGET_SQL_CONFIG, trust_server_cert=True)
+
+
+def get_pooled_connection(pool_name: str, connection_string: str):
+    """
+    Check out a connection from the process-wide pool ``pool_name``.
+
+    close() returns it to the pool; idle connections are pinged before reuse.
+    """
+    pool = get_pool(
+        pool_name,
+        lambda: pyodbc.connect(connection_string),
+        max_size=config.DB_POOL_MAX_SIZE,
+        max_lifetime=config.DB_POOL_MAX_LIFETIME,
+    )
+    return pool.acquire()
 
 
 def get_source_connection():
-    conn_str = config.build_connection_string(config.AZURE_SQL_CONFIG)
-    return pyodbc.connect(conn_str)
+    return get_pooled_connection("source", get_source_connection_string())
 
 
 def get_target_connection():
-    # Trust server certificate for local connections
-    conn_str = config.build_connection_string(config.TARGET_SQL_CONFIG, trust_server_cert=True)
-    return pyodbc.connect(conn_str)
+    return get_pooled_connection("target", get_target_connection_string())
 
 
 def build_select_statement(
@@ -597,6 +594,58 @@ def get_target_table_schema(
 
 
 
+def create_target_loader(
+    name: str,
+    conn,
+    target_table: str,
+    columns: List[str],
+    table_lock: bool = False,
+    type_table: Optional[str] = None,
+):
+    """
+    Create a chunk loader (utils/loaders.py) for a target table.
+
+    ``type_table`` is the table whose columns define the tvp table type, when
+    ``target_table`` is a copy of it (a switch staging table or a bench table).
+
+    Loaders that write on their own session (bcp) cannot see the caller's
+    uncommitted DELETE, so pending work on ``conn`` is committed first.
+
+    On clustered columnstore targets, bcp/tvp loaders are wrapped in a
+    BufferedLoader that writes at least COLUMNSTORE_MIN_BATCH_ROWS rows per load,
+    so rows compress directly instead of going through the delta store. Callers
+    must flush() before the final commit.
+    """
+    chunk_loader = create_loader(
+        name,
+        conn,
+        target_table,
+        columns,
+        table_lock=table_lock,
+        db_config={**config.TARGET_SQL_CONFIG, "bcp_password_on_command_line": config.BCP_PASSWORD_ON_COMMAND_LINE},
+        bcp_path=config.BCP_PATH,
+        type_table=type_table,
+        connect=lambda: pyodbc.connect(get_target_connection_string()),
+    )
+    cursor = conn.cursor()
+    try:
+        columnstore = is_columnstore_table(cursor, target_table)
+    finally:
+        cursor.close()
+    if columnstore and chunk_loader.name == "executemany":
+        # Buffering would not help: parameterized inserts always land in the delta store
+        print(
+            f"[WARN] {target_table} is clustered columnstore; executemany inserts go through the "
+            "delta store. Use --loader bcp or --loader tvp for compressed bulk loads.",
+            file=sys.stderr,
+        )
+    elif columnstore:
+        chunk_loader = BufferedLoader(chunk_loader, COLUMNSTORE_MIN_BATCH_ROWS)
+    if chunk_loader.separate_session:
+        conn.commit()
+    return chunk_loader
+
+
 def load_via_bulk_insert(
     table_name: str,
     schema_entry: dict,
@@ -605,8 +654,14 @@ def load_via_bulk_insert(
     end_date: Optional[str],
     full_table: bool = False,
     conn_manager: Optional[ConnectionManager] = None,
+    loader: str = "executemany",
 ) -> int:
-    """Load data using SQL Server BULK INSERT from Parquet file."""
+    """
+    Load data using SQL Server BULK INSERT from Parquet file.
+
+    Falls back to streaming the file through ``loader`` when the server cannot
+    read Parquet (OPENROWSET) or cannot access the file.
+    """
     target_table = f"dbo.com_5013_{table_name}"
     
     # Use provided connection or create new
@@ -621,14 +676,7 @@ def load_via_bulk_insert(
         cursor = conn.cursor()
         
         # Delete existing range if date-filtered
-        delete_existing_range(
-            cursor,
-            target_table,
-            DATE_FILTER_COLUMNS.get(table_name),
-            start_date,
-            end_date,
-            full_table=full_table,
-        )
+        clear_existing_range(cursor, table_name, target_table, start_date, end_date, full_table=full_table)
         
         # Convert Windows path to format SQL Server can access
         # For local SQL Server, use the file path directly
@@ -656,20 +704,20 @@ def load_via_bulk_insert(
             print(f"[LOAD] {table_name}: loaded {rows_loaded:,} rows via BULK INSERT")
             return rows_loaded
         except Exception as e:
-            # Fallback to regular batch loading
-            print(f"[WARN] BULK INSERT failed, falling back to batch loading: {e}", file=sys.stderr)
-            # Read Parquet and load in batches
-            df = pd.read_parquet(parquet_path, engine="pyarrow")
-            return load_in_batches(
+            # Fallback: stream the file in row groups (never the whole file in memory)
+            print(f"[WARN] BULK INSERT failed, falling back to streaming {loader} load: {e}", file=sys.stderr)
+            conn.rollback()
+            return load_from_parquet_streaming(
                 table_name,
                 schema_entry,
-                df,
+                parquet_path,
                 start_date,
                 end_date,
                 full_table=full_table,
                 batch_size=100000,
                 commit_interval=100000,
                 conn_manager=conn_manager,
+                loader=loader,
             )
     finally:
         if close_conn:
@@ -686,6 +734,7 @@ def load_from_parquet_streaming(
     batch_size: int = 100000,
     commit_interval: int = 100000,
     conn_manager: Optional[ConnectionManager] = None,
+    loader: str = "executemany",
 ) -> int:
     """Load from Parquet file in streaming fashion (no full DataFrame in memory)."""
     # Check if file exists and has data
@@ -700,8 +749,7 @@ def load_from_parquet_streaming(
     
     target_table = f"dbo.com_5013_{table_name}"
     columns = [col["name"] for col in schema_entry["columns"]]
-    placeholders = ", ".join(["?"] * len(columns))
-    column_list = ", ".join(columns)
+    row_converter = compile_row_converter(schema_entry)
     
     # Use provided connection or create new
     if conn_manager and conn_manager.target_conn:
@@ -711,89 +759,44 @@ def load_from_parquet_streaming(
         conn = get_target_connection()
         close_conn = True
     
+    chunk_loader = None
     try:
         cursor = conn.cursor()
         
         # Delete existing range if date-filtered
-        delete_existing_range(
-            cursor,
-            target_table,
-            DATE_FILTER_COLUMNS.get(table_name),
-            start_date,
-            end_date,
-            full_table=full_table,
-        )
+        clear_existing_range(cursor, table_name, target_table, start_date, end_date, full_table=full_table)
         
-        cursor.fast_executemany = True
+        chunk_loader = create_target_loader(loader, conn, target_table, columns)
         total_loaded = 0
         rows_since_commit = 0
+        null_counts: Dict[str, int] = {}
         
         # Read Parquet in chunks using PyArrow's iter_batches (pd.read_parquet doesn't support chunksize)
         parquet_file = pq.ParquetFile(parquet_path)
         
         for batch_idx, batch in enumerate(parquet_file.iter_batches(batch_size=batch_size)):
-            # Convert PyArrow batch to pandas DataFrame
-            batch_df = batch.to_pandas()
-            
-            if batch_df.empty:
+            if batch.num_rows == 0:
                 continue
             
-            # Prepare data for SQL
-            batch_df = prepare_data_for_sql(batch_df, schema_entry)
-            
-            # Pre-insert validation: convert any remaining NaN/NaT to NULL (None)
-            # Log conversions for visibility
-            for col_name in batch_df.columns:
-                # Check each value for NaN/NaT using same logic as conversion function
-                for idx, val in enumerate(batch_df[col_name]):
-                    if val is None:
-                        continue
-                    
-                    # Check for NaN/NaT FIRST using pandas (same as conversion function)
-                    try:
-                        if pd.isna(val):
-                            batch_df.iat[idx, batch_df.columns.get_loc(col_name)] = None
-                            continue
-                    except (TypeError, ValueError):
-                        pass
-                    
-                    # Explicit check for float NaN (fallback)
-                    if isinstance(val, (float, np.floating)):
-                        try:
-                            if np.isnan(val):
-                                batch_df.iat[idx, batch_df.columns.get_loc(col_name)] = None
-                                continue
-                        except (TypeError, ValueError):
-                            pass
-                        if isinstance(val, float) and (val != val):
-                            batch_df.iat[idx, batch_df.columns.get_loc(col_name)] = None
-                            continue
-                    
-                    # Explicit check for NaT
-                    if val is pd.NaT:
-                        batch_df.iat[idx, batch_df.columns.get_loc(col_name)] = None
-                        continue
+            # Pre-insert validation: NaN -> NULL via Arrow validity bitmaps (no pandas round-trip)
+            batch, nulled = normalize_nulls(batch)
+            merge_null_counts(null_counts, nulled)
             
-            # Validate numeric values before insert (catch issues early)
+            # Type conversion + tuple building in one compiled pass
             try:
-                batch_data = [
-                    build_row_tuple(row)
-                    for row in batch_df[columns].itertuples(index=False, name=None)
-                ]
+                batch_data = row_converter.convert(batch, columns)
             except Exception as e:
                 print(f"[ERROR] {table_name}: Failed to prepare batch {batch_idx}: {e}", file=sys.stderr)
                 raise
             
             try:
-                cursor.executemany(
-                    f"INSERT INTO {target_table} ({column_list}) VALUES ({placeholders})",
-                    batch_data,
-                )
+                chunk_loader.load(batch_data)
             except Exception as e:
                 # If we get a numeric error, try to identify the problematic column/value
                 error_msg = str(e)
                 if "Numeric value out of range" in error_msg or "Fractional truncation" in error_msg:
                     print(f"[ERROR] {table_name}: Numeric error in batch {batch_idx}. Analyzing problematic values...", file=sys.stderr)
+                    batch_df = batch.to_pandas()
                     # Try to identify which column is causing the issue
                     for col_info in schema_entry["columns"]:
                         col_name = col_info["name"]
@@ -816,8 +819,8 @@ def load_from_parquet_streaming(
                                 print(f"[DEBUG] {col_name} (INT): min={min_val}, max={max_val}, dtype={batch_df[col_name].dtype}", file=sys.stderr)
                 raise
             
-            total_loaded += len(batch_df)
-            rows_since_commit += len(batch_df)
+            total_loaded += batch.num_rows
+            rows_since_commit += batch.num_rows
             
             # Commit at intervals
             if rows_since_commit >= commit_interval:
@@ -825,15 +828,21 @@ def load_from_parquet_streaming(
                 rows_since_commit = 0
                 print(f"  [LOAD] {table_name}: committed {total_loaded:,} rows", end="\r", flush=True)
         
-        # Final commit
+        # Final commit (columnstore targets hold back rows until flushed)
+        chunk_loader.flush()
         conn.commit()
+        row_converter.report_out_of_range()
+        report_null_counts(table_name, null_counts)
         print(f"\n[LOAD] {table_name}: loaded {total_loaded:,} rows into {target_table}")
+        report_rowgroup_quality(cursor, target_table)
         
         return total_loaded
     except Exception as e:
         print(f"[ERROR] {table_name}: Failed to load from Parquet: {e}", file=sys.stderr)
         raise
     finally:
+        if chunk_loader:
+            chunk_loader.close()
         if close_conn:
             conn.close()
 
@@ -848,6 +857,7 @@ def load_in_batches(
     batch_size: int = 100000,
     commit_interval: int = 100000,
     conn_manager: Optional[ConnectionManager] = None,
+    loader: str = "executemany",
 ) -> int:
     """Load DataFrame into target database in batches."""
     if df.empty:
@@ -856,36 +866,11 @@ def load_in_batches(
 
     target_table = f"dbo.com_5013_{table_name}"
     columns = [col["name"] for col in schema_entry["columns"]]
-    placeholders = ", ".join(["?"] * len(columns))
-    column_list = ", ".join(columns)
     
-    # Prepare data
-    df = prepare_data_for_sql(df, schema_entry)
+    row_converter = compile_row_converter(schema_entry)
     
-    # Pre-insert validation: convert any remaining NaN/NaT to NULL (None)
-    for col_name in df.columns:
-        for idx, val in enumerate(df[col_name]):
-            if val is None:
-                continue
-            try:
-                if pd.isna(val):
-                    df.iat[idx, df.columns.get_loc(col_name)] = None
-                    continue
-            except (TypeError, ValueError):
-                pass
-            if isinstance(val, (float, np.floating)):
-                try:
-                    if np.isnan(val):
-                        df.iat[idx, df.columns.get_loc(col_name)] = None
-                        continue
-                except (TypeError, ValueError):
-                    pass
-                if isinstance(val, float) and (val != val):
-                    df.iat[idx, df.columns.get_loc(col_name)] = None
-                    continue
-            if val is pd.NaT:
-                df.iat[idx, df.columns.get_loc(col_name)] = None
-                continue
+    # Pre-insert validation: NaN/NaT -> NULL in one vectorized pass (Arrow when possible)
+    data, null_counts = normalize_nulls(df)
     
     # Use provided connection or create new
     if conn_manager and conn_manager.target_conn:
@@ -895,38 +880,29 @@ def load_in_batches(
         conn = get_target_connection()
         close_conn = True
     
+    chunk_loader = None
     try:
         cursor = conn.cursor()
         
         # Delete existing range if date-filtered
-        delete_existing_range(
-            cursor,
-            target_table,
-            DATE_FILTER_COLUMNS.get(table_name),
-            start_date,
-            end_date,
-            full_table=full_table,
-        )
+        clear_existing_range(cursor, table_name, target_table, start_date, end_date, full_table=full_table)
         
-        cursor.fast_executemany = True
+        chunk_loader = create_target_loader(loader, conn, target_table, columns)
         total_loaded = 0
         rows_since_commit = 0
         
         # Process in batches
         for i in range(0, len(df), batch_size):
-            batch = df.iloc[i:i + batch_size]
-            batch_data = [
-                build_row_tuple(row)
-                for row in batch[columns].itertuples(index=False, name=None)
-            ]
+            if isinstance(data, pa.Table):
+                batch = data.slice(i, batch_size)
+            else:
+                batch = data.iloc[i:i + batch_size]
+            batch_data = row_converter.convert(batch, columns)
             
-            cursor.executemany(
-                f"INSERT INTO {target_table} ({column_list}) VALUES ({placeholders})",
-                batch_data,
-            )
+            chunk_loader.load(batch_data)
             
-            total_loaded += len(batch)
-            rows_since_commit += len(batch)
+            total_loaded += len(batch_data)
+            rows_since_commit += len(batch_data)
             
             # Commit at intervals
             if rows_since_commit >= commit_interval:
@@ -934,16 +910,38 @@ def load_in_batches(
                 rows_since_commit = 0
                 print(f"  [LOAD] {table_name}: committed {total_loaded:,} rows", end="\r", flush=True)
         
-        # Final commit
+        # Final commit (columnstore targets hold back rows until flushed)
+        chunk_loader.flush()
         conn.commit()
+        row_converter.report_out_of_range()
+        report_null_counts(table_name, null_counts)
         print(f"\n[LOAD] {table_name}: loaded {total_loaded:,} rows into {target_table}")
+        report_rowgroup_quality(cursor, target_table)
         
         return total_loaded
     finally:
+        if chunk_loader:
+            chunk_loader.close()
         if close_conn:
             conn.close()
 
 
+def can_truncate(cursor: pyodbc.Cursor, target_table: str) -> bool:
+    """TRUNCATE TABLE is refused for tables referenced by foreign keys or schema-bound views."""
+    cursor.execute(
+        """
+        SELECT
+            (SELECT COUNT(*) FROM sys.foreign_keys WHERE referenced_object_id = OBJECT_ID(?)) +
+            (SELECT COUNT(*) FROM sys.sql_expression_dependencies
+             WHERE referenced_id = OBJECT_ID(?) AND is_schema_bound_reference = 1)
+        """,
+        target_table,
+        target_table,
+    )
+    row = cursor.fetchone()
+    return not (row and row[0])
+
+
 def delete_existing_range(
     cursor: pyodbc.Cursor,
     target_table: str,
@@ -951,23 +949,92 @@ def delete_existing_range(
     start_date: Optional[str],
     end_date: Optional[str],
     full_table: bool = False,
-):
+    batch_size: Optional[int] = None,
+) -> Tuple[str, int]:
+    """
+    Clear the rows a reload is about to replace.
+
+    A full-table refresh uses TRUNCATE TABLE (minimally logged) unless foreign
+    keys or schema-bound views block it. Otherwise rows are deleted in
+    DELETE TOP (batch_size) loops, and each batch is committed, so the log
+    can be reused and locks are released between batches. The first commit
+    would also commit anything already pending on the cursor's connection, so
+    callers must not have an open write transaction on it: pass a connection
+    that is fresh from the pool or was just committed.
+
+    Batch sizes come from SELECT @@ROWCOUNT, not cursor.rowcount, which is -1
+    when the session runs with SET NOCOUNT ON.
+
+    The range is marked "loading" in the load manifest first (same transaction
+    as the TRUNCATE / first batch), so --skip-existing stops treating it as loaded.
+
+    Returns (method, rows): method is "truncate", "delete" or "none"; rows is -1
+    for TRUNCATE (not counted).
+    """
+    batch_size = batch_size or config.DELETE_BATCH_ROWS
+    if not full_table and (not date_column or not start_date):
+        return "none", 0
+    mark_loading(cursor, target_table, *manifest_range(full_table, start_date, end_date))
     if full_table:
-        cursor.execute(f"DELETE FROM {target_table}")
-        return
-    if not date_column or not start_date:
-        return
-    if end_date:
-        cursor.execute(
-            f"DELETE FROM {target_table} WHERE {date_column} >= ? AND {date_column} < ?",
-            start_date,
-            end_date,
-        )
+        if can_truncate(cursor, target_table):
+            try:
+                cursor.execute(f"TRUNCATE TABLE {target_table}")
+                return "truncate", -1
+            except pyodbc.Error as exc:
+                # Typically missing ALTER permission
+                print(f"[WARN] TRUNCATE {target_table} failed, deleting in batches: {exc}", file=sys.stderr)
+        where, params = "", []
+    elif end_date:
+        where, params = f" WHERE {date_column} >= ? AND {date_column} < ?", [start_date, end_date]
     else:
-        cursor.execute(
-            f"DELETE FROM {target_table} WHERE {date_column} = ?",
-            start_date,
-        )
+        where, params = f" WHERE {date_column} = ?", [start_date]
+
+    deleted = 0
+    while True:
+        cursor.execute(f"DELETE TOP ({int(batch_size)}) FROM {target_table}{where}; SELECT @@ROWCOUNT", *params)
+        # Skip the DELETE's row count result (present unless NOCOUNT is on)
+        while cursor.description is None and cursor.nextset():
+            pass
+        batch_rows = cursor.fetchone()[0]
+        cursor.connection.commit()
+        if batch_rows <= 0:
+            break
+        deleted += batch_rows
+        if batch_rows < batch_size:
+            break
+        print(f"  [DELETE] {target_table}: deleted {deleted:,} rows", end="\r", flush=True)
+    if deleted > batch_size:
+        print()  # end the progress line
+    return "delete", deleted
+
+
+def describe_delete(method: str, rows: int, seconds: float) -> str:
+    """e.g. "TRUNCATE 0.1s" or "DELETE 12.3s (1,234,567 rows)"."""
+    if method == "truncate":
+        return f"TRUNCATE {seconds:.1f}s"
+    return f"DELETE {seconds:.1f}s ({rows:,} rows)"
+
+
+def clear_existing_range(
+    cursor: pyodbc.Cursor,
+    table_name: str,
+    target_table: str,
+    start_date: Optional[str],
+    end_date: Optional[str],
+    full_table: bool = False,
+) -> None:
+    """delete_existing_range() for the reference loaders, with a [TIMING] line."""
+    start = time.perf_counter()
+    method, rows = delete_existing_range(
+        cursor,
+        target_table,
+        DATE_FILTER_COLUMNS.get(table_name),
+        start_date,
+        end_date,
+        full_table=full_table,
+    )
+    if method != "none":
+        print(f"[TIMING] {table_name}: {describe_delete(method, rows, time.perf_counter() - start)}")
 
 
 def stream_full_table_direct(
@@ -977,8 +1044,14 @@ def stream_full_table_direct(
     end_date: Optional[str],
     args: argparse.Namespace,
     conn_manager: Optional[ConnectionManager] = None,
+    read_stats: Optional[Dict[str, int]] = None,
 ) -> int:
-    """Stream a full table directly from source to target without Parquet."""
+    """
+    Stream a full table directly from source to target without Parquet.
+
+    ``read_stats["ids"]`` (when given) accumulates SUM(ID) of the streamed batches
+    for the load manifest.
+    """
     query, params = build_select_statement(
         table_name,
         schema_entry,
@@ -988,15 +1061,17 @@ def stream_full_table_direct(
     )
 
     columns = [col["name"] for col in schema_entry["columns"]]
-    placeholders = ", ".join(["?"] * len(columns))
-    column_list = ", ".join(columns)
     target_table = f"dbo.com_5013_{table_name}"
-    insert_sql = f"INSERT INTO {target_table} ({column_list}) VALUES ({placeholders})"
+    row_converter = compile_row_converter(schema_entry)
 
     print(f"\n[STREAM] {table_name}: streaming full table directly to target")
 
-    # Connections
-    if conn_manager and conn_manager.source_conn:
+    # Connections (arrow-odbc opens its own source connection from the connection string)
+    fetch_backend_name = resolve_fetch_backend_name(getattr(args, "fetch_backend", "auto"))
+    if fetch_backend_name != "pyodbc":
+        source_conn = None
+        close_source = False
+    elif conn_manager and conn_manager.source_conn:
         source_conn = conn_manager.source_conn
         close_source = False
     else:
@@ -1010,45 +1085,53 @@ def stream_full_table_direct(
         target_conn = get_target_connection()
         close_target = True
 
+    chunk_loader = None
     try:
         cursor = target_conn.cursor()
-        cursor.fast_executemany = True
-        delete_existing_range(
-            cursor,
-            target_table,
-            DATE_FILTER_COLUMNS.get(table_name),
-            start_date,
-            end_date,
-            full_table=True,
-        )
+        clear_existing_range(cursor, table_name, target_table, start_date, end_date, full_table=True)
+        chunk_loader = create_target_loader(getattr(args, "loader", "executemany"), target_conn, target_table, columns)
 
         total_loaded = 0
         rows_since_commit = 0
         first_chunk = True
+        batch_controller = (
+            AdaptiveBatchController.for_table(table_name, table_name, args.chunk_size, args.commit_interval)
+            if getattr(args, "adaptive_batching", False)
+            else None
+        )
 
-        chunk_iter = pd.read_sql_query(
+        fetch_backend = create_fetch_backend(
+            fetch_backend_name,
+            connection=source_conn,
+            connection_string=get_source_connection_string(),
+        )
+        batch_iter = fetch_backend.iter_batches(
             query,
-            source_conn,
-            params=params if params else None,
-            chunksize=args.chunk_size,
+            params,
+            schema_entry,
+            (lambda: batch_controller.chunk_rows) if batch_controller else args.chunk_size,
         )
 
-        for chunk_idx, chunk in enumerate(chunk_iter):
-            if chunk.empty:
+        for chunk_idx, batch in enumerate(batch_iter):
+            if batch.num_rows == 0:
                 continue
 
             if first_chunk:
-                validate_columns(table_name, schema_entry, chunk.columns)
+                validate_columns(table_name, schema_entry, batch.schema.names)
                 first_chunk = False
+            if read_stats is not None:
+                read_stats["ids"] += id_checksum(batch)
 
-            chunk = prepare_data_for_sql(chunk, schema_entry)
-            batch_data = [
-                build_row_tuple(row)
-                for row in chunk[columns].itertuples(index=False, name=None)
-            ]
+            batch_data = row_converter.convert(batch, columns)
+            if batch_controller:
+                batch_controller.observe_batch(batch.num_rows, batch.nbytes)
 
             try:
-                cursor.executemany(insert_sql, batch_data)
+                load_start = time.perf_counter()
+                written = chunk_loader.load(batch_data)
+                # Buffered (columnstore) chunks that wrote nothing say nothing about insert speed
+                if batch_controller and written:
+                    batch_controller.record_insert(written, time.perf_counter() - load_start)
             except Exception as exc:
                 print(f"[ERROR] {table_name}: failed during direct stream chunk {chunk_idx}: {exc}", file=sys.stderr)
                 raise
@@ -1056,14 +1139,191 @@ def stream_full_table_direct(
             total_loaded += len(batch_data)
             rows_since_commit += len(batch_data)
 
-            if rows_since_commit >= args.commit_interval:
+            if rows_since_commit >= (batch_controller.commit_interval if batch_controller else args.commit_interval):
                 target_conn.commit()
                 rows_since_commit = 0
                 print(f"  [STREAM] {table_name}: committed {total_loaded:,} rows", end="\r", flush=True)
 
+        chunk_loader.flush()
         target_conn.commit()
         print(f"\n[STREAM] {table_name}: streamed {total_loaded:,} rows directly to target")
+        report_rowgroup_quality(cursor, target_table)
+        if batch_controller:
+            print(f"[ADAPT] {table_name}: settled on {batch_controller.summary()}")
         return total_loaded
+    finally:
+        if chunk_loader:
+            chunk_loader.close()
+        if close_source:
+            source_conn.close()
+        if close_target:
+            target_conn.close()
+
+
+def supports_incremental(schema_entry: dict) -> bool:
+    """True when the table has a rowversion UPDATE_TIMESTAMP and an ID to upsert on."""
+    types = {col["name"]: (col.get("type") or "").lower() for col in schema_entry["columns"]}
+    return types.get(ROWVERSION_COLUMN) == "timestamp" and UPSERT_KEY_COLUMN in types
+
+
+def load_watermark(cursor: pyodbc.Cursor, table_name: str) -> Optional[bytes]:
+    """Read the stored rowversion high-water mark for a table (None if never synced)."""
+    cursor.execute(f"SELECT watermark FROM {WATERMARK_TABLE} WHERE table_name = ?", table_name)
+    row = cursor.fetchone()
+    return bytes(row[0]) if row and row[0] is not None else None
+
+
+def save_watermark(
+    cursor: pyodbc.Cursor,
+    table_name: str,
+    watermark: bytes,
+    rows_applied: int,
+    sync_mode: str,
+) -> None:
+    """Upsert the high-water mark (caller commits, so it lands with the data)."""
+    cursor.execute(f"""
+        MERGE {WATERMARK_TABLE} AS target
+        USING (SELECT ? AS table_name) AS source
+        ON target.table_name = source.table_name
+        WHEN MATCHED THEN
+            UPDATE SET watermark = ?, rows_applied = ?, sync_mode = ?, updated_at = SYSUTCDATETIME()
+        WHEN NOT MATCHED THEN
+            INSERT (table_name, watermark, rows_applied, sync_mode)
+            VALUES (?, ?, ?, ?);
+    """, table_name, watermark, rows_applied, sync_mode, table_name, watermark, rows_applied, sync_mode)
+
+
+def get_source_rowversion_mark(source_conn) -> bytes:
+    """
+    Source MIN_ACTIVE_ROWVERSION(): every committed row has a lower rowversion, and
+    rows committed later (including by transactions open right now) get one >= it.
+    """
+    cursor = source_conn.cursor()
+    try:
+        cursor.execute("SELECT MIN_ACTIVE_ROWVERSION()")
+        return bytes(cursor.fetchone()[0])
+    finally:
+        cursor.close()
+
+
+def stream_full_table_incremental(
+    table_name: str,
+    schema_entry: dict,
+    args: argparse.Namespace,
+    conn_manager: Optional[ConnectionManager] = None,
+    read_stats: Optional[Dict[str, int]] = None,
+) -> Tuple[int, str]:
+    """
+    Sync a reference table from its rowversion high-water mark instead of reloading it.
+
+    Without a stored watermark the table is seeded with a normal full stream. Otherwise
+    only rows with UPDATE_TIMESTAMP >= watermark are pulled into a #temp stage and
+    MERGEd into the target on ID. The merge and the new watermark commit in one
+    transaction. Rows deleted at source are not detected; run a plain --full-table
+    load periodically to drop them.
+
+    Returns:
+        (rows applied, "full" or "incremental")
+    """
+    target_table = f"dbo.com_5013_{table_name}"
+    columns = [col["name"] for col in schema_entry["columns"]]
+    column_list = ", ".join(columns)
+    placeholders = ", ".join(["?"] * len(columns))
+    stage_table = f"#stage_{table_name}"
+    row_converter = compile_row_converter(schema_entry)
+
+    fetch_backend_name = resolve_fetch_backend_name(getattr(args, "fetch_backend", "auto"))
+    if conn_manager and conn_manager.source_conn:
+        source_conn = conn_manager.source_conn
+        close_source = False
+    else:
+        source_conn = get_source_connection()
+        close_source = True
+    if conn_manager and conn_manager.target_conn:
+        target_conn = conn_manager.target_conn
+        close_target = False
+    else:
+        target_conn = get_target_connection()
+        close_target = True
+
+    try:
+        cursor = target_conn.cursor()
+        watermark = load_watermark(cursor, table_name)
+        # Capture the next mark before reading, so rows changed during the sync are picked up next time
+        next_watermark = get_source_rowversion_mark(source_conn)
+
+        if watermark is None:
+            print(f"[INCR] {table_name}: no watermark yet, seeding with a full load")
+            # Seed on the connections held here; a second checkout could wait on the pool size limit
+            rows_loaded = stream_full_table_direct(
+                table_name,
+                schema_entry,
+                None,
+                None,
+                args,
+                conn_manager=ConnectionManager(source_conn, target_conn),
+                read_stats=read_stats,
+            )
+            save_watermark(cursor, table_name, next_watermark, rows_loaded, "full")
+            target_conn.commit()
+            print(f"[INCR] {table_name}: watermark set to 0x{next_watermark.hex()}")
+            return rows_loaded, "full"
+
+        # Literal (not a parameter): arrow-odbc binds parameters as text
+        query, params = build_select_statement(table_name, schema_entry, None, None, full_table=True)
+        query += f" WHERE {ROWVERSION_COLUMN} >= 0x{watermark.hex()}"
+        print(f"\n[INCR] {table_name}: pulling rows with {ROWVERSION_COLUMN} >= 0x{watermark.hex()}")
+
+        cursor.fast_executemany = True
+        cursor.execute(f"IF OBJECT_ID('tempdb..{stage_table}') IS NOT NULL DROP TABLE {stage_table}")
+        cursor.execute(f"SELECT TOP 0 {column_list} INTO {stage_table} FROM {target_table}")
+
+        fetch_backend = create_fetch_backend(
+            fetch_backend_name,
+            connection=source_conn,
+            connection_string=get_source_connection_string(),
+        )
+        staged = 0
+        first_chunk = True
+        for batch in fetch_backend.iter_batches(query, params, schema_entry, args.chunk_size):
+            if batch.num_rows == 0:
+                continue
+            if first_chunk:
+                validate_columns(table_name, schema_entry, batch.schema.names)
+                first_chunk = False
+            batch_data = row_converter.convert(batch, columns)
+            cursor.executemany(
+                f"INSERT INTO {stage_table} ({column_list}) VALUES ({placeholders})",
+                batch_data,
+            )
+            staged += len(batch_data)
+
+        merged = 0
+        if staged:
+            update_set = ", ".join(
+                f"target.{col} = source.{col}" for col in columns if col != UPSERT_KEY_COLUMN
+            )
+            source_values = ", ".join(f"source.{col}" for col in columns)
+            cursor.execute(f"""
+                MERGE {target_table} WITH (HOLDLOCK) AS target
+                USING {stage_table} AS source
+                ON target.{UPSERT_KEY_COLUMN} = source.{UPSERT_KEY_COLUMN}
+                WHEN MATCHED THEN
+                    UPDATE SET {update_set}
+                WHEN NOT MATCHED THEN
+                    INSERT ({column_list}) VALUES ({source_values});
+            """)
+            merged = cursor.rowcount if cursor.rowcount and cursor.rowcount > 0 else staged
+
+        save_watermark(cursor, table_name, next_watermark, merged, "incremental")
+        target_conn.commit()
+        cursor.execute(f"DROP TABLE {stage_table}")
+        target_conn.commit()
+        print(f"[INCR] {table_name}: upserted {merged:,} changed row(s); watermark 0x{next_watermark.hex()}")
+        return merged, "incremental"
+    except Exception:
+        target_conn.rollback()
+        raise
     finally:
         if close_source:
             source_conn.close()
@@ -1078,9 +1338,11 @@ def stream_export_and_load(
     end_date: Optional[str],
     args: argparse.Namespace,
     conn_manager: Optional[ConnectionManager] = None,
+    read_stats: Optional[Dict[str, int]] = None,
 ) -> Tuple[Path, int, int]:
     """
     Stream export and load: process chunks one at a time.
+    ``read_stats["ids"]`` (when given) accumulates SUM(ID) of the exported chunks.
     Returns: (parquet_path, total_rows, rows_loaded)
     """
     query, params = build_select_statement(
@@ -1129,6 +1391,8 @@ def stream_export_and_load(
                 if first_chunk:
                     validate_columns(table_name, schema_entry, chunk.columns)
                     first_chunk = False
+                if read_stats is not None and ID_COLUMN in chunk.columns:
+                    read_stats["ids"] += column_checksum(pa.array(chunk[ID_COLUMN]))
                 
                 yield chunk
         
@@ -1154,6 +1418,7 @@ def stream_export_and_load(
                     end_date,
                     full_table=args.full_table,
                     conn_manager=conn_manager,
+                    loader=getattr(args, "loader", "executemany"),
                 )
             else:
                 # Read Parquet file for loading (streaming, no full DataFrame)
@@ -1168,6 +1433,7 @@ def stream_export_and_load(
                     batch_size=args.batch_size,
                     commit_interval=args.commit_interval,
                     conn_manager=conn_manager,
+                    loader=getattr(args, "loader", "executemany"),
                 )
         
         return output_path, parquet_rows, rows_loaded
@@ -1203,7 +1469,32 @@ def run_for_table(
 
     try:
         manifest = {}
-        if use_direct_full_table:
+        # SUM(ID) of the rows read, for the load manifest (summed while streaming, no target scan)
+        read_stats = {"ids": 0}
+        if use_direct_full_table and getattr(args, "incremental", False) and supports_incremental(schema_entry):
+            run_suffix = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+            rows_loaded, sync_mode = stream_full_table_incremental(
+                table_name,
+                schema_entry,
+                args,
+                conn_manager=conn_manager,
+                read_stats=read_stats,
+            )
+            total_rows = rows_loaded
+            manifest = {
+                "table": table_name,
+                "rows": total_rows,
+                "rows_loaded": rows_loaded,
+                "parquet": None,
+                "mode": sync_mode,
+                "start_date": start_date,
+                "end_date": end_date,
+                "timestamp": datetime.utcnow().isoformat() + "Z",
+            }
+            manifest_path = output_dir / f"{table_name.lower()}_{run_suffix}_{sync_mode}.json"
+        elif use_direct_full_table:
+            if getattr(args, "incremental", False):
+                print(f"[INFO] {table_name}: no {ROWVERSION_COLUMN}/{UPSERT_KEY_COLUMN} columns, using full reload")
             run_suffix = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
             rows_loaded = stream_full_table_direct(
                 table_name,
@@ -1212,6 +1503,7 @@ def run_for_table(
                 end_date,
                 args,
                 conn_manager=conn_manager,
+                read_stats=read_stats,
             )
             total_rows = rows_loaded
             manifest = {
@@ -1233,6 +1525,7 @@ def run_for_table(
                 end_date,
                 args,
                 conn_manager=conn_manager,
+                read_stats=read_stats,
             )
             
             manifest = {
@@ -1249,84 +1542,60 @@ def run_for_table(
 
         manifest_path.write_text(json.dumps(manifest, indent=2))
         print(f"[INFO] Manifest written to {manifest_path}")
+        # Incremental syncs apply a delta; the full load they started from stays recorded
+        if manifest["mode"] != "incremental" and not args.skip_load:
+            record_table_load(
+                table_name,
+                start_date,
+                end_date,
+                args.full_table,
+                total_rows,
+                rows_loaded,
+                manifest["mode"],
+                conn_manager,
+                checksum=read_stats["ids"] if any(col["name"] == ID_COLUMN for col in schema_entry["columns"]) else None,
+            )
         
     except Exception as e:
         print(f"[ERROR] Table {table_name} failed: {e}", file=sys.stderr)
         raise
 
 
-def save_checkpoint(
+def record_table_load(
     table_name: str,
-    job_date: str,
-    rows_processed: int,
-    last_chunk_id: int,
-    status: str,
-    checkpoint_data: dict,
+    start_date: Optional[str],
+    end_date: Optional[str],
+    full_table: bool,
+    source_rows: int,
+    rows_loaded: int,
+    load_mode: str,
     conn_manager: Optional[ConnectionManager] = None,
-):
-    """Save progress checkpoint to database."""
+    checksum: Optional[int] = None,
+) -> None:
+    """Record a committed reference-script load in the load manifest (``checksum``: SUM(ID) summed while streaming)."""
+    load_range = manifest_range(full_table, start_date, end_date)
+    if load_range is None:
+        return
     if conn_manager and conn_manager.target_conn:
         conn = conn_manager.target_conn
         close_conn = False
     else:
         conn = get_target_connection()
         close_conn = True
-    
     try:
         cursor = conn.cursor()
-        cursor.execute("""
-            MERGE dbo.etl_replica_progress AS target
-            USING (SELECT ? AS table_name, ? AS job_date) AS source
-            ON target.table_name = source.table_name AND target.job_date = source.job_date
-            WHEN MATCHED THEN
-                UPDATE SET 
-                    rows_processed = ?,
-                    last_chunk_id = ?,
-                    status = ?,
-                    checkpoint_data = ?,
-                    batch_end = SYSUTCDATETIME()
-            WHEN NOT MATCHED THEN
-                INSERT (table_name, job_date, rows_processed, last_chunk_id, status, checkpoint_data, batch_start)
-                VALUES (?, ?, ?, ?, ?, ?, SYSUTCDATETIME());
-        """, table_name, job_date, rows_processed, last_chunk_id, status, 
-              json.dumps(checkpoint_data), table_name, job_date, rows_processed, 
-              last_chunk_id, status, json.dumps(checkpoint_data))
+        record_load(
+            cursor,
+            f"dbo.com_5013_{table_name}",
+            *load_range,
+            rows_loaded=rows_loaded,
+            source_rows=source_rows,
+            checksum=checksum,
+            load_mode=load_mode,
+        )
         conn.commit()
-    finally:
-        if close_conn:
-            conn.close()
-
-
-def load_checkpoint(
-    table_name: str,
-    job_date: str,
-    conn_manager: Optional[ConnectionManager] = None,
-) -> Optional[dict]:
-    """Load progress checkpoint from database."""
-    if conn_manager and conn_manager.target_conn:
-        conn = conn_manager.target_conn
-        close_conn = False
-    else:
-        conn = get_target_connection()
-        close_conn = True
-    
-    try:
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT rows_processed, last_chunk_id, status, checkpoint_data
-            FROM dbo.etl_replica_progress
-            WHERE table_name = ? AND job_date = ?
-        """, table_name, job_date)
-        
-        row = cursor.fetchone()
-        if row:
-            return {
-                "rows_processed": row[0] or 0,
-                "last_chunk_id": row[1] or 0,
-                "status": row[2],
-                "checkpoint_data": json.loads(row[3]) if row[3] else {},
-            }
-        return None
+    except pyodbc.Error as exc:
+        print(f"[WARN] {table_name}: could not record load manifest: {exc}", file=sys.stderr)
     finally:
         if close_conn:
             conn.close()
@@ -1339,7 +1608,14 @@ def table_already_loaded(
     full_table: bool,
     conn_manager: Optional[ConnectionManager] = None,
 ) -> bool:
-    """Check if table was already successfully loaded."""
+    """
+    Check if table was already successfully loaded.
+
+    Looks the range up in the load manifest (one range seek; contiguous loads,
+    e.g. month by month, together cover a longer range). Tables with no
+    manifest rows at all were loaded before it existed: for those, full tables
+    fall back to sys.dm_db_partition_stats and date ranges to an EXISTS probe.
+    """
     target_table = f"dbo.com_5013_{table_name}"
     try:
         if conn_manager and conn_manager.target_conn:
@@ -1353,40 +1629,36 @@ def table_already_loaded(
             cursor = conn.cursor()
             
             # Check if table exists
-            cursor.execute("""
-                SELECT COUNT(*) 
-                FROM INFORMATION_SCHEMA.TABLES 
-                WHERE TABLE_SCHEMA = 'dbo' AND TABLE_NAME = ?
-            """, target_table.replace("dbo.", ""))
-            
-            if cursor.fetchone()[0] == 0:
+            cursor.execute("SELECT OBJECT_ID(?, 'U')", target_table)
+            row = cursor.fetchone()
+            if not row or row[0] is None:
                 return False
-            
-            # Check if table has data
+
+            load_range = manifest_range(full_table, start_date, end_date)
+            if load_range is None:
+                return False
+            entry = find_covering_load(cursor, target_table, *load_range)
+            if entry:
+                print(
+                    f"[INFO] {table_name}: load manifest has {entry['rows_loaded']:,} rows loaded "
+                    f"for {entry['range_start']} - {entry['range_end']} in {entry['loads']} load(s), "
+                    f"last at {entry['loaded_at']}"
+                )
+                return True
+            if has_manifest_rows(cursor, target_table):
+                return False
+
+            # Loaded before the manifest existed
             if full_table:
-                # For full table, just check if any rows exist
-                cursor.execute(f"SELECT COUNT(*) FROM {target_table}")
-                count = cursor.fetchone()[0]
-                return count > 0
-            else:
-                # For date-filtered, check if data exists for this date range
-                date_column = DATE_FILTER_COLUMNS.get(table_name)
-                if date_column and start_date:
-                    if end_date:
-                        cursor.execute(
-                            f"SELECT COUNT(*) FROM {target_table} WHERE {date_column} >= ? AND {date_column} < ?",
-                            start_date,
-                            end_date,
-                        )
-                    else:
-                        cursor.execute(
-                            f"SELECT COUNT(*) FROM {target_table} WHERE {date_column} = ?",
-                            start_date,
-                        )
-                    count = cursor.fetchone()[0]
-                    return count > 0
-            
-            return False
+                return partition_row_count(cursor, target_table) > 0
+            date_column = DATE_FILTER_COLUMNS.get(table_name)
+            if not date_column:
+                return False
+            cursor.execute(
+                f"SELECT TOP 1 1 FROM {target_table} WHERE {date_column} >= ? AND {date_column} < ?",
+                *load_range,
+            )
+            return cursor.fetchone() is not None
         finally:
             if close_conn:
                 conn.close()
@@ -1448,6 +1720,22 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Ignore date filters and export the entire table.",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "With --full-table (stream mode): upsert only rows whose UPDATE_TIMESTAMP rowversion is newer "
+            "than the stored watermark (dbo.etl_replica_watermark, migration 112). Tables without "
+            "UPDATE_TIMESTAMP/ID are fully reloaded. Rows DELETED at source are NOT removed from the "
+            "target; schedule a plain --full-table run to drop them."
+        ),
+    )
+    parser.add_argument(
+        "--fetch-backend",
+        choices=FETCH_BACKENDS,
+        default="auto",
+        help="Columnar source reader for direct streaming: arrow-odbc if installed, else pyodbc (default: %(default)s).",
+    )
     parser.add_argument(
         "--skip-existing",
         action="store_true",
@@ -1469,6 +1757,23 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Use SQL Server BULK INSERT for faster loading (requires Parquet file accessible to SQL Server).",
     )
+    parser.add_argument(
+        "--loader",
+        choices=LOADERS,
+        default="executemany",
+        help=(
+            "How chunks are written to the target: pyodbc executemany, bcp file handoff (needs bcp on PATH "
+            "or BCP_PATH), or table-valued parameter (default: %(default)s). Compare with scripts/compare_loaders.py."
+        ),
+    )
+    parser.add_argument(
+        "--adaptive-batching",
+        action="store_true",
+        help=(
+            "Direct streaming (--full-table): start from --chunk-size/--commit-interval and re-size them per chunk "
+            "from measured rows/sec, bytes per row and process RSS."
+        ),
+    )
     parser.add_argument(
         "--resume",
         action="store_true",
@@ -1564,8 +1869,8 @@ def main():
                     print(f"[WARN] Table {table} not found in schema, skipping", file=sys.stderr)
                     continue
                 
-                # Skip logic
-                if args.skip_existing and not args.skip_load:
+                # Skip logic (incremental runs always apply the delta)
+                if args.skip_existing and not args.skip_load and not args.incremental:
                     if table_already_loaded(table, start_date, end_date, args.full_table):
                         print(f"[SKIP] Table {table} already loaded, skipping")
                         continue
@@ -1592,8 +1897,8 @@ def main():
                     print(f"[WARN] Table {table} not found in schema, skipping", file=sys.stderr)
                     continue
                 
-                # Skip logic
-                if args.skip_existing and not args.skip_load:
+                # Skip logic (incremental runs always apply the delta)
+                if args.skip_existing and not args.skip_load and not args.incremental:
                     if table_already_loaded(table, start_date, end_date, args.full_table, conn_manager):
                         print(f"[SKIP] Table {table} already loaded, skipping")
                         continue
@@ -1602,6 +1907,7 @@ def main():
                     run_for_table(table, entry, args, start_date, end_date, conn_manager)
                 except Exception as exc:  # pylint: disable=broad-except
                     print(f"[ERROR] Table {table} failed: {exc}", file=sys.stderr)
+    report_pools()
 
 
 if __name__ == "__main__":
@@ -1,4 +1,5 @@
 import argparse
+import json
 import subprocess
 import sys
 from datetime import datetime, timedelta
@@ -10,28 +11,57 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 import pyodbc
 
 import config
+from reconcile_replica_range import reconcile_range
 
 
 def get_target_conn():
     return pyodbc.connect(config.build_connection_string(config.TARGET_SQL_CONFIG))
 
 
-def insert_run_history(run_type: str, start_date: str, end_date: str, success: bool, tables: str, message: str = None):
+def insert_run_history(
+    run_type: str,
+    start_date: str,
+    end_date: str,
+    success: bool,
+    tables: str,
+    message: str = None,
+    rows_changed: int = None,
+    details: dict = None,
+):
     conn = get_target_conn()
     cursor = conn.cursor()
-    cursor.execute(
-        """
-        INSERT INTO dbo.replica_run_history
-        (run_type, start_timestamp, end_timestamp, start_date, end_date, processed_tables, success, error_message)
-        VALUES (?, SYSUTCDATETIME(), SYSUTCDATETIME(), ?, ?, ?, ?, ?)
-        """,
-        run_type,
-        start_date,
-        end_date,
-        tables,
-        1 if success else 0,
-        message,
-    )
+    if rows_changed is None:
+        cursor.execute(
+            """
+            INSERT INTO dbo.replica_run_history
+            (run_type, start_timestamp, end_timestamp, start_date, end_date, processed_tables, success, error_message)
+            VALUES (?, SYSUTCDATETIME(), SYSUTCDATETIME(), ?, ?, ?, ?, ?)
+            """,
+            run_type,
+            start_date,
+            end_date,
+            tables,
+            1 if success else 0,
+            message,
+        )
+    else:
+        # rows_changed/run_details need migration 113
+        cursor.execute(
+            """
+            INSERT INTO dbo.replica_run_history
+            (run_type, start_timestamp, end_timestamp, start_date, end_date, processed_tables, success, error_message,
+             rows_changed, run_details)
+            VALUES (?, SYSUTCDATETIME(), SYSUTCDATETIME(), ?, ?, ?, ?, ?, ?, ?)
+            """,
+            run_type,
+            start_date,
+            end_date,
+            tables,
+            1 if success else 0,
+            message,
+            rows_changed,
+            json.dumps(details) if details is not None else None,
+        )
     conn.commit()
     conn.close()
 
@@ -59,6 +89,12 @@ def main():
     parser.add_argument("--date", help="Reference date (YYYY-MM-DD). Defaults to yesterday.", default=None)
     parser.add_argument("--tables", action="append", help="Restrict to specific table(s).")
     parser.add_argument("--skip-t1", action="store_true", help="Skip T-1 back-check.")
+    parser.add_argument(
+        "--t1-mode",
+        choices=("reexport", "reconcile"),
+        default="reexport",
+        help="T-1 back-check: delete and reload the day (reexport), or apply only hash-diff changes (reconcile).",
+    )
     args = parser.parse_args()
 
     if args.date:
@@ -80,6 +116,23 @@ def main():
         t1_date = base_date - timedelta(days=1)
         t1_start = t1_date.isoformat()
         t1_end = base_date.isoformat()
+        if args.t1_mode == "reconcile":
+            try:
+                results = reconcile_range(t1_start, t1_end, tables=args.tables)
+            except RuntimeError as exc:
+                insert_run_history("T1", t1_start, t1_end, False, ",".join(args.tables or ["ALL"]), str(exc))
+                raise
+            rows_changed = sum(r["inserted"] + r["updated"] + r["deleted"] for r in results.values())
+            insert_run_history(
+                "T1",
+                t1_start,
+                t1_end,
+                True,
+                ",".join(args.tables or ["ALL"]),
+                rows_changed=rows_changed,
+                details=results,
+            )
+            return
         try:
             run_export(t1_start, t1_end, tables=args.tables)
             insert_run_history("T1", t1_start, t1_end, True, ",".join(args.tables or ["ALL"]))
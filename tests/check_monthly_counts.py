@@ -1,56 +1,69 @@
-"""Quick check for missing dates in APP_4_SALES table"""
+"""Quick check for missing months: per-day counts from utils/daily_counts.py rolled up by month
+
+Usage:
+    python tests/check_monthly_counts.py --start-date 2025-01-01 --end-date 2025-10-31
+    python tests/check_monthly_counts.py --table APP_4_SALES --table APP_4_PAYMENT
+"""
+import argparse
 import sys
-from datetime import date
+from datetime import date, timedelta
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
 import config
 import pyodbc
 
-START_DATE = date(2025, 1, 1)
-END_DATE = date(2025, 10, 31)
+from replicate_reference_tables import DATE_FILTER_COLUMNS, load_schema
+from utils.connection_pool import get_pool, report_pools
+from utils.daily_counts import day_range_end, reconcile_daily_counts, rollup_by_month, table_specs
+
+yesterday = date.today() - timedelta(days=1)
+parser = argparse.ArgumentParser(description="Compare per-month row counts between source and target.")
+parser.add_argument("--start-date", default=yesterday.replace(month=1, day=1).isoformat())
+parser.add_argument("--end-date", default=yesterday.isoformat(), help="INCLUSIVE (default: %(default)s).")
+parser.add_argument("--table", action="append", choices=sorted(DATE_FILTER_COLUMNS), metavar="TABLE", help="Repeatable (default: APP_4_SALES).")
+parser.add_argument("--max-connections", type=int, default=4)
+args = parser.parse_args()
 
 source_conn_str = config.build_connection_string(config.AZURE_SQL_CONFIG, trust_server_cert=True)
 target_conn_str = config.build_connection_string(config.TARGET_SQL_CONFIG, trust_server_cert=True)
+source_pool = get_pool("source", lambda: pyodbc.connect(source_conn_str), max_size=args.max_connections)
+target_pool = get_pool("target", lambda: pyodbc.connect(target_conn_str), max_size=args.max_connections)
 
-print(f"Checking APP_4_SALES from {START_DATE} to {END_DATE}...")
-
-sql = """
-    SELECT 
-        YEAR(DATETIME__SALES_DATE) as yr,
-        MONTH(DATETIME__SALES_DATE) as mo,
-        COUNT(*) as cnt
-    FROM {table}
-    WHERE DATETIME__SALES_DATE >= ? AND DATETIME__SALES_DATE <= ?
-    GROUP BY YEAR(DATETIME__SALES_DATE), MONTH(DATETIME__SALES_DATE)
-    ORDER BY yr, mo
-"""
+tables = table_specs(args.table or ["APP_4_SALES"], DATE_FILTER_COLUMNS, load_schema())
+print(f"Checking {', '.join(tables)} from {args.start_date} to {args.end_date}...")
+
+results = reconcile_daily_counts(
+    tables,
+    args.start_date,
+    day_range_end(args.end_date),
+    source_pool.acquire,
+    target_pool.acquire,
+    Path(config.EXPORT_DIR),
+    max_connections=args.max_connections,
+)
+
+for result in results:
+    print("\n" + "="*70)
+    print(result.table_name)
+    if result.error:
+        print(f"ERROR: {result.error}")
+        continue
+    src_counts = rollup_by_month(result.source)
+    tgt_counts = rollup_by_month(result.target)
+    print(f"{'Month':<12}{'Source':>15}{'Target':>15}{'Diff':>12}{'Status':>12}")
+    print("-"*70)
+    for month in sorted(set(src_counts) | set(tgt_counts)):
+        src = src_counts.get(month, 0)
+        tgt = tgt_counts.get(month, 0)
+        diff = tgt - src
+        status = "OK" if diff == 0 else "MISSING" if diff < 0 else "EXTRA"
+        print(f"{month:<12}{src:>15,}{tgt:>15,}{diff:>12,}{status:>12}")
+    print("-"*70)
+    total_src = result.source_total
+    total_tgt = result.target_total
+    print(f"{'TOTAL':<12}{total_src:>15,}{total_tgt:>15,}{total_tgt-total_src:>12,}")
 
-with pyodbc.connect(source_conn_str) as src_conn:
-    src_cursor = src_conn.cursor()
-    src_cursor.execute(sql.format(table='[COM_5013].[APP_4_SALES]'), (START_DATE, END_DATE))
-    src_counts = {(r.yr, r.mo): r.cnt for r in src_cursor.fetchall()}
-
-with pyodbc.connect(target_conn_str) as tgt_conn:
-    tgt_cursor = tgt_conn.cursor()
-    tgt_cursor.execute(sql.format(table='[dbo].[com_5013_APP_4_SALES]'), (START_DATE, END_DATE))
-    tgt_counts = {(r.yr, r.mo): r.cnt for r in tgt_cursor.fetchall()}
-
-print("\n" + "="*70)
-print(f"{'Month':<12}{'Source':>15}{'Target':>15}{'Diff':>12}{'Status':>12}")
-print("-"*70)
-
-months = ['Jan','Feb','Mar','Apr','May','Jun','Jul','Aug','Sep','Oct']
-for mo_num in range(1, 11):
-    key = (2025, mo_num)
-    src = src_counts.get(key, 0)
-    tgt = tgt_counts.get(key, 0)
-    diff = tgt - src
-    status = "OK" if diff == 0 else "MISSING" if diff < 0 else "EXTRA"
-    print(f"{months[mo_num-1]} 2025{src:>12,}{tgt:>15,}{diff:>12,}{status:>12}")
-
-print("-"*70)
-total_src = sum(src_counts.values())
-total_tgt = sum(tgt_counts.values())
-print(f"{'TOTAL':<12}{total_src:>15,}{total_tgt:>15,}{total_tgt-total_src:>12,}")
+report_pools()
@@ -1,21 +1,48 @@
 """
 Compare daily row counts between source (Xilnex replica) and target warehouse.
 
-Range: 2025-08-01 to 2025-10-31
-Tables: Sales, Items, Payments, Credit/Debit Notes, etc.
+Every date-filtered table (DATE_FILTER_COLUMNS) is counted per day on both
+sides concurrently by utils/daily_counts.py, with at most --max-connections
+sessions per server. Settled source days come from the per-table day-count
+cache, so a re-check only counts recent days on source.
+
 Source schema: COM_5013
 Target schema: dbo.com_5013_<TABLE>
+
+Usage:
+    python tests/verify_daily_row_counts.py --start-date 2025-08-01 --end-date 2025-10-31
+    python tests/verify_daily_row_counts.py --table APP_4_SALES --table APP_4_SALESITEM --max-connections 2
+    python tests/verify_daily_row_counts.py --start-date 2025-10-01 --end-date 2025-10-31 --output exports/reconcile.csv
+    python tests/verify_daily_row_counts.py --start-date 2025-10-01 --end-date 2025-10-31 --repair
 """
 
 from __future__ import annotations
 
+import argparse
 import sys
-from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
 from pathlib import Path
-from typing import Dict, List, Tuple
 
 import pyodbc
 
+# Project root for utils/ and scripts/ (config is resolved by _import_config below)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from utils.checksum_tree import MAX_CANDIDATES, ChecksumTree  # noqa: E402
+from utils.connection_pool import PooledConnection, get_pool, report_pools  # noqa: E402
+from utils.daily_counts import (  # noqa: E402
+    SOURCE_SCHEMA,
+    TARGET_PREFIX,
+    day_range_end,
+    print_diff_report,
+    reconcile_daily_counts,
+    table_specs,
+    write_report,
+)
+from utils.partition_planner import SETTLE_DAYS  # noqa: E402
+
 
 # ---------------------------------------------------------------------------
 # Config import helpers
@@ -41,100 +68,175 @@ def _import_config():
 
 config = _import_config()
 
-
-# ---------------------------------------------------------------------------
-# Parameters
-# ---------------------------------------------------------------------------
-START_DATE = date(2025, 1, 1)
-END_DATE = date(2025, 10, 31)
-TABLES_TO_CHECK = {
-    "APP_4_SALES": "DATETIME__SALES_DATE",
-    "APP_4_SALESITEM": "DATETIME__SALES_DATE",
-    "APP_4_PAYMENT": "DATETIME__DATE",
-    "APP_4_VOIDSALESITEM": "DATETIME__VOID_DATETIME",
-    "APP_4_SALESCREDITNOTE": "DATETIMEUTC_BUSINESS_DATE",
-    "APP_4_SALESCREDITNOTEITEM": "DATETIMEUTC_BUSINESS_DATE",
-    "APP_4_SALESDEBITNOTE": "DATETIMEUTC_BUSINESS_DATE",
-    "APP_4_SALESDEBITNOTEITEM": "DATETIMEUTC_BUSINESS_DATE",
-    "APP_4_EPAYMENTLOG": "TRANSACTIONDATETIME",
-    "APP_4_VOUCHER": "DATETIME__VOUCHER_DATE",
-}
+from replicate_reference_tables import DATE_FILTER_COLUMNS, load_schema  # noqa: E402
+from utils.hash_diff import row_hash_expression  # noqa: E402
 
 
 # ---------------------------------------------------------------------------
 # DB helpers
 # ---------------------------------------------------------------------------
-def get_connection(conn_str: str) -> pyodbc.Connection:
-    return pyodbc.connect(conn_str, autocommit=False)
+def get_connection(pool_name: str, conn_str: str, max_size: int) -> PooledConnection:
+    """Pooled connection (pinged before reuse); close() returns it to the pool."""
+    pool = get_pool(pool_name, lambda: pyodbc.connect(conn_str, autocommit=False), max_size=max_size)
+    return pool.acquire()
 
 
-def fetch_daily_counts(
-    conn: pyodbc.Connection, table_fqn: str, date_column: str, start: date, end: date
-) -> Dict[date, int]:
-    """
-    Return {date: count} for rows where date_column is within [start, end].
+def drill_down(results, tables, schema, connect_source, connect_target, max_connections, max_candidates, max_ids=20):
     """
-    sql = f"""
-        SELECT
-            CAST({date_column} AS date) AS sale_date,
-            COUNT(*) AS row_count
-        FROM {table_fqn}
-        WHERE {date_column} >= ? AND {date_column} < DATEADD(day, 1, ?)
-        GROUP BY CAST({date_column} AS date)
-        ORDER BY sale_date;
+    Locate the differing rows of every mismatched day with the checksum tree
+    (utils/checksum_tree.py); tables are drilled concurrently, one session per side each.
     """
-    params = (start, end)
-    results: Dict[date, int] = {}
-    with conn.cursor() as cur:
-        cur.execute(sql, params)
-        for sale_date, row_count in cur.fetchall():
-            results[sale_date] = int(row_count)
-    return results
 
-
-# ---------------------------------------------------------------------------
-# Comparison / reporting
-# ---------------------------------------------------------------------------
-def compare_counts(
-    source_counts: Dict[date, int], target_counts: Dict[date, int]
-) -> Tuple[Dict[date, Tuple[int, int, int]], List[date]]:
+    def drill(result):
+        date_column, column_type = tables[result.table_name]
+        source_conn, target_conn = connect_source(), connect_target()
+        tree = ChecksumTree(
+            source_conn,
+            target_conn,
+            f"{SOURCE_SCHEMA}.{result.table_name}",
+            f"{TARGET_PREFIX}{result.table_name}",
+            row_hash_expression(schema[result.table_name]),
+            date_column,
+            column_type,
+            max_candidates=max_candidates,
+        )
+        try:
+            return {
+                day: tree.drill_day(day, max(result.source.get(day, 0), result.target.get(day, 0)))
+                for day in result.mismatched_days
+            }
+        finally:
+            tree.close()
+            source_conn.close()
+            target_conn.close()
+
+    to_drill = [result for result in results if not result.error and result.mismatched_days and result.table_name in schema]
+    if not to_drill:
+        return
+    print("\nDrilldown (checksum tree, only candidate rows fetched):")
+    with ThreadPoolExecutor(max_workers=max(1, max_connections)) as executor:
+        futures = [(result, executor.submit(drill, result)) for result in to_drill]
+        for result, future in futures:
+            print(f"\n{result.table_name}")
+            try:
+                days = future.result()
+            except Exception as exc:
+                print(f"  ERROR {exc}")
+                continue
+            for day, found in days.items():
+                print(
+                    f"  {day}: +{len(found['inserted'])} ~{len(found['updated'])} -{len(found['deleted'])} "
+                    f"({found['levels']} level(s), {found['candidates']:,} candidate row(s))"
+                )
+                for label in ("inserted", "updated", "deleted"):
+                    ids = found[label]
+                    if ids:
+                        more = f" (+{len(ids) - max_ids} more)" if len(ids) > max_ids else ""
+                        print(f"    {label:<9} ID {', '.join(str(i) for i in sorted(ids)[:max_ids])}{more}")
+
+
+def repair_days(results, start_date, end_date, output_dir, max_workers):
     """
-    Combine counts, returning per-day tuple (src, tgt, diff=tgt-src) and mismatch list.
+    Reload only the mismatched days of every table through the monthly streaming
+    engine, one day-sized unit each. Returns the tables that were repaired.
     """
-    all_dates = set(source_counts) | set(target_counts)
-    comparison: Dict[date, Tuple[int, int, int]] = {}
-    mismatches: List[date] = []
-
-    for d in sorted(all_dates):
-        src = source_counts.get(d, 0)
-        tgt = target_counts.get(d, 0)
-        diff = tgt - src  # negative means target is missing rows
-        comparison[d] = (src, tgt, diff)
-        if diff != 0:
-            mismatches.append(d)
-    return comparison, mismatches
-
-
-def print_report(comparison: Dict[date, Tuple[int, int, int]], mismatches: List[date]) -> None:
-    header = f"{'Date':<12}{'Source':>12}{'Target':>12}{'Diff(T-S)':>12}{'Status':>12}"
-    print(header)
-    print("-" * len(header))
-    for d, (src, tgt, diff) in comparison.items():
-        status = "OK" if diff == 0 else "MISMATCH"
-        line = f"{d:%Y-%m-%d} {src:12d}{tgt:12d}{diff:12d}{status:>12}"
-        print(line)
-
-    print("\nMissing/Incomplete Dates (Diff != 0):")
-    if mismatches:
-        print(", ".join(d.strftime("%Y-%m-%d") for d in mismatches))
-    else:
-        print("None 🎉")
+    # Imported here: the streaming engine pulls in polars/pyarrow, which a count check does not need
+    from replicate_monthly_parallel_streaming import replicate_monthly_parallel
+
+    repaired = []
+    for result in results:
+        if result.error or not result.mismatched_days:
+            continue
+        print("=" * 80)
+        print(f"REPAIR {result.table_name}: {len(result.mismatched_days)} day(s) {', '.join(result.mismatched_days)}")
+        print("=" * 80)
+        replicate_monthly_parallel(
+            result.table_name,
+            start_date,
+            end_date,
+            output_dir,
+            max_workers=max_workers,
+            days=result.mismatched_days,
+        )
+        repaired.append(result.table_name)
+    return repaired
+
+
+def parse_args() -> argparse.Namespace:
+    yesterday = date.today() - timedelta(days=1)
+    parser = argparse.ArgumentParser(description="Compare per-day row counts between source and target.")
+    parser.add_argument(
+        "--start-date",
+        default=yesterday.replace(month=1, day=1).isoformat(),
+        help="First day to check (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--end-date",
+        default=yesterday.isoformat(),
+        help="Last day to check, INCLUSIVE (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--table",
+        action="append",
+        choices=sorted(DATE_FILTER_COLUMNS),
+        metavar="TABLE",
+        help="Table to check (repeatable; default: every date-filtered table).",
+    )
+    parser.add_argument(
+        "--max-connections",
+        type=int,
+        default=4,
+        help="Concurrent counting sessions per server (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--output-dir",
+        default=config.EXPORT_DIR,
+        help="Where the per-table day-count caches live (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--settle-days",
+        type=int,
+        default=SETTLE_DAYS,
+        help="Source days older than this are served from the cache once counted (default: %(default)s).",
+    )
+    parser.add_argument("--refresh-cache", action="store_true", help="Re-count every source day.")
+    parser.add_argument("--all-days", action="store_true", help="List every day, not only mismatched ones.")
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="Also write the report as CSV (or JSON for a .json path): table, day, source_count, "
+        "target_count, diff, status; mismatched days only unless --all-days.",
+    )
+    parser.add_argument(
+        "--repair",
+        action="store_true",
+        help="Reload only the mismatched days (day-sized units of the monthly streaming engine), then re-count.",
+    )
+    parser.add_argument(
+        "--repair-workers",
+        type=int,
+        default=2,
+        help="Parallel day units per table during --repair (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--drilldown",
+        action="store_true",
+        help="Locate the differing row IDs of mismatched days with bucketed checksums.",
+    )
+    parser.add_argument(
+        "--max-candidates",
+        type=int,
+        default=MAX_CANDIDATES,
+        help="Drill down until at most this many rows per day are fetched for comparison (default: %(default)s).",
+    )
+    return parser.parse_args()
 
 
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
 def main():
+    args = parse_args()
     # Force TrustServerCertificate to avoid SSL chain issues on both sides.
     source_conn_str = config.build_connection_string(
         config.AZURE_SQL_CONFIG, timeout=60, trust_server_cert=True
@@ -142,36 +244,47 @@ def main():
     target_conn_str = config.build_connection_string(
         config.TARGET_SQL_CONFIG, timeout=60, trust_server_cert=True
     )
-
-    all_mismatches: set[date] = set()
-
-    print(f"Comparing daily counts for tables in range {START_DATE} to {END_DATE}\n")
-
-    with get_connection(source_conn_str) as src_conn, get_connection(target_conn_str) as tgt_conn:
-        for table_name, date_col in TABLES_TO_CHECK.items():
-            source_table = f"[COM_5013].[{table_name}]"
-            target_table = f"[dbo].[com_5013_{table_name}]"
-
-            print("=" * 80)
-            print(f"TABLE: {table_name}")
-            print(f"Date column: {date_col}")
-            print(f"Source: {source_table}")
-            print(f"Target: {target_table}")
-            print("-" * 80)
-
-            src_counts = fetch_daily_counts(src_conn, source_table, date_col, START_DATE, END_DATE)
-            tgt_counts = fetch_daily_counts(tgt_conn, target_table, date_col, START_DATE, END_DATE)
-
-            comparison, mismatches = compare_counts(src_counts, tgt_counts)
-            print_report(comparison, mismatches)
-            all_mismatches.update(mismatches)
-            print("\n")
-
-    if all_mismatches:
-        print("Missing Dates (Any Table):")
-        print(", ".join(sorted(d.strftime("%Y-%m-%d") for d in all_mismatches)))
-    else:
-        print("Missing Dates (Any Table): None 🎉")
+    schema = load_schema()
+    tables = table_specs(args.table or list(DATE_FILTER_COLUMNS), DATE_FILTER_COLUMNS, schema)
+    # Own pool names: a --repair run opens the streaming engine's "source"/"target" pools next to these
+    connect_source = lambda: get_connection("verify-source", source_conn_str, args.max_connections)  # noqa: E731
+    connect_target = lambda: get_connection("verify-target", target_conn_str, args.max_connections)  # noqa: E731
+
+    def count(table_subset):
+        return reconcile_daily_counts(
+            table_subset,
+            args.start_date,
+            day_range_end(args.end_date),
+            connect_source,
+            connect_target,
+            Path(args.output_dir),
+            max_connections=args.max_connections,
+            refresh=args.refresh_cache,
+            settle_days=args.settle_days,
+        )
+
+    print(f"Comparing daily counts for {len(tables)} table(s) from {args.start_date} to {args.end_date}\n")
+    results = count(tables)
+    print()
+    mismatches = print_diff_report(results, show_all_days=args.all_days)
+    if args.output:
+        rows = write_report(results, Path(args.output), all_days=args.all_days)
+        print(f"\nReport: {args.output} ({rows} row(s))")
+    if args.drilldown:
+        drill_down(results, tables, schema, connect_source, connect_target, args.max_connections, args.max_candidates)
+    if args.repair:
+        repaired = repair_days(
+            results, args.start_date, day_range_end(args.end_date), Path(args.output_dir), args.repair_workers
+        )
+        if repaired:
+            print(f"\nRe-checking {len(repaired)} repaired table(s)\n")
+            rechecked = {result.table_name: result for result in count({name: tables[name] for name in repaired})}
+            results = [rechecked.get(result.table_name, result) for result in results]
+            print()
+            mismatches = print_diff_report(results, show_all_days=args.all_days)
+    report_pools()
+    if mismatches or any(result.error for result in results):
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -3,12 +3,22 @@ Data quality checks between source Xilnex replica and target cloud warehouse.
 
 Checks:
 - Row count comparison (full refresh vs date-filtered tables)
-- Random sample comparison (5 rows per table, all columns)
+- Random sample comparison (--sample-size rows per table, all columns)
+
+Keys are sampled without ORDER BY NEWID() (ID-modulo or TABLESAMPLE, see
+utils/row_sampling.py), all sampled rows of a table are fetched with one
+statement per side, and tables are checked concurrently.
+
+Usage:
+    python tests/verify_data_quality.py --sample-size 2000 --max-connections 4
+    python tests/verify_data_quality.py --start-date 2025-10-01 --end-date 2025-10-31 --sample-method tablesample
 """
 
+import argparse
 import decimal
 import sys
-from datetime import date, datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -19,6 +29,8 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 import config
+from utils.connection_pool import get_pool, report_pools
+from utils.row_sampling import SAMPLE_METHODS, fetch_rows_by_keys, sample_keys
 
 # Tables grouped by replication rule
 SALES_TABLES = [
@@ -67,9 +79,9 @@ TARGET_CONN_STR = config.build_connection_string(config.TARGET_SQL_CONFIG, trust
 SOURCE_SCHEMA = "COM_5013"
 TARGET_SCHEMA = "dbo"
 TARGET_PREFIX = "com_5013_"
-START_DATE = "2025-01-01"
-END_DATE = "2025-10-31"
-SAMPLE_SIZE = 5
+SAMPLE_SIZE = 1000
+# Mismatch lines printed per table
+MAX_DETAIL_LINES = 20
 NUM_TOLERANCE = decimal.Decimal("0.0001")
 
 
@@ -127,63 +139,28 @@ def values_match(source: Any, target: Any) -> bool:
     return source == target
 
 
-def fetch_row(cursor: pyodbc.Cursor, table_sql: str, key_col: str, key_value: Any) -> Optional[Dict[str, Any]]:
-    cursor.execute(f"SELECT * FROM {table_sql} WHERE [{key_col}] = ?", key_value)
-    row = cursor.fetchone()
-    if not row:
-        return None
-    columns = [col[0] for col in cursor.description]
-    return dict(zip(columns, row))
-
-
-def random_keys(
-    cursor: pyodbc.Cursor,
-    table_sql: str,
-    key_col: str,
-    date_column: Optional[str],
-) -> List[Any]:
-    where_clause = ""
-    params: List[Any] = []
-    if date_column:
-        where_clause = f" WHERE [{date_column}] >= ? AND [{date_column}] <= ?"
-        params.extend([START_DATE, END_DATE])
-    query = f"SELECT TOP {SAMPLE_SIZE} [{key_col}] FROM {table_sql}{where_clause} ORDER BY NEWID()"
-    if params:
-        cursor.execute(query, params)
-    else:
-        cursor.execute(query)
-    return [row[0] for row in cursor.fetchall()]
-
-
 def compare_counts(
     source_cursor: pyodbc.Cursor,
     target_cursor: pyodbc.Cursor,
     table: str,
     date_column: Optional[str],
+    start_date: str,
+    end_date: str,
 ) -> Tuple[int, int]:
+    """Row counts of both sides for [start_date, end_date) (whole table without a date column)."""
     source_table = quote_table(SOURCE_SCHEMA, table)
     target_table = quote_table(TARGET_SCHEMA, f"{TARGET_PREFIX}{table}")
 
-    source_where = ""
-    target_where = ""
-    params = []
+    where = ""
+    params: List[Any] = []
     if date_column:
-        source_where = f" WHERE [{date_column}] >= ? AND [{date_column}] <= ?"
-        target_where = f" WHERE [{date_column}] >= ? AND [{date_column}] <= ?"
-        params = [START_DATE, END_DATE]
-
-    if params:
-        source_cursor.execute(f"SELECT COUNT(*) FROM {source_table}{source_where}", params)
-    else:
-        source_cursor.execute(f"SELECT COUNT(*) FROM {source_table}{source_where}")
-    source_count = source_cursor.fetchone()[0]
+        where = f" WHERE [{date_column}] >= ? AND [{date_column}] < ?"
+        params = [start_date, end_date]
 
-    if params:
-        target_cursor.execute(f"SELECT COUNT(*) FROM {target_table}{target_where}", params)
-    else:
-        target_cursor.execute(f"SELECT COUNT(*) FROM {target_table}{target_where}")
+    source_cursor.execute(f"SELECT COUNT_BIG(*) FROM {source_table}{where}", *params)
+    source_count = source_cursor.fetchone()[0]
+    target_cursor.execute(f"SELECT COUNT_BIG(*) FROM {target_table}{where}", *params)
     target_count = target_cursor.fetchone()[0]
-
     return source_count, target_count
 
 
@@ -192,19 +169,35 @@ def compare_samples(
     target_cursor: pyodbc.Cursor,
     table: str,
     date_column: Optional[str],
-) -> Tuple[int, List[str]]:
+    row_count: int,
+    args: argparse.Namespace,
+) -> Tuple[int, int, List[str]]:
+    """Returns (sampled rows, matching rows, mismatch lines)."""
     source_table = quote_table(SOURCE_SCHEMA, table)
     target_table = quote_table(TARGET_SCHEMA, f"{TARGET_PREFIX}{table}")
 
     key_col = get_key_column(source_cursor, SOURCE_SCHEMA, table)
-    keys = random_keys(source_cursor, source_table, key_col, date_column)
+    keys = sample_keys(
+        source_cursor,
+        source_table,
+        key_col,
+        args.sample_size,
+        row_count,
+        date_column,
+        args.start_date,
+        args.end_exclusive,
+        method=args.sample_method,
+        seed=args.seed,
+    )
+    source_rows = fetch_rows_by_keys(source_cursor, source_table, key_col, keys)
+    target_rows = fetch_rows_by_keys(target_cursor, target_table, key_col, keys)
 
     matches = 0
     mismatches: List[str] = []
 
     for key_val in keys:
-        source_row = fetch_row(source_cursor, source_table, key_col, key_val)
-        target_row = fetch_row(target_cursor, target_table, key_col, key_val)
+        source_row = source_rows.get(key_val)
+        target_row = target_rows.get(key_val)
 
         if source_row is None:
             mismatches.append(f"- {table}: key {key_val} missing in source")
@@ -226,68 +219,115 @@ def compare_samples(
         if row_match:
             matches += 1
 
-    return matches, mismatches
+    return len(keys), matches, mismatches
 
 
-def main():
-    total_tables = len(SALES_TABLES) + len(REFERENCE_TABLES)
-    passed_tables = 0
+def get_connection(pool_name: str, conn_str: str, max_size: int):
+    """Pooled connection (pinged before reuse); leaving the with block returns it to the pool."""
+    return get_pool(pool_name, lambda: pyodbc.connect(conn_str, timeout=30), max_size=max_size).acquire()
 
-    print("=" * 60)
-    print("DATA QUALITY CHECK: Source (Xilnex) vs Target (Cloud)")
-    print("=" * 60)
-    print("\nROW COUNT COMPARISON")
-    print("-" * 64)
-    print(f"{'Table':<30} {'Source':>12} {'Target':>12} {'Status':>8} {'Diff':>6}")
-    print("-" * 64)
 
-    with pyodbc.connect(SOURCE_CONN_STR, timeout=30) as source_conn, pyodbc.connect(
-        TARGET_CONN_STR, timeout=30
+def check_table(table: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Count and sample one table on its own source/target sessions."""
+    date_column = DATE_FILTER_COLUMNS.get(table)
+    result: Dict[str, Any] = {"table": table, "error": None, "mismatches": []}
+    with get_connection("source", SOURCE_CONN_STR, args.max_connections) as source_conn, get_connection(
+        "target", TARGET_CONN_STR, args.max_connections
     ) as target_conn:
         source_cursor = source_conn.cursor()
         target_cursor = target_conn.cursor()
-
-        mismatch_details: List[str] = []
-        sample_summary: List[str] = []
-
-        # Row count comparison
-        for table in REFERENCE_TABLES + SALES_TABLES:
-            date_column = DATE_FILTER_COLUMNS.get(table)
-            source_count, target_count = compare_counts(source_cursor, target_cursor, table, date_column)
-            match = source_count == target_count
-            status = "MATCH" if match else "MISMATCH"
-            diff = target_count - source_count
-            print(
-                f"{table:<30} {format_int(source_count):>12} {format_int(target_count):>12} {status:>8} {diff:>6}"
+        result["source_count"], result["target_count"] = compare_counts(
+            source_cursor, target_cursor, table, date_column, args.start_date, args.end_exclusive
+        )
+        try:
+            result["sampled"], result["matches"], result["mismatches"] = compare_samples(
+                source_cursor, target_cursor, table, date_column, result["source_count"], args
             )
-            if match:
-                passed_tables += 1
+        except Exception as exc:  # pylint: disable=broad-except
+            result["error"] = str(exc)
+    return result
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Row count and sampled row comparison, source vs target.")
+    parser.add_argument("--start-date", default="2025-01-01", help="Date-filtered tables: first day (default: %(default)s).")
+    parser.add_argument(
+        "--end-date",
+        default=(date.today() - timedelta(days=1)).isoformat(),
+        help="Date-filtered tables: last day, INCLUSIVE (default: %(default)s).",
+    )
+    parser.add_argument("--sample-size", type=int, default=SAMPLE_SIZE, help="Rows per table (default: %(default)s).")
+    parser.add_argument("--sample-method", choices=SAMPLE_METHODS, default="modulo", help="(default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=None, help="Fix the sample for repeatable runs.")
+    parser.add_argument(
+        "--max-connections",
+        type=int,
+        default=4,
+        help="Tables checked at once, one session per server each (default: %(default)s).",
+    )
+    args = parser.parse_args()
+    args.end_exclusive = (datetime.fromisoformat(args.end_date).date() + timedelta(days=1)).isoformat()
+    return args
 
-        print("-" * 64)
 
-        # Random sample comparison
-        print("\nRANDOM SAMPLE COMPARISON (5 rows per table)")
-        print("-" * 64)
-        for table in REFERENCE_TABLES + SALES_TABLES:
-            date_column = DATE_FILTER_COLUMNS.get(table)
+def main():
+    args = parse_args()
+    tables = REFERENCE_TABLES + SALES_TABLES
+    total_tables = len(tables)
+    passed_tables = 0
+
+    print("=" * 60)
+    print("DATA QUALITY CHECK: Source (Xilnex) vs Target (Cloud)")
+    print("=" * 60)
+
+    with ThreadPoolExecutor(max_workers=max(1, args.max_connections)) as executor:
+        futures = [(table, executor.submit(check_table, table, args)) for table in tables]
+        results = []
+        for table, future in futures:
             try:
-                matches, mismatches = compare_samples(source_cursor, target_cursor, table, date_column)
-                if mismatches:
-                    sample_summary.append(f"FAIL {table}: {matches}/{SAMPLE_SIZE} rows match")
-                    mismatch_details.extend(mismatches)
-                else:
-                    sample_summary.append(f"OK   {table}: {matches}/{SAMPLE_SIZE} rows match")
+                results.append(future.result())
             except Exception as exc:  # pylint: disable=broad-except
-                sample_summary.append(f"FAIL {table}: error during comparison ({exc})")
+                results.append({"table": table, "error": f"connection/count failed ({exc})", "mismatches": []})
+
+    print("\nROW COUNT COMPARISON")
+    print("-" * 64)
+    print(f"{'Table':<30} {'Source':>12} {'Target':>12} {'Status':>8} {'Diff':>6}")
+    print("-" * 64)
+    for result in results:
+        if "source_count" not in result:
+            print(f"{result['table']:<30} ERROR {result['error']}")
+            continue
+        source_count, target_count = result["source_count"], result["target_count"]
+        match = source_count == target_count
+        status = "MATCH" if match else "MISMATCH"
+        diff = target_count - source_count
+        print(f"{result['table']:<30} {format_int(source_count):>12} {format_int(target_count):>12} {status:>8} {diff:>6}")
+        if match:
+            passed_tables += 1
+    print("-" * 64)
 
-        for line in sample_summary:
-            print(line)
-        for line in mismatch_details:
-            print(f"  {line}")
+    # Random sample comparison
+    print(f"\nRANDOM SAMPLE COMPARISON (up to {args.sample_size:,} rows per table, {args.sample_method})")
+    print("-" * 64)
+    mismatch_details: List[str] = []
+    for result in results:
+        table = result["table"]
+        if result["error"]:
+            print(f"FAIL {table}: error during comparison ({result['error']})")
+        elif result["mismatches"]:
+            print(f"FAIL {table}: {result['matches']}/{result['sampled']} rows match")
+            mismatch_details.extend(result["mismatches"][:MAX_DETAIL_LINES])
+            if len(result["mismatches"]) > MAX_DETAIL_LINES:
+                mismatch_details.append(f"- {table}: {len(result['mismatches']) - MAX_DETAIL_LINES} more mismatch(es)")
+        else:
+            print(f"OK   {table}: {result['matches']}/{result['sampled']} rows match")
+    for line in mismatch_details:
+        print(f"  {line}")
 
     print("\n" + "=" * 60)
     print(f"SUMMARY: {passed_tables}/{total_tables} tables passed row count check")
     print("=" * 60)
+    report_pools()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,82 @@
+"""
+Boundary check for the size-aware partition planner.
+
+Runs pack_partitions on synthetic day and hour counts and checks that the
+partitions and empty ranges tile the requested range exactly: every range is
+non-empty, each one starts where the previous one ended (same string), and
+midnight bounds are written as plain dates. No database connection is required.
+
+Usage:
+    python tests/verify_partition_boundaries.py
+"""
+
+import sys
+from datetime import date, datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from utils.partition_planner import pack_partitions  # noqa: E402
+
+
+def hour_lookup(day: date):
+    """Heavy days: 50 rows in every hour except 03:00-05:59 (empty)."""
+    return {hour: 0 if 3 <= hour < 6 else 50 for hour in range(24)}
+
+
+CASES = [
+    # (label, day_counts, target_rows, hour_counts)
+    ("whole day then split day", {"2025-01-01": 100, "2025-01-02": 500}, 100, hour_lookup),
+    ("split day then whole day", {"2025-01-01": 500, "2025-01-02": 100}, 100, hour_lookup),
+    ("empty days around split day", {"2025-01-01": 0, "2025-01-02": 500, "2025-01-03": 0}, 100, hour_lookup),
+    ("two split days", {"2025-01-01": 500, "2025-01-02": 500}, 200, hour_lookup),
+    ("no hour lookup", {"2025-01-01": 100, "2025-01-02": 0, "2025-01-03": 500}, 100, None),
+    ("all empty", {"2025-01-01": 0, "2025-01-02": 0}, 100, hour_lookup),
+]
+
+
+def check_case(label, day_counts, target_rows, hour_counts):
+    partitions, empty_ranges = pack_partitions(day_counts, target_rows, hour_counts)
+    ranges = sorted(
+        [(start, end) for _, start, end, _ in partitions] + list(empty_ranges),
+        key=lambda bounds: datetime.fromisoformat(bounds[0]),
+    )
+    problems = []
+    days = list(day_counts)
+    expected_start = days[0]
+    expected_end = date.fromordinal(date.fromisoformat(days[-1]).toordinal() + 1).isoformat()
+
+    for start, end in ranges:
+        for bound in (start, end):
+            if "T" in bound and bound.endswith("T00:00:00"):
+                problems.append(f"midnight bound not written as a date: {bound}")
+        if datetime.fromisoformat(start) >= datetime.fromisoformat(end):
+            problems.append(f"empty or inverted range: ({start}, {end})")
+    for (_, prev_end), (next_start, _) in zip(ranges, ranges[1:]):
+        if prev_end != next_start:
+            problems.append(f"ranges do not meet: {prev_end} -> {next_start}")
+    if ranges and (ranges[0][0] != expected_start or ranges[-1][1] != expected_end):
+        problems.append(f"ranges cover {ranges[0][0]}..{ranges[-1][1]}, expected {expected_start}..{expected_end}")
+    if sum(part[3] for part in partitions) != sum(
+        sum(hour_counts(date.fromisoformat(day)).values()) if hour_counts and rows > target_rows else rows
+        for day, rows in day_counts.items()
+    ):
+        problems.append("partition row estimates do not add up to the input counts")
+
+    status = "OK" if not problems else "FAIL"
+    print(f"[{status}] {label}: {len(partitions)} partitions, {len(empty_ranges)} empty ranges")
+    for problem in problems:
+        print(f"    {problem}")
+    return not problems
+
+
+def main() -> int:
+    results = [check_case(*case) for case in CASES]
+    failed = results.count(False)
+    print(f"\n{len(results) - failed}/{len(results)} cases passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
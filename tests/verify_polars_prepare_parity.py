@@ -0,0 +1,152 @@
+"""
+Parity check for the vectorized Polars transform used by the monthly streamer.
+
+Runs prepare_data_for_sql_polars on synthetic edge-case data and compares every
+cell with the row-by-row reference helper (_convert_datetime_value) plus the
+NaN -> None sanitize rule. No database connection is required.
+
+Usage:
+    python tests/verify_polars_prepare_parity.py
+"""
+
+import math
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+
+import polars as pl  # noqa: E402
+
+from scripts.replicate_monthly_parallel_streaming import (  # noqa: E402
+    _convert_datetime_value,
+    prepare_data_for_sql_polars,
+)
+
+ROWS = 20000
+SEED = 5013
+
+SCHEMA_ENTRY = {
+    "columns": [
+        {"name": "DT_COL", "type": "datetime"},
+        {"name": "D_COL", "type": "date"},
+        {"name": "DT_STR", "type": "datetime"},
+        {"name": "D_STR", "type": "date"},
+        {"name": "AMOUNT", "type": "decimal"},
+        {"name": "NAME", "type": "varchar"},
+        {"name": "QTY", "type": "int"},
+        {"name": "UPDATE_TIMESTAMP", "type": "timestamp"},
+    ]
+}
+
+
+def _random_datetime(rng: random.Random) -> datetime:
+    # Cover the whole DATETIME range plus a few values outside it
+    year = rng.choice([1, 1000, 1752, 1753, 1900, 1970, 2018, 2024, 2025, 9999])
+    base = datetime(year, 1, 1)
+    offset = timedelta(
+        days=rng.randint(0, 364),
+        seconds=rng.randint(0, 86399),
+        microseconds=rng.choice([0, 5000, 15000, 1666, 999999, rng.randint(0, 999999)]),
+    )
+    try:
+        return base + offset
+    except OverflowError:
+        return base
+
+
+def build_frame(rng: random.Random) -> pl.DataFrame:
+    dt_values, d_values, dt_strings, d_strings, amounts, names, qtys, stamps = ([] for _ in range(8))
+    for _ in range(ROWS):
+        dt = _random_datetime(rng)
+        dt_values.append(rng.choice([dt, None]))
+        d_values.append(rng.choice([dt.date(), None]))
+        dt_strings.append(
+            rng.choice(
+                [
+                    dt.strftime("%Y-%m-%d %H:%M:%S"),
+                    dt.isoformat(),
+                    f"  {dt.date().isoformat()} ",
+                    "",
+                    "   ",
+                    "not-a-date",
+                    "2024-13-45 00:00:00",
+                    None,
+                ]
+            )
+        )
+        d_strings.append(rng.choice([dt.date().isoformat(), dt.strftime("%Y-%m-%d %H:%M:%S"), "", None]))
+        amounts.append(rng.choice([rng.uniform(-1e6, 1e6), float("nan"), None, 0.0]))
+        names.append(rng.choice(["MB", "", None, "Ayam Goreng"]))
+        qtys.append(rng.choice([1, 0, -3, None]))
+        stamps.append(rng.choice([bytes(rng.getrandbits(8) for _ in range(8)), None]))
+
+    return pl.DataFrame(
+        {
+            "DT_COL": dt_values,
+            "D_COL": d_values,
+            "DT_STR": dt_strings,
+            "D_STR": d_strings,
+            "AMOUNT": amounts,
+            "NAME": names,
+            "QTY": qtys,
+            "UPDATE_TIMESTAMP": stamps,
+        },
+        schema={
+            "DT_COL": pl.Datetime("us"),
+            "D_COL": pl.Date,
+            "DT_STR": pl.Utf8,
+            "D_STR": pl.Utf8,
+            "AMOUNT": pl.Float64,
+            "NAME": pl.Utf8,
+            "QTY": pl.Int64,
+            "UPDATE_TIMESTAMP": pl.Binary,
+        },
+    )
+
+
+def reference_value(val, col_type: str):
+    """Row-by-row behaviour of the original map_elements implementation."""
+    if col_type in ("datetime", "date"):
+        return _convert_datetime_value(val, col_type == "date")
+    if isinstance(val, float) and math.isnan(val):
+        return None
+    return val
+
+
+def main() -> int:
+    rng = random.Random(SEED)
+    frame = build_frame(rng)
+    type_map = {col["name"]: col["type"] for col in SCHEMA_ENTRY["columns"]}
+
+    prepared = prepare_data_for_sql_polars(frame, SCHEMA_ENTRY)
+
+    mismatches = 0
+    for col_name in frame.columns:
+        col_type = type_map[col_name]
+        source_values = frame[col_name].to_list()
+        prepared_values = prepared[col_name].to_list()
+        col_mismatches = 0
+        for idx, (raw, got) in enumerate(zip(source_values, prepared_values)):
+            expected = reference_value(raw, col_type)
+            if expected != got:
+                col_mismatches += 1
+                if col_mismatches <= 5:
+                    print(f"  MISMATCH {col_name}[{idx}]: input={raw!r} expected={expected!r} got={got!r}")
+        status = "OK" if col_mismatches == 0 else "MISMATCH"
+        print(f"{col_name:<20} {col_type:<10} {len(source_values):>8,} values  {status}")
+        mismatches += col_mismatches
+
+    print("-" * 60)
+    if mismatches:
+        print(f"FAIL: {mismatches:,} mismatched cells")
+        return 1
+    print("PASS: vectorized output matches the row-by-row helpers")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,7 +3,9 @@ Verify ALL table replication by checking row counts in cloud warehouse.
 Includes both sales tables (date-filtered) and reference tables.
 """
 
+import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pyodbc
@@ -11,8 +13,11 @@ import pyodbc
 # Add project root to import config
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
 
 import config
+from replicate_reference_tables import DATE_FILTER_COLUMNS
+from utils.connection_pool import get_pool, report_pools
 
 # Cloud warehouse connection
 conn_str = config.build_connection_string(config.TARGET_SQL_CONFIG, trust_server_cert=True)
@@ -20,18 +25,7 @@ conn_str = config.build_connection_string(config.TARGET_SQL_CONFIG, trust_server
 SCHEMA_PREFIX = "dbo.com_5013_"
 
 # Sales tables (date-filtered)
-SALES_TABLES = [
-    "APP_4_SALES",
-    "APP_4_SALESITEM",
-    "APP_4_PAYMENT",
-    "APP_4_VOIDSALESITEM",
-    "APP_4_SALESCREDITNOTE",
-    "APP_4_SALESCREDITNOTEITEM",
-    "APP_4_SALESDEBITNOTE",
-    "APP_4_SALESDEBITNOTEITEM",
-    "APP_4_EPAYMENTLOG",
-    "APP_4_VOUCHER",
-]
+SALES_TABLES = list(DATE_FILTER_COLUMNS)
 
 # Reference tables (full table refresh)
 REFERENCE_TABLES = [
@@ -47,7 +41,44 @@ REFERENCE_TABLES = [
 ]
 
 
-def check_table_counts():
+def count_rows(pool, tables, max_connections):
+    """{table: row count or the exception}, counted concurrently on up to max_connections sessions."""
+
+    def count(table):
+        conn = pool.acquire()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT COUNT_BIG(*) FROM {SCHEMA_PREFIX}{table}")
+            return cursor.fetchone()[0]
+        except Exception as e:
+            return e
+        finally:
+            conn.close()
+
+    with ThreadPoolExecutor(max_workers=max(1, max_connections)) as executor:
+        return dict(zip(tables, executor.map(count, tables)))
+
+
+def print_section(title, tables, counts):
+    print(title)
+    print("-" * 65)
+    print(f"{'Table Name':<40} {'Row Count':>15}")
+    print("-" * 65)
+
+    total = 0
+    for table in tables:
+        count = counts[table]
+        if isinstance(count, Exception):
+            print(f"✗ {table:<38} ERROR: {count}")
+            continue
+        total += count
+        status = "✓" if count > 0 else "○"
+        print(f"{status} {table:<38} {count:>15,}")
+    print("-" * 65)
+    return total
+
+
+def check_table_counts(max_connections=4):
     print("=" * 65)
     print("Cloud Warehouse - Complete Data Verification")
     print("=" * 65)
@@ -56,51 +87,18 @@ def check_table_counts():
     print("=" * 65)
     
     try:
-        conn = pyodbc.connect(conn_str, timeout=30)
-        cursor = conn.cursor()
+        pool = get_pool("target", lambda: pyodbc.connect(conn_str, timeout=30), max_size=max_connections)
+        pool.acquire().close()
         print("\n✅ Connected to cloud warehouse!\n")
+        counts = count_rows(pool, SALES_TABLES + REFERENCE_TABLES, max_connections)
         
         # --- SALES TABLES ---
-        print("📊 SALES TABLES (Date-Filtered)")
-        print("-" * 65)
-        print(f"{'Table Name':<40} {'Row Count':>15}")
-        print("-" * 65)
-        
-        sales_total = 0
-        for table in SALES_TABLES:
-            try:
-                full_table_name = f"{SCHEMA_PREFIX}{table}"
-                cursor.execute(f"SELECT COUNT(*) FROM {full_table_name}")
-                count = cursor.fetchone()[0]
-                sales_total += count
-                status = "✓" if count > 0 else "○"
-                print(f"{status} {table:<38} {count:>15,}")
-            except Exception as e:
-                print(f"✗ {table:<38} ERROR: {e}")
-        
-        print("-" * 65)
+        sales_total = print_section("📊 SALES TABLES (Date-Filtered)", SALES_TABLES, counts)
         print(f"{'Sales Subtotal':>41} {sales_total:>15,}")
         print()
         
         # --- REFERENCE TABLES ---
-        print("📚 REFERENCE TABLES (Full Refresh)")
-        print("-" * 65)
-        print(f"{'Table Name':<40} {'Row Count':>15}")
-        print("-" * 65)
-        
-        ref_total = 0
-        for table in REFERENCE_TABLES:
-            try:
-                full_table_name = f"{SCHEMA_PREFIX}{table}"
-                cursor.execute(f"SELECT COUNT(*) FROM {full_table_name}")
-                count = cursor.fetchone()[0]
-                ref_total += count
-                status = "✓" if count > 0 else "○"
-                print(f"{status} {table:<38} {count:>15,}")
-            except Exception as e:
-                print(f"✗ {table:<38} ERROR: {e}")
-        
-        print("-" * 65)
+        ref_total = print_section("📚 REFERENCE TABLES (Full Refresh)", REFERENCE_TABLES, counts)
         print(f"{'Reference Subtotal':>41} {ref_total:>15,}")
         print()
         
@@ -109,11 +107,13 @@ def check_table_counts():
         print(f"{'GRAND TOTAL':>41} {sales_total + ref_total:>15,}")
         print("=" * 65)
         
-        conn.close()
+        report_pools()
         
     except Exception as e:
         print(f"\n❌ Connection failed: {e}")
 
 
 if __name__ == "__main__":
-    check_table_counts()
+    parser = argparse.ArgumentParser(description="Row counts of every replica table in the cloud warehouse.")
+    parser.add_argument("--max-connections", type=int, default=4, help="Concurrent COUNT sessions (default: %(default)s).")
+    check_table_counts(parser.parse_args().max_connections)
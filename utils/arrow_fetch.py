@@ -0,0 +1,284 @@
+"""
+Columnar fetch backends that read source result sets straight into Arrow.
+
+Both streaming loaders (monthly and full-table) pull chunks through one of these
+backends instead of materializing pyodbc rows into tuples and then into a
+row-oriented DataFrame:
+
+- ``arrow-odbc``: optional; uses the ``arrow-odbc`` package, which fills Arrow
+  buffers directly from ODBC without creating Python objects per value. The
+  schema-derived Arrow types are requested from the driver (``map_schema``),
+  so DECIMAL arrives as decimal128 and datetimes as timestamp[us] without a
+  cast afterwards. Its connections are pooled (utils/connection_pool.py, pool
+  "arrow-odbc"). Unbounded (MAX) columns get ARROW_ODBC_MAX_TEXT_SIZE /
+  ARROW_ODBC_MAX_BINARY_SIZE byte buffers; a longer value fails the read with a
+  truncation error instead of being cut.
+- ``pyodbc``: the fallback. It still allocates per row: pyodbc builds a Row and
+  one Python object per value, and those are transposed column-wise into typed
+  Arrow arrays. It only saves the tuple copies and the row-oriented DataFrame
+  the loaders used to build.
+
+Target Arrow types are derived from the column types recorded in
+docs/xilnex_full_schema.json, mirroring the Polars mapping the monthly streamer
+used before. DECIMAL/NUMERIC/MONEY columns stay exact: decimal128 with the
+source precision and scale (float64 would round past ~15 significant digits).
+"""
+
+import sys
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+import pyarrow as pa
+
+from utils.connection_pool import get_pool
+
+try:
+    import arrow_odbc  # type: ignore
+except (ImportError, OSError):  # Optional dependency (OSError: native ODBC library missing)
+    arrow_odbc = None
+
+
+FETCH_BACKENDS = ("auto", "pyodbc", "arrow-odbc")
+
+# Driver errors the arrow-odbc backend raises (its counterpart of pyodbc.Error)
+ARROW_ODBC_ERRORS = (arrow_odbc.Error,) if arrow_odbc is not None else ()
+
+# (precision, scale) of the fixed-point types without their own in the schema file
+_MONEY_DECIMALS = {"money": (19, 4), "smallmoney": (10, 4)}
+# Decimals whose schema entry has no precision: the replica's DECIMAL(38, 20)
+_DEFAULT_DECIMAL = (38, 20)
+
+# arrow-odbc binds fixed-size transit buffers; (N)VARCHAR(MAX)/VARBINARY(MAX) columns
+# need an explicit upper bound or the driver reports a useless (0 or 2GB) element size.
+ARROW_ODBC_MAX_TEXT_SIZE = 16384
+ARROW_ODBC_MAX_BINARY_SIZE = 16384
+ARROW_ODBC_POOL_SIZE = 16
+
+
+def arrow_type_for_sql(sql_type: str, precision: Optional[int] = None, scale: Optional[int] = None) -> pa.DataType:
+    """Map a SQL Server type name (with its precision/scale) from the schema file to an Arrow type."""
+    t = (sql_type or "").lower()
+    if t in ("int", "bigint", "smallint", "tinyint"):
+        return pa.int64()
+    if t in _MONEY_DECIMALS:
+        return pa.decimal128(*_MONEY_DECIMALS[t])
+    if t in ("decimal", "numeric"):
+        if not precision:
+            return pa.decimal128(*_DEFAULT_DECIMAL)
+        return pa.decimal128(int(precision), int(scale or 0))
+    if t in ("float", "real"):
+        return pa.float64()
+    if t == "date":
+        return pa.date32()
+    if t in ("datetime", "datetime2", "smalldatetime"):
+        return pa.timestamp("us")
+    if t == "bit":
+        return pa.bool_()
+    if t in ("timestamp", "binary", "varbinary", "image"):
+        return pa.binary()
+    # default string
+    return pa.string()
+
+
+def arrow_schema_for(schema_entry: dict) -> pa.Schema:
+    """Build the Arrow schema for a load_schema() entry (ordinal column order)."""
+    return pa.schema(
+        [
+            pa.field(
+                col["name"],
+                arrow_type_for_sql(col.get("type", ""), col.get("numeric_precision"), col.get("numeric_scale")),
+            )
+            for col in schema_entry["columns"]
+        ]
+    )
+
+
+def _to_arrow_array(values: Sequence, target: Optional[pa.DataType]) -> pa.Array:
+    """Convert one column of Python values to Arrow, honouring the target type when possible."""
+    if target is None:
+        return pa.array(values)
+    try:
+        return pa.array(values, type=target)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError):
+        pass
+    # Unexpected Python type for this column (e.g. strings in a datetime column);
+    # keep the inferred type, or text as a last resort, and let the transform step normalise it.
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError):
+        return pa.array([None if v is None else str(v) for v in values], type=pa.string())
+
+
+def requested_schema(detected: pa.Schema, arrow_schema: pa.Schema) -> pa.Schema:
+    """The result set's schema with schema-file types for the columns the file knows."""
+    fields = []
+    for field in detected:
+        idx = arrow_schema.get_field_index(field.name)
+        fields.append(field if idx == -1 else pa.field(field.name, arrow_schema.field(idx).type, field.nullable))
+    return pa.schema(fields)
+
+
+class ArrowFetchBackend(ABC):
+    """
+    Interface for columnar source readers.
+
+    batch_size may be a zero-argument callable, re-read before every fetch, so an
+    adaptive controller (utils/chunk_controller.py) can re-size chunks mid-stream.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def iter_batches(
+        self,
+        query: str,
+        params: Optional[List],
+        schema_entry: Optional[dict],
+        batch_size: Union[int, Callable[[], int]],
+    ) -> Iterator[pa.RecordBatch]:
+        raise NotImplementedError
+
+
+def _current_batch_size(batch_size: Union[int, Callable[[], int]]) -> int:
+    return max(1, int(batch_size() if callable(batch_size) else batch_size))
+
+
+class PyodbcArrowBackend(ArrowFetchBackend):
+    """Fetch with pyodbc and transpose each block into typed Arrow columns."""
+
+    name = "pyodbc"
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def iter_batches(self, query, params, schema_entry, batch_size):
+        arrow_schema = arrow_schema_for(schema_entry) if schema_entry else None
+
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(query, params or [])
+            names = [desc[0] for desc in cursor.description] if cursor.description else []
+            targets = []
+            for col_name in names:
+                idx = arrow_schema.get_field_index(col_name) if arrow_schema is not None else -1
+                targets.append(arrow_schema.field(idx).type if idx != -1 else None)
+
+            while True:
+                rows = cursor.fetchmany(_current_batch_size(batch_size))
+                if not rows:
+                    break
+                # pyodbc.Row is a sequence, so zip(*) transposes without an intermediate tuple copy
+                columns = list(zip(*rows))
+                arrays = [_to_arrow_array(values, target) for values, target in zip(columns, targets)]
+                yield pa.RecordBatch.from_arrays(arrays, names=names)
+        finally:
+            cursor.close()
+
+
+class _OdbcConnection:
+    """An arrow-odbc connection with the rollback()/close() the pool expects (reads only, autocommit)."""
+
+    def __init__(self, connection_string: str):
+        self.connection = arrow_odbc.connect(connection_string)
+
+    def rollback(self) -> None:
+        pass
+
+    def close(self) -> None:
+        # arrow-odbc frees the ODBC handle when the object goes away
+        self.connection = None
+
+
+_ODBC_POOL_NAMES: Dict[str, str] = {}
+_ODBC_POOL_NAMES_LOCK = threading.Lock()
+
+
+def _odbc_pool(connection_string: str):
+    """Process-wide pool of arrow-odbc connections for one connection string."""
+    with _ODBC_POOL_NAMES_LOCK:
+        name = _ODBC_POOL_NAMES.get(connection_string)
+        if name is None:
+            name = "arrow-odbc" if not _ODBC_POOL_NAMES else f"arrow-odbc-{len(_ODBC_POOL_NAMES) + 1}"
+            _ODBC_POOL_NAMES[connection_string] = name
+    # No cursor() to ping with; a connection that fails a read is discarded instead
+    return get_pool(
+        name,
+        lambda: _OdbcConnection(connection_string),
+        max_size=ARROW_ODBC_POOL_SIZE,
+        ping_query=None,
+    )
+
+
+class ArrowOdbcBackend(ArrowFetchBackend):
+    """Fetch with arrow-odbc, which fills Arrow buffers directly from ODBC."""
+
+    name = "arrow-odbc"
+
+    def __init__(self, connection_string: str):
+        if arrow_odbc is None:
+            raise ImportError("arrow-odbc is not installed (pip install arrow-odbc)")
+        self.connection_string = connection_string
+
+    def iter_batches(self, query, params, schema_entry, batch_size):
+        arrow_schema = arrow_schema_for(schema_entry) if schema_entry else None
+        parameters = [None if p is None else str(p) for p in (params or [])]
+        conn = _odbc_pool(self.connection_string).acquire()
+        reader = None
+        try:
+            # Transit buffers are allocated once, so an adaptive size only applies at start
+            reader = conn.connection.read_arrow_batches(
+                query=query,
+                batch_size=_current_batch_size(batch_size),
+                parameters=parameters or None,
+                max_text_size=ARROW_ODBC_MAX_TEXT_SIZE,
+                max_binary_size=ARROW_ODBC_MAX_BINARY_SIZE,
+                map_schema=(lambda detected: requested_schema(detected, arrow_schema)) if arrow_schema else None,
+            )
+            yield from reader
+        except GeneratorExit:
+            # Caller stopped early; dropping the reader below closes the statement
+            raise
+        except BaseException:
+            reader = None
+            conn.discard()
+            raise
+        finally:
+            # Free the statement before the connection goes back to the pool
+            reader = None
+            conn.close()
+
+
+def resolve_fetch_backend_name(name: str) -> str:
+    """Resolve "auto" to the best available backend."""
+    if name not in FETCH_BACKENDS:
+        raise ValueError(f"Unknown fetch backend {name!r}; expected one of {', '.join(FETCH_BACKENDS)}")
+    if name == "auto":
+        return "arrow-odbc" if arrow_odbc is not None else "pyodbc"
+    if name == "arrow-odbc" and arrow_odbc is None:
+        print("[WARN] arrow-odbc not installed; falling back to pyodbc fetch backend", file=sys.stderr)
+        return "pyodbc"
+    return name
+
+
+def create_fetch_backend(
+    name: str,
+    connection=None,
+    connection_string: Optional[str] = None,
+) -> ArrowFetchBackend:
+    """
+    Create a fetch backend.
+
+    Args:
+        name: "pyodbc", "arrow-odbc" or "auto"
+        connection: pyodbc connection (required for the pyodbc backend)
+        connection_string: ODBC connection string (required for arrow-odbc)
+    """
+    resolved = resolve_fetch_backend_name(name)
+    if resolved == "arrow-odbc":
+        if not connection_string:
+            raise ValueError("arrow-odbc fetch backend requires a connection string")
+        return ArrowOdbcBackend(connection_string)
+    if connection is None:
+        raise ValueError("pyodbc fetch backend requires an open connection")
+    return PyodbcArrowBackend(connection)
@@ -0,0 +1,423 @@
+"""
+Per-unit checkpoint store for the monthly / all-sales replication runs.
+
+Every unit of work (a month or an adaptive partition of one table) is one row
+with a status: pending -> running -> done | failed. Each transition is a single
+UPDATE, so concurrent workers and concurrent runs never rewrite each other's
+state. A crash cannot leave the store half written. --resume reads only the
+done/failed rows of the table.
+
+- Run IDs: every process gets one (new_run_id()), recorded on the units it claims.
+- Leases: claim() marks a unit running for ``lease_seconds`` and fails with
+  UnitLeasedError while another run holds a live lease on it. A heartbeat
+  thread renews this run's leases. A crashed run stops renewing, so its units
+  become claimable again once the lease runs out.
+
+Backends:
+
+- ``sqlite`` (default): <output-dir>/replica_checkpoints.sqlite3, WAL mode, one
+  autocommitted statement per transition. Separate runs on one machine share it.
+- ``db``: dbo.etl_replica_progress on the target (unit_key / run_id /
+  lease_expires from migration 116). Runs on different machines share it, and
+  lease times come from the server clock. The store keeps one dedicated
+  connection of its own, outside the target pool. Workers call claim() /
+  complete() while they hold a pooled connection, and a second checkout from
+  that pool could wait forever once every worker did the same.
+
+Existing <table>_monthly_checkpoint.json files are imported once by the caller
+(import_finished) when the store has nothing for the table yet.
+"""
+
+import atexit
+from abc import ABC, abstractmethod
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+CHECKPOINT_BACKENDS = ("sqlite", "db")
+SQLITE_FILENAME = "replica_checkpoints.sqlite3"
+
+# (unit_key, range_start, range_end)
+Unit = Tuple[str, str, str]
+
+
+class UnitLeasedError(RuntimeError):
+    """Raised by claim() when another run holds a live lease on the unit."""
+
+
+def new_run_id() -> str:
+    return uuid.uuid4().hex
+
+
+class CheckpointStore(ABC):
+    """Status transitions for (table, unit) rows; subclasses supply the SQL."""
+
+    backend = "base"
+
+    def __init__(self, run_id: str, lease_seconds: float):
+        self.run_id = run_id
+        self.lease_seconds = max(30.0, float(lease_seconds))
+        self._stop = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+
+    # -- backend primitives ---------------------------------------------------------
+    @abstractmethod
+    def _execute(self, sql: str, params: Sequence) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _executemany(self, sql: str, rows: Sequence[Sequence]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _query(self, sql: str, params: Sequence) -> list:
+        raise NotImplementedError
+
+    # -- transitions ------------------------------------------------------------------
+    @abstractmethod
+    def register(self, table_name: str, units: Iterable[Unit]) -> None:
+        """Insert missing units as pending (existing rows keep their status)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def claim(self, table_name: str, unit_key: str) -> None:
+        """pending/done/failed (or running with an expired lease) -> running for this run."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def complete(self, table_name: str, unit_key: str, rows_loaded: int) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def fail(self, table_name: str, unit_key: str, message: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def finished_units(self, table_name: str) -> Dict[str, str]:
+        """unit_key -> "done" | "failed" for the table (what --resume needs)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def import_finished(self, table_name: str, synced: Iterable[str], failed: Iterable[str]) -> None:
+        """Mark pending units done/failed from a legacy JSON checkpoint."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def renew_leases(self) -> int:
+        raise NotImplementedError
+
+    # -- heartbeat ------------------------------------------------------------------------
+    def start_heartbeat(self) -> None:
+        if self._heartbeat is not None:
+            return
+        self._heartbeat = threading.Thread(target=self._renew_loop, name="checkpoint-heartbeat", daemon=True)
+        self._heartbeat.start()
+
+    def _renew_loop(self) -> None:
+        while not self._stop.wait(self.lease_seconds / 3):
+            try:
+                self.renew_leases()
+            except Exception as exc:  # pylint: disable=broad-except
+                print(f"[WARN] Checkpoint lease renewal failed: {exc}", file=sys.stderr)
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join(timeout=5)
+            self._heartbeat = None
+
+    def describe(self) -> str:
+        return f"{self.backend} checkpoint store, run {self.run_id}"
+
+
+class SqliteCheckpointStore(CheckpointStore):
+    """Local store in one SQLite file (WAL, autocommit; each statement is atomic)."""
+
+    backend = "sqlite"
+
+    def __init__(self, path: Path, run_id: str, lease_seconds: float):
+        super().__init__(run_id, lease_seconds)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS checkpoint_units (
+                table_name TEXT NOT NULL,
+                unit_key TEXT NOT NULL,
+                range_start TEXT NOT NULL,
+                range_end TEXT NOT NULL,
+                status TEXT NOT NULL,
+                run_id TEXT,
+                lease_expires REAL,
+                rows_loaded INTEGER,
+                message TEXT,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (table_name, unit_key)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_checkpoint_units_status ON checkpoint_units (table_name, status)"
+        )
+
+    def _execute(self, sql, params):
+        with self._lock:
+            return self._conn.execute(sql, params).rowcount
+
+    def _executemany(self, sql, rows):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(sql, rows)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _query(self, sql, params):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def register(self, table_name, units):
+        now = time.time()
+        self._executemany(
+            "INSERT OR IGNORE INTO checkpoint_units (table_name, unit_key, range_start, range_end, status, updated_at) "
+            "VALUES (?, ?, ?, ?, 'pending', ?)",
+            [(table_name, key, start, end, now) for key, start, end in units],
+        )
+
+    def claim(self, table_name, unit_key):
+        now = time.time()
+        claimed = self._execute(
+            "UPDATE checkpoint_units SET status = 'running', run_id = ?, lease_expires = ?, message = NULL, updated_at = ? "
+            "WHERE table_name = ? AND unit_key = ? AND (status <> 'running' OR lease_expires < ? OR run_id = ?)",
+            (self.run_id, now + self.lease_seconds, now, table_name, unit_key, now, self.run_id),
+        )
+        if not claimed:
+            holder = self._query(
+                "SELECT run_id, lease_expires FROM checkpoint_units WHERE table_name = ? AND unit_key = ?",
+                (table_name, unit_key),
+            )
+            run_id, expires = holder[0] if holder else (None, now)
+            raise UnitLeasedError(f"running in run {run_id} (lease expires in {max(0, expires - now):.0f}s)")
+
+    def complete(self, table_name, unit_key, rows_loaded):
+        return bool(
+            self._execute(
+                "UPDATE checkpoint_units SET status = 'done', rows_loaded = ?, lease_expires = NULL, updated_at = ? "
+                "WHERE table_name = ? AND unit_key = ? AND run_id = ?",
+                (rows_loaded, time.time(), table_name, unit_key, self.run_id),
+            )
+        )
+
+    def fail(self, table_name, unit_key, message):
+        return bool(
+            self._execute(
+                "UPDATE checkpoint_units SET status = 'failed', message = ?, lease_expires = NULL, updated_at = ? "
+                "WHERE table_name = ? AND unit_key = ? AND run_id = ?",
+                (message, time.time(), table_name, unit_key, self.run_id),
+            )
+        )
+
+    def finished_units(self, table_name):
+        rows = self._query(
+            "SELECT unit_key, status FROM checkpoint_units WHERE table_name = ? AND status IN ('done', 'failed')",
+            (table_name,),
+        )
+        return {key: status for key, status in rows}
+
+    def import_finished(self, table_name, synced, failed):
+        now = time.time()
+        self._executemany(
+            "UPDATE checkpoint_units SET status = ?, updated_at = ? "
+            "WHERE table_name = ? AND unit_key = ? AND status = 'pending'",
+            [("done", now, table_name, key) for key in synced] + [("failed", now, table_name, key) for key in failed],
+        )
+
+    def renew_leases(self):
+        now = time.time()
+        return self._execute(
+            "UPDATE checkpoint_units SET lease_expires = ? WHERE run_id = ? AND status = 'running'",
+            (now + self.lease_seconds, self.run_id),
+        )
+
+    def close(self):
+        super().close()
+        with self._lock:
+            self._conn.close()
+
+    def describe(self):
+        return f"{super().describe()} ({self.path})"
+
+
+class DbCheckpointStore(CheckpointStore):
+    """Shared store in dbo.etl_replica_progress (needs migration 116); lease times use the server clock."""
+
+    backend = "db"
+    table = "dbo.etl_replica_progress"
+
+    def __init__(self, connect: Callable[[], object], run_id: str, lease_seconds: float):
+        super().__init__(run_id, lease_seconds)
+        # connect() opens a plain (unpooled) connection; it is reopened after an error
+        self._connect = connect
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _run(self, work):
+        with self._lock:
+            if self._conn is None:
+                self._conn = self._connect()
+            try:
+                cursor = self._conn.cursor()
+                try:
+                    result = work(cursor)
+                finally:
+                    cursor.close()
+                self._conn.commit()
+                return result
+            except Exception:
+                conn, self._conn = self._conn, None
+                try:
+                    conn.close()
+                except Exception:  # pylint: disable=broad-except
+                    pass
+                raise
+
+    def _execute(self, sql, params):
+        def execute(cursor):
+            cursor.execute(sql, *params)
+            return cursor.rowcount
+
+        return self._run(execute)
+
+    def _executemany(self, sql, rows):
+        if rows:
+            self._run(lambda cursor: cursor.executemany(sql, rows))
+
+    def _query(self, sql, params):
+        def query(cursor):
+            cursor.execute(sql, *params)
+            return cursor.fetchall()
+
+        return self._run(query)
+
+    def register(self, table_name, units):
+        self._executemany(
+            f"INSERT INTO {self.table} (table_name, unit_key, job_date, status) "
+            f"SELECT ?, ?, CAST(? AS DATE), 'pending' WHERE NOT EXISTS "
+            f"(SELECT 1 FROM {self.table} WITH (UPDLOCK, HOLDLOCK) WHERE table_name = ? AND unit_key = ?)",
+            [(table_name, key, start[:10], table_name, key) for key, start, _ in units],
+        )
+
+    def claim(self, table_name, unit_key):
+        claimed = self._execute(
+            f"UPDATE {self.table} SET status = 'running', run_id = ?, "
+            "lease_expires = DATEADD(second, ?, SYSUTCDATETIME()), batch_start = SYSUTCDATETIME(), "
+            "batch_end = NULL, message = NULL "
+            "WHERE table_name = ? AND unit_key = ? "
+            "AND (status <> 'running' OR lease_expires < SYSUTCDATETIME() OR run_id = ?)",
+            (self.run_id, int(self.lease_seconds), table_name, unit_key, self.run_id),
+        )
+        if not claimed:
+            holder = self._query(
+                f"SELECT run_id, DATEDIFF(second, SYSUTCDATETIME(), lease_expires) FROM {self.table} "
+                "WHERE table_name = ? AND unit_key = ?",
+                (table_name, unit_key),
+            )
+            run_id, remaining = holder[0] if holder else (None, 0)
+            raise UnitLeasedError(f"running in run {run_id} (lease expires in {max(0, remaining or 0)}s)")
+
+    def complete(self, table_name, unit_key, rows_loaded):
+        return bool(
+            self._execute(
+                f"UPDATE {self.table} SET status = 'done', rows_loaded = ?, lease_expires = NULL, "
+                "batch_end = SYSUTCDATETIME() WHERE table_name = ? AND unit_key = ? AND run_id = ?",
+                (rows_loaded, table_name, unit_key, self.run_id),
+            )
+        )
+
+    def fail(self, table_name, unit_key, message):
+        return bool(
+            self._execute(
+                f"UPDATE {self.table} SET status = 'failed', message = ?, lease_expires = NULL, "
+                "batch_end = SYSUTCDATETIME() WHERE table_name = ? AND unit_key = ? AND run_id = ?",
+                (message, table_name, unit_key, self.run_id),
+            )
+        )
+
+    def finished_units(self, table_name):
+        rows = self._query(
+            f"SELECT unit_key, status FROM {self.table} "
+            "WHERE table_name = ? AND unit_key IS NOT NULL AND status IN ('done', 'failed')",
+            (table_name,),
+        )
+        return {key: status for key, status in rows}
+
+    def import_finished(self, table_name, synced, failed):
+        rows = [("done", table_name, key) for key in synced] + [("failed", table_name, key) for key in failed]
+        self._executemany(
+            f"UPDATE {self.table} SET status = ? WHERE table_name = ? AND unit_key = ? AND status = 'pending'",
+            rows,
+        )
+
+    def renew_leases(self):
+        return self._execute(
+            f"UPDATE {self.table} SET lease_expires = DATEADD(second, ?, SYSUTCDATETIME()) "
+            "WHERE run_id = ? AND status = 'running'",
+            (int(self.lease_seconds), self.run_id),
+        )
+
+    def close(self):
+        super().close()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_STORES: Dict[Tuple[str, str], CheckpointStore] = {}
+_STORES_LOCK = threading.Lock()
+_RUN_ID = new_run_id()
+
+
+def get_checkpoint_store(
+    backend: str,
+    output_dir: Path,
+    connect: Optional[Callable[[], object]] = None,
+    lease_seconds: float = 600.0,
+) -> CheckpointStore:
+    """Process-wide store per backend/location; all stores of one process share its run ID."""
+    if backend not in CHECKPOINT_BACKENDS:
+        raise ValueError(f"Unknown checkpoint store {backend!r}; expected one of {', '.join(CHECKPOINT_BACKENDS)}")
+    location = str(Path(output_dir).resolve()) if backend == "sqlite" else "target"
+    with _STORES_LOCK:
+        store = _STORES.get((backend, location))
+        if store is None:
+            if backend == "sqlite":
+                store = SqliteCheckpointStore(Path(output_dir) / SQLITE_FILENAME, _RUN_ID, lease_seconds)
+            else:
+                if connect is None:
+                    raise ValueError("the db checkpoint store needs a target connection factory")
+                store = DbCheckpointStore(connect, _RUN_ID, lease_seconds)
+            store.start_heartbeat()
+            _STORES[(backend, location)] = store
+            print(f"[INFO] Using {store.describe()}")
+        return store
+
+
+def close_checkpoint_stores() -> None:
+    with _STORES_LOCK:
+        stores = list(_STORES.values())
+        _STORES.clear()
+    for store in stores:
+        store.close()
+
+
+atexit.register(close_checkpoint_stores)
@@ -0,0 +1,168 @@
+"""
+Adaptive fetch/commit sizing for the streaming loaders.
+
+A fixed --chunk-size and --commit-interval fit either narrow or wide tables,
+never both: APP_4_EXTENDEDSALESITEM (6 columns) and APP_4_SALESITEM (197
+columns) differ by more than 10x in bytes per row. AdaptiveBatchController
+starts from the CLI values and re-sizes after every inserted chunk. It uses:
+
+- measured insert rows/sec: a chunk should take about ``target_chunk_seconds``
+  to write, and commits should land about every ``target_commit_seconds``;
+- measured Arrow bytes per row: a chunk never exceeds ``max_chunk_bytes``;
+- process RSS: above ``rss_soft_limit_mb``, chunks shrink regardless of speed,
+  because every worker buffers ``2 * queue_depth + 1`` chunks.
+
+Each worker owns one controller. The reader thread reads ``chunk_rows`` before
+every fetch, and the writer reads ``commit_interval``. Decisions are logged with
+an [ADAPT] prefix, and summary() gives the final sizes for the [TIMING] line.
+for_table() starts later units of the same table from the sizes the last
+finished unit settled on (remember()), instead of from the CLI values.
+"""
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional, Tuple
+
+import psutil
+
+
+# table -> (chunk_rows, commit_interval) settled on by the last finished unit
+_LEARNED_SIZES: Dict[str, Tuple[int, int]] = {}
+
+
+@dataclass
+class BatchTuningConfig:
+    min_chunk_rows: int = 1000
+    max_chunk_rows: int = 200000
+    max_commit_rows: int = 1000000
+    target_chunk_seconds: float = 2.0
+    target_commit_seconds: float = 20.0
+    max_chunk_bytes: int = 64 * 1024 * 1024
+    rss_soft_limit_mb: Optional[int] = None  # None: half of the memory available at start
+    grow_ratio: float = 1.5
+    shrink_ratio: float = 0.6
+    window: int = 5
+    # Changes smaller than this fraction are not applied (avoids log noise and churn)
+    min_change: float = 0.1
+
+
+class AdaptiveBatchController:
+    """Re-sizes fetch chunks and commit intervals from measured throughput and memory."""
+
+    def __init__(
+        self,
+        label: str,
+        initial_chunk_rows: int,
+        initial_commit_interval: int,
+        config: Optional[BatchTuningConfig] = None,
+    ) -> None:
+        self.label = label
+        self.table_name: Optional[str] = None
+        self.config = config or BatchTuningConfig()
+        self.chunk_rows = self._clamp_chunk(initial_chunk_rows)
+        self.commit_interval = max(self.chunk_rows, initial_commit_interval)
+        self.rss_limit_bytes = (
+            self.config.rss_soft_limit_mb * 1024 * 1024
+            if self.config.rss_soft_limit_mb
+            else psutil.virtual_memory().available // 2
+        )
+        self._process = psutil.Process()
+        self._lock = threading.Lock()
+        self._rates: Deque[float] = deque(maxlen=self.config.window)
+        self._row_bytes: Deque[float] = deque(maxlen=self.config.window)
+        self.adjustments = 0
+        self.peak_rss = 0
+
+    @classmethod
+    def for_table(
+        cls,
+        table_name: str,
+        label: str,
+        initial_chunk_rows: int,
+        initial_commit_interval: int,
+        config: Optional[BatchTuningConfig] = None,
+    ) -> "AdaptiveBatchController":
+        chunk_rows, commit_interval = _LEARNED_SIZES.get(table_name, (initial_chunk_rows, initial_commit_interval))
+        controller = cls(label, chunk_rows, commit_interval, config)
+        controller.table_name = table_name
+        return controller
+
+    def remember(self) -> None:
+        """Seed later units of the same table with the current sizes."""
+        if self.table_name:
+            _LEARNED_SIZES[self.table_name] = (self.chunk_rows, self.commit_interval)
+
+    def _clamp_chunk(self, rows: float) -> int:
+        return int(max(self.config.min_chunk_rows, min(self.config.max_chunk_rows, rows)))
+
+    @property
+    def rows_per_second(self) -> Optional[float]:
+        with self._lock:
+            return sum(self._rates) / len(self._rates) if self._rates else None
+
+    @property
+    def bytes_per_row(self) -> Optional[float]:
+        with self._lock:
+            return sum(self._row_bytes) / len(self._row_bytes) if self._row_bytes else None
+
+    def observe_batch(self, rows: int, nbytes: int) -> None:
+        """Record the in-memory size of a fetched batch (called by the transform stage)."""
+        if rows:
+            with self._lock:
+                self._row_bytes.append(nbytes / rows)
+
+    def record_insert(self, rows: int, seconds: float) -> None:
+        """Record one written chunk and re-size chunk_rows / commit_interval."""
+        if rows <= 0 or seconds <= 0:
+            return
+        with self._lock:
+            self._rates.append(rows / seconds)
+        rate = self.rows_per_second
+        row_bytes = self.bytes_per_row
+        rss = self._process.memory_info().rss
+        self.peak_rss = max(self.peak_rss, rss)
+
+        memory_pressure = rss > self.rss_limit_bytes
+        if memory_pressure:
+            desired = self.chunk_rows * self.config.shrink_ratio
+            reason = f"RSS {rss / 1048576:,.0f}MB over soft limit {self.rss_limit_bytes / 1048576:,.0f}MB"
+        else:
+            desired = rate * self.config.target_chunk_seconds
+            reason = f"{rate:,.0f} rows/s"
+            if row_bytes:
+                desired = min(desired, self.config.max_chunk_bytes / row_bytes)
+                reason += f", {row_bytes:,.0f} B/row"
+            # Bounded steps: one slow chunk (lock wait, log growth) must not collapse the size
+            desired = max(self.chunk_rows * self.config.shrink_ratio, min(self.chunk_rows * self.config.grow_ratio, desired))
+        new_chunk = self._clamp_chunk(desired)
+
+        commit_rows = rate * self.config.target_commit_seconds
+        # Whole chunks per commit, at least one
+        new_commit = int(max(1, round(commit_rows / new_chunk)) * new_chunk)
+        new_commit = min(max(new_chunk, new_commit), max(new_chunk, self.config.max_commit_rows))
+        if memory_pressure:
+            new_commit = max(new_chunk, min(new_commit, self.commit_interval))
+
+        changed_chunk = abs(new_chunk - self.chunk_rows) >= self.chunk_rows * self.config.min_change
+        changed_commit = abs(new_commit - self.commit_interval) >= self.commit_interval * self.config.min_change
+        if not (changed_chunk or changed_commit):
+            return
+        changes = []
+        if changed_chunk:
+            changes.append(f"chunk {self.chunk_rows:,} -> {new_chunk:,}")
+        if changed_commit:
+            changes.append(f"commit {self.commit_interval:,} -> {new_commit:,}")
+        print(f"[ADAPT] {self.label}: {reason}: {', '.join(changes)}")
+        if changed_chunk:
+            self.chunk_rows = new_chunk
+        if changed_commit:
+            self.commit_interval = new_commit
+        self.adjustments += 1
+
+    def summary(self) -> str:
+        rate = self.rows_per_second
+        return (
+            f"chunk {self.chunk_rows:,} / commit {self.commit_interval:,} "
+            f"({self.adjustments} adjustment(s), {rate or 0:,.0f} rows/s, peak RSS {self.peak_rss / 1048576:,.0f}MB)"
+        )
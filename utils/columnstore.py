@@ -0,0 +1,104 @@
+"""
+Clustered columnstore helpers for the large sales replica tables.
+
+Bulk loads of at least 102,400 rows go straight into compressed rowgroups.
+Smaller loads land in the delta store and wait for the tuple mover. Only bulk
+paths count as bulk loads here: bcp, and INSERT ... SELECT (the tvp loader).
+Plain parameterized inserts (executemany) always go through the delta store.
+
+The loaders use is_columnstore_table() to decide whether chunks must be
+buffered up to COLUMNSTORE_MIN_BATCH_ROWS before they are written.
+report_rowgroup_quality() summarizes sys.dm_db_column_store_row_group_physical_stats
+after a load: open/compressed rowgroups, average compressed size, trim reasons and
+deleted rows. A month reload (DELETE + INSERT) leaves deleted rows behind until the
+next REORGANIZE.
+"""
+
+from typing import Dict, List, Optional
+
+# Tables generate_migration_from_schema.py --columnstore builds as clustered columnstore
+COLUMNSTORE_TABLES = ("APP_4_SALES", "APP_4_SALESITEM", "APP_4_PAYMENT")
+
+# Smallest bulk load that compresses directly instead of going to the delta store
+COLUMNSTORE_MIN_BATCH_ROWS = 102400
+# Rowgroup ceiling; compressed groups well below it are "trimmed"
+COLUMNSTORE_MAX_ROWGROUP_ROWS = 1048576
+# Deleted-row share above which a REORGANIZE is suggested
+REORGANIZE_DELETED_RATIO = 0.1
+
+
+def is_columnstore_table(cursor, target_table: str) -> bool:
+    """True when the table's base storage is a clustered columnstore index."""
+    cursor.execute(
+        "SELECT 1 FROM sys.indexes WHERE object_id = OBJECT_ID(?) AND type = 5",
+        target_table,
+    )
+    return cursor.fetchone() is not None
+
+
+def fetch_rowgroup_stats(cursor, target_table: str) -> List[Dict]:
+    cursor.execute(
+        """
+        SELECT state_desc, COUNT(*), SUM(total_rows), SUM(deleted_rows), trim_reason_desc
+        FROM sys.dm_db_column_store_row_group_physical_stats
+        WHERE object_id = OBJECT_ID(?)
+        GROUP BY state_desc, trim_reason_desc
+        """,
+        target_table,
+    )
+    return [
+        {
+            "state": state,
+            "rowgroups": int(rowgroups),
+            "rows": int(total_rows or 0),
+            "deleted": int(deleted_rows or 0),
+            "trim_reason": trim_reason,
+        }
+        for state, rowgroups, total_rows, deleted_rows, trim_reason in cursor.fetchall()
+    ]
+
+
+def report_rowgroup_quality(cursor, target_table: str) -> Optional[Dict[str, float]]:
+    """
+    Print a rowgroup quality summary for a columnstore table.
+
+    Returns the summary numbers, or None when the table is not columnstore.
+    """
+    if not is_columnstore_table(cursor, target_table):
+        return None
+    stats = fetch_rowgroup_stats(cursor, target_table)
+    compressed = [s for s in stats if s["state"] == "COMPRESSED"]
+    delta = [s for s in stats if s["state"] in ("OPEN", "CLOSED")]
+    compressed_groups = sum(s["rowgroups"] for s in compressed)
+    compressed_rows = sum(s["rows"] for s in compressed)
+    delta_rows = sum(s["rows"] for s in delta)
+    deleted_rows = sum(s["deleted"] for s in stats)
+    total_rows = compressed_rows + delta_rows
+    summary = {
+        "compressed_rowgroups": compressed_groups,
+        "avg_compressed_rows": compressed_rows / compressed_groups if compressed_groups else 0.0,
+        "delta_rowgroups": sum(s["rowgroups"] for s in delta),
+        "delta_rows": delta_rows,
+        "deleted_rows": deleted_rows,
+        "deleted_ratio": deleted_rows / total_rows if total_rows else 0.0,
+    }
+
+    print(
+        f"[ROWGROUP] {target_table}: {compressed_groups:,} compressed rowgroup(s), "
+        f"avg {summary['avg_compressed_rows']:,.0f} rows "
+        f"({summary['avg_compressed_rows'] / COLUMNSTORE_MAX_ROWGROUP_ROWS:.0%} of max) | "
+        f"delta store {summary['delta_rowgroups']:,} rowgroup(s) / {delta_rows:,} rows | "
+        f"deleted {deleted_rows:,} ({summary['deleted_ratio']:.1%})"
+    )
+    trims: Dict[str, int] = {}
+    for s in compressed:
+        if s["trim_reason"] and s["trim_reason"] != "NO_TRIM":
+            trims[s["trim_reason"]] = trims.get(s["trim_reason"], 0) + s["rowgroups"]
+    if trims:
+        print(f"[ROWGROUP] {target_table}: trimmed rowgroups by reason: {trims}")
+    if summary["deleted_ratio"] > REORGANIZE_DELETED_RATIO or summary["delta_rowgroups"]:
+        print(
+            f"[ROWGROUP] {target_table}: consider ALTER INDEX ALL ON {target_table} "
+            "REORGANIZE WITH (COMPRESS_ALL_ROW_GROUPS = ON)"
+        )
+    return summary
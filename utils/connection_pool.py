@@ -0,0 +1,302 @@
+"""
+Thread-safe pool of raw pyodbc connections.
+
+Opening a connection to Xilnex means a TLS handshake and a login over the VPN
+to Azure. The month workers used to pay that for every month attempt. With a
+pool, get_source_connection() / get_target_connection() hand out a
+PooledConnection. Calling close() on it returns the connection to its pool,
+so existing ``conn.close()`` / ``finally`` code keeps working unchanged.
+
+- Pre-ping: an idle connection is checked with ``SELECT 1`` before it is
+  handed out. If the check fails, the connection is dropped and a new one is
+  opened, so a VPN drop costs one reconnect, not one failed month.
+- Max lifetime: connections older than ``max_lifetime`` seconds are closed
+  instead of reused, so server-side state and routing do not go stale.
+- Size limit: at most ``max_size`` connections per pool, checked out or idle.
+  acquire() blocks until one is released (or ``acquire_timeout`` passes).
+- Released connections are rolled back, and connection attributes set through
+  the PooledConnection (``autocommit``) go back to their values at checkout.
+  Release costs no round trip beyond the rollback; the pre-ping on the next
+  acquire catches a dead connection. #temp tables and SET options are left to
+  the code that creates them: #stage_<table> and #sample_keys are dropped (and
+  dropped-if-exists before creation) by their callers. A connection whose
+  rollback fails is dropped.
+- Nested acquires: a worker must not check out a second connection from a pool
+  while it holds one. With every worker doing that, the pool runs dry and all of
+  them wait out ``acquire_timeout``. Pass the held connection down instead.
+
+The arrow-odbc fetch backend keeps its connections in a pool of its own
+("arrow-odbc", utils/arrow_fetch.py) with ``ping_query=None``: they only run
+SELECTs, and one whose read fails is discarded.
+
+Pools are process-wide and registered by name (get_pool). stats() / report()
+expose acquire-wait metrics, and report_pools() prints one [POOL] line per pool.
+"""
+
+import atexit
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+
+class PoolTimeoutError(RuntimeError):
+    """Raised when no connection became available within the acquire timeout."""
+
+
+class PooledConnection:
+    """A checked-out connection; close() returns it to the pool instead of closing it."""
+
+    def __init__(self, pool: "ConnectionPool", raw, created_at: float):
+        object.__setattr__(self, "_pool", pool)
+        object.__setattr__(self, "_raw", raw)
+        object.__setattr__(self, "_created_at", created_at)
+        object.__setattr__(self, "_released", False)
+        # Original values of attributes set through the proxy, restored on release
+        object.__setattr__(self, "_overrides", {})
+
+    @property
+    def raw(self):
+        if self._released:
+            raise RuntimeError(f"connection already returned to pool {self._pool.name!r}")
+        return self._raw
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+    def __setattr__(self, name, value):
+        raw = self.raw
+        if name not in self._overrides:
+            self._overrides[name] = getattr(raw, name, None)
+        setattr(raw, name, value)
+
+    def close(self) -> None:
+        """Return the connection to the pool (idempotent)."""
+        if not self._released:
+            self._pool.release(self)
+
+    def discard(self) -> None:
+        """Close the underlying connection instead of pooling it (e.g. after a protocol error)."""
+        if not self._released:
+            self._pool.release(self, discard=True)
+
+    # pyodbc semantics: commit on success, roll back on error; then release
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            if exc_type is None:
+                self.raw.commit()
+            else:
+                self.raw.rollback()
+        finally:
+            self.close()
+
+
+class ConnectionPool:
+    """Bounded, health-checked pool for one connection string."""
+
+    def __init__(
+        self,
+        name: str,
+        connect: Callable[[], object],
+        max_size: int = 16,
+        max_lifetime: float = 1800.0,
+        acquire_timeout: Optional[float] = 600.0,
+        ping_query: Optional[str] = "SELECT 1",
+    ):
+        self.name = name
+        self._connect = connect
+        self.max_size = max(1, max_size)
+        self.max_lifetime = max_lifetime
+        self.acquire_timeout = acquire_timeout
+        self.ping_query = ping_query
+        self._idle: List[tuple] = []  # (raw connection, created_at), most recently released last
+        self._open = 0
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self._stats = {
+            "acquires": 0,
+            "reused": 0,
+            "connects": 0,
+            "waits": 0,
+            "blocked_seconds": 0.0,
+            "acquire_seconds": 0.0,
+            "max_acquire_seconds": 0.0,
+            "failed_pings": 0,
+            "expired": 0,
+            "discarded": 0,
+            "peak_in_use": 0,
+        }
+
+    def acquire(self, timeout: Optional[float] = None) -> PooledConnection:
+        """Check out a healthy connection, opening one if the pool is below max_size."""
+        timeout = self.acquire_timeout if timeout is None else timeout
+        start = time.perf_counter()
+        blocked = 0.0
+        while True:
+            candidate = None
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError(f"connection pool {self.name!r} is closed")
+                while not self._idle and self._open >= self.max_size:
+                    remaining = None if timeout is None else timeout - (time.perf_counter() - start)
+                    if remaining is not None and remaining <= 0:
+                        raise PoolTimeoutError(
+                            f"no {self.name} connection available after {timeout:.1f}s ({self.max_size} in use)"
+                        )
+                    wait_start = time.perf_counter()
+                    self._cond.wait(remaining)
+                    blocked += time.perf_counter() - wait_start
+                if self._idle:
+                    candidate = self._idle.pop()
+                else:
+                    self._open += 1  # reserve the slot before connecting outside the lock
+                self._in_use += 1
+
+            # Connect / ping outside the lock: both are network round trips
+            try:
+                if candidate is None:
+                    raw, created_at = self._connect(), time.monotonic()
+                    self._bump("connects")
+                else:
+                    raw, created_at = candidate
+                    if not self._usable(raw, created_at):
+                        self._drop(raw, in_use=True)
+                        continue
+                    self._bump("reused")
+            except BaseException:
+                with self._cond:
+                    self._open -= 1
+                    self._in_use -= 1
+                    self._cond.notify()
+                raise
+
+            # Acquire time includes blocking on the size limit, pings and new logins
+            elapsed = time.perf_counter() - start
+            with self._cond:
+                self._stats["acquires"] += 1
+                self._stats["peak_in_use"] = max(self._stats["peak_in_use"], self._in_use)
+                if blocked:
+                    self._stats["waits"] += 1
+                    self._stats["blocked_seconds"] += blocked
+                self._stats["acquire_seconds"] += elapsed
+                self._stats["max_acquire_seconds"] = max(self._stats["max_acquire_seconds"], elapsed)
+            return PooledConnection(self, raw, created_at)
+
+    def release(self, conn: PooledConnection, discard: bool = False) -> None:
+        raw, created_at = conn._raw, conn._created_at
+        object.__setattr__(conn, "_released", True)
+        expired = self._expired(created_at)
+        if not discard:
+            try:
+                raw.rollback()
+                for name, value in conn._overrides.items():
+                    setattr(raw, name, value)
+            except Exception:  # pylint: disable=broad-except
+                discard = True
+        if discard or expired or self._closed:
+            self._drop(raw, in_use=True, counted="discarded" if discard else "expired" if expired else None)
+            return
+        with self._cond:
+            self._in_use -= 1
+            self._idle.append((raw, created_at))
+            self._cond.notify()
+
+    def _expired(self, created_at: float) -> bool:
+        return bool(self.max_lifetime) and time.monotonic() - created_at > self.max_lifetime
+
+    def _usable(self, raw, created_at: float) -> bool:
+        if self._expired(created_at):
+            self._bump("expired")
+            return False
+        if self.ping_query is None:
+            return True
+        try:
+            cursor = raw.cursor()
+            try:
+                cursor.execute(self.ping_query)
+                cursor.fetchall()
+            finally:
+                cursor.close()
+            return True
+        except Exception:  # pylint: disable=broad-except
+            self._bump("failed_pings")
+            return False
+
+    def _drop(self, raw, in_use: bool, counted: Optional[str] = None) -> None:
+        try:
+            raw.close()
+        except Exception:  # pylint: disable=broad-except
+            pass
+        with self._cond:
+            self._open -= 1
+            if in_use:
+                self._in_use -= 1
+            if counted:
+                self._stats[counted] += 1
+            self._cond.notify()
+
+    def _bump(self, key: str) -> None:
+        with self._cond:
+            self._stats[key] += 1
+
+    def stats(self) -> Dict[str, float]:
+        with self._cond:
+            snapshot = dict(self._stats)
+            snapshot.update(open=self._open, in_use=self._in_use, idle=len(self._idle), max_size=self.max_size)
+        acquires = snapshot["acquires"]
+        snapshot["avg_acquire_seconds"] = snapshot["acquire_seconds"] / acquires if acquires else 0.0
+        return snapshot
+
+    def report(self) -> str:
+        s = self.stats()
+        reuse = s["reused"] / s["acquires"] if s["acquires"] else 0.0
+        return (
+            f"[POOL] {self.name}: {s['acquires']:,} acquire(s), {reuse:.0%} reused, {s['connects']:,} connect(s), "
+            f"peak {s['peak_in_use']}/{s['max_size']} in use | "
+            f"acquire avg {s['avg_acquire_seconds'] * 1000:,.0f}ms, max {s['max_acquire_seconds']:.1f}s | "
+            f"{s['waits']:,} blocked on pool size for {s['blocked_seconds']:.1f}s | "
+            f"{s['failed_pings']} failed ping(s), {s['expired']} expired, {s['discarded']} discarded"
+        )
+
+    def close_all(self) -> None:
+        """Close idle connections and stop pooling; checked-out ones are closed when released."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for raw, _ in idle:
+            self._drop(raw, in_use=False)
+
+
+_POOLS: Dict[str, ConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_pool(name: str, connect: Callable[[], object], **kwargs) -> ConnectionPool:
+    """Return the process-wide pool ``name``, creating it with ``connect`` on first use."""
+    with _POOLS_LOCK:
+        pool = _POOLS.get(name)
+        if pool is None:
+            pool = _POOLS[name] = ConnectionPool(name, connect, **kwargs)
+        return pool
+
+
+def report_pools() -> None:
+    """Print one [POOL] line per pool that handed out at least one connection."""
+    for pool in list(_POOLS.values()):
+        if pool.stats()["acquires"]:
+            print(pool.report())
+
+
+def close_pools() -> None:
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.close_all()
+
+
+atexit.register(close_pools)
@@ -0,0 +1,262 @@
+"""
+Parallel per-day row count reconciliation between source and replica.
+
+Each table is checked with one ``GROUP BY CAST(date AS date)`` query per side
+(partition_planner.fetch_day_counts, so VARCHAR date columns are bucketed the
+same way the range filters compare them). The queries for all tables run
+concurrently: one thread pool per side, each limited to ``max_connections``
+workers and drawing from its own connection pool, so neither server gets more
+than that many counting sessions.
+
+Source counts go through partition_planner.get_day_counts and its per-table
+cache (``<output_dir>/<table>/<table>_day_counts.json``, the one the adaptive
+planner uses). Settled days, at least SETTLE_DAYS old when they were counted,
+are served from the cache, so a re-check only counts the recent days on source.
+Target counts are always queried, because the replica is what is being checked
+and a reload or repair can change any day.
+
+reconcile_daily_counts() returns one TableDayCounts per table, and
+print_diff_report() prints them as a single report. write_report() saves the
+same data as CSV or JSON (table, day, source_count, target_count, diff, status).
+read_mismatched_days() turns such a file back into {table: [day, ...]}, which
+replicate_monthly_parallel_streaming.py --days-from accepts as day-sized units.
+"""
+
+import csv
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from utils.partition_planner import SETTLE_DAYS, fetch_day_counts, get_count_cache_path, get_day_counts
+
+REPORT_FIELDS = ("table", "day", "source_count", "target_count", "diff", "status")
+
+SOURCE_SCHEMA = "COM_5013"
+TARGET_PREFIX = "dbo.com_5013_"
+
+# table name -> (date column, column type as in the schema file)
+TableSpec = Dict[str, Tuple[str, str]]
+
+
+@dataclass
+class TableDayCounts:
+    table_name: str
+    date_column: str
+    source: Dict[str, int] = field(default_factory=dict)
+    target: Dict[str, int] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def days(self) -> List[str]:
+        return sorted(set(self.source) | set(self.target))
+
+    def diff(self, day: str) -> int:
+        """Target minus source; negative means the replica is missing rows."""
+        return self.target.get(day, 0) - self.source.get(day, 0)
+
+    @property
+    def mismatched_days(self) -> List[str]:
+        return [day for day in self.days if self.diff(day) != 0]
+
+    def status(self, day: str) -> str:
+        diff = self.diff(day)
+        return "OK" if diff == 0 else "MISSING" if diff < 0 else "EXTRA"
+
+    @property
+    def source_total(self) -> int:
+        return sum(self.source.values())
+
+    @property
+    def target_total(self) -> int:
+        return sum(self.target.values())
+
+
+def table_specs(table_names: List[str], date_columns: Dict[str, str], schema: Dict) -> TableSpec:
+    """(date column, column type) of each table; the type decides how days are bucketed."""
+    specs: TableSpec = {}
+    for table_name in table_names:
+        date_column = date_columns[table_name]
+        columns = schema.get(table_name, {}).get("columns", [])
+        column_type = next((col.get("type") or "" for col in columns if col["name"] == date_column), "datetime")
+        specs[table_name] = (date_column, column_type.lower())
+    return specs
+
+
+def _parse_day(value: str) -> date:
+    return datetime.fromisoformat(value).date()
+
+
+def reconcile_daily_counts(
+    tables: TableSpec,
+    start_date: str,
+    end_date: str,
+    connect_source: Callable[[], object],
+    connect_target: Callable[[], object],
+    output_dir: Path,
+    max_connections: int = 4,
+    refresh: bool = False,
+    settle_days: int = SETTLE_DAYS,
+) -> List[TableDayCounts]:
+    """
+    Count rows per day of [start_date, end_date) on both sides for every table.
+
+    ``connect_source`` / ``connect_target`` return a connection whose close()
+    releases it (a PooledConnection). A table whose query fails is returned with
+    ``error`` set; the other tables are still checked.
+    """
+    start, end = _parse_day(start_date), _parse_day(end_date)
+    results = {name: TableDayCounts(name, date_column) for name, (date_column, _) in tables.items()}
+
+    def count_source(table_name: str) -> Dict[str, int]:
+        date_column, column_type = tables[table_name]
+        conn = connect_source()
+        try:
+            return get_day_counts(
+                conn,
+                f"{SOURCE_SCHEMA}.{table_name}",
+                date_column,
+                column_type,
+                start.isoformat(),
+                end.isoformat(),
+                get_count_cache_path(table_name, output_dir / table_name.lower()),
+                refresh=refresh,
+                settle_days=settle_days,
+                label="COUNT",
+            )
+        finally:
+            conn.close()
+
+    def count_target(table_name: str) -> Dict[str, int]:
+        date_column, column_type = tables[table_name]
+        conn = connect_target()
+        try:
+            return fetch_day_counts(conn, f"{TARGET_PREFIX}{table_name}", date_column, column_type, start, end)
+        finally:
+            conn.close()
+
+    workers = max(1, min(max_connections, len(tables)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="count-src") as source_pool, ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="count-tgt"
+    ) as target_pool:
+        futures = [
+            (name, side, pool.submit(counter, name))
+            for name in tables
+            for side, pool, counter in (("source", source_pool, count_source), ("target", target_pool, count_target))
+        ]
+        for name, side, future in futures:
+            try:
+                setattr(results[name], side, future.result())
+            except Exception as exc:
+                results[name].error = f"{side}: {exc}"
+
+    return [results[name] for name in tables]
+
+
+def day_range_end(end_date_inclusive: str) -> str:
+    """Half-open end for an inclusive --end-date."""
+    return (_parse_day(end_date_inclusive) + timedelta(days=1)).isoformat()
+
+
+def rollup_by_month(counts: Dict[str, int]) -> Dict[str, int]:
+    """Sum per-day counts into YYYY-MM buckets."""
+    months: Dict[str, int] = {}
+    for day, value in counts.items():
+        months[day[:7]] = months.get(day[:7], 0) + value
+    return months
+
+
+def print_diff_report(results: List[TableDayCounts], show_all_days: bool = False) -> List[str]:
+    """Print the reconciliation report; returns the days mismatched in any table."""
+    header = f"{'Table':<30}{'Days':>6}{'Source':>15}{'Target':>15}{'Diff(T-S)':>12}{'Bad days':>10}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        if result.error:
+            print(f"{result.table_name:<30} ERROR {result.error}")
+            continue
+        print(
+            f"{result.table_name:<30}{len(result.days):>6}{result.source_total:>15,}{result.target_total:>15,}"
+            f"{result.target_total - result.source_total:>12,}{len(result.mismatched_days):>10}"
+        )
+
+    all_mismatches = set()
+    for result in results:
+        if result.error:
+            continue
+        days = result.days if show_all_days else result.mismatched_days
+        if not days:
+            continue
+        print()
+        print(f"{result.table_name} ({result.date_column})")
+        print(f"  {'Date':<12}{'Source':>12}{'Target':>12}{'Diff(T-S)':>12}{'Status':>10}")
+        for day in days:
+            print(
+                f"  {day:<12}{result.source.get(day, 0):>12,}{result.target.get(day, 0):>12,}"
+                f"{result.diff(day):>12,}{result.status(day):>10}"
+            )
+        all_mismatches.update(result.mismatched_days)
+
+    print()
+    failed = [result.table_name for result in results if result.error]
+    if failed:
+        print(f"Tables not checked: {', '.join(failed)}")
+    if all_mismatches:
+        print("Mismatched dates (any table):")
+        print(", ".join(sorted(all_mismatches)))
+    else:
+        print("Mismatched dates (any table): None")
+    return sorted(all_mismatches)
+
+
+def report_rows(results: Iterable[TableDayCounts], all_days: bool = False) -> List[Dict]:
+    """One dict per (table, day) with REPORT_FIELDS; mismatched days only unless ``all_days``."""
+    rows = []
+    for result in results:
+        if result.error:
+            row = dict.fromkeys(REPORT_FIELDS)
+            row.update(table=result.table_name, status=f"ERROR {result.error}")
+            rows.append(row)
+            continue
+        for day in result.days if all_days else result.mismatched_days:
+            rows.append(
+                {
+                    "table": result.table_name,
+                    "day": day,
+                    "source_count": result.source.get(day, 0),
+                    "target_count": result.target.get(day, 0),
+                    "diff": result.diff(day),
+                    "status": result.status(day),
+                }
+            )
+    return rows
+
+
+def write_report(results: List[TableDayCounts], path: Path, all_days: bool = False) -> int:
+    """Write report_rows() as CSV, or JSON when ``path`` ends in .json; returns the row count."""
+    rows = report_rows(results, all_days=all_days)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix.lower() == ".json":
+        path.write_text(json.dumps(rows, indent=2), encoding="utf-8")
+    else:
+        with path.open("w", newline="", encoding="utf-8") as handle:
+            writer = csv.DictWriter(handle, fieldnames=REPORT_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+    return len(rows)
+
+
+def read_mismatched_days(path: Path) -> Dict[str, List[str]]:
+    """{table: sorted days} of the MISSING/EXTRA rows in a write_report() file."""
+    if path.suffix.lower() == ".json":
+        rows = json.loads(path.read_text(encoding="utf-8"))
+    else:
+        with path.open(newline="", encoding="utf-8") as handle:
+            rows = list(csv.DictReader(handle))
+    days: Dict[str, set] = {}
+    for row in rows:
+        if row.get("status") in ("MISSING", "EXTRA") and row.get("day"):
+            days.setdefault(row["table"], set()).add(row["day"])
+    return {table: sorted(table_days) for table, table_days in days.items()}
@@ -0,0 +1,127 @@
+"""
+Per-row hash comparison between source and replica for a date range.
+
+Both sides compute HASHBYTES('SHA2_256', ...) over the same normalized text
+form of every column. Source and target column types differ: DECIMAL(p,s)
+becomes DECIMAL(38,20), TIMESTAMP becomes VARBINARY(8), and the loader
+round-trips through float. The normalization removes those differences, so
+equal values hash the same:
+
+- decimals are cast back to DECIMAL(38, source scale) and rounded to 15
+  significant digits: the replica's copy went through float64, which keeps no
+  more than that, so a longer value would never hash equal and would be
+  re-MERGEd on every run. Two values that differ only past the 15th digit
+  therefore compare equal. A value within float64 error of a rounding
+  boundary can still round apart on the two sides; such a row shows up as
+  updated, and the MERGE rewrites it with the same value.
+- dates and datetimes use fixed CONVERT styles
+- binary values are rendered as 0x hex
+- NULL gets a marker, so it never collides with an empty string
+
+Only (key, hash) pairs cross the network. diff_row_hashes() then splits the
+keys into inserted / updated / deleted.
+"""
+
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+HASH_ALGORITHM = "SHA2_256"
+# CONCAT_WS accepts at most 254 arguments; wide tables are hashed in nested groups
+_CONCAT_GROUP_SIZE = 200
+_NULL_MARKER = "CHAR(0)"
+# Significant decimal digits float64 preserves (DBL_DIG)
+FLOAT_SIGNIFICANT_DIGITS = 15
+
+
+def normalized_column_expression(col: dict) -> str:
+    """Text form of one column that is identical on source and replica for equal values."""
+    name = col["name"]
+    col_type = (col.get("type") or "").lower()
+    if col_type in ("decimal", "numeric", "money", "smallmoney"):
+        scale = col.get("numeric_scale") or 0
+        value = f"CAST({name} AS DECIMAL(38, {int(scale)}))"
+        # ROUND length keeping FLOAT_SIGNIFICANT_DIGITS digits; a no-op when the scale keeps fewer (0 for zero)
+        length = f"ISNULL(CAST({FLOAT_SIGNIFICANT_DIGITS - 1} - FLOOR(LOG10(ABS(NULLIF({value}, 0)))) AS INT), 0)"
+        expr = f"CONVERT(VARCHAR(50), ROUND({value}, {length}))"
+    elif col_type in ("bigint", "int", "smallint", "tinyint", "bit"):
+        expr = f"CONVERT(VARCHAR(20), {name})"
+    elif col_type in ("float", "real"):
+        expr = f"CONVERT(VARCHAR(30), {name}, 3)"
+    elif col_type == "date":
+        expr = f"CONVERT(CHAR(10), {name}, 23)"
+    elif col_type in ("datetime", "datetime2", "smalldatetime"):
+        expr = f"CONVERT(VARCHAR(27), {name}, 121)"
+    elif col_type in ("timestamp", "binary", "varbinary", "image"):
+        expr = f"CONVERT(VARCHAR(MAX), CAST({name} AS VARBINARY(MAX)), 1)"
+    else:
+        expr = name
+    return f"COALESCE({expr}, {_NULL_MARKER})"
+
+
+def row_hash_expression(schema_entry: dict, exclude: Optional[Set[str]] = None) -> str:
+    """HASHBYTES expression over every schema column (in ordinal order) except `exclude`."""
+    exclude = exclude or set()
+    parts = [
+        normalized_column_expression(col)
+        for col in sorted(schema_entry["columns"], key=lambda c: c.get("ordinal_position", 0))
+        if col["name"] not in exclude
+    ]
+    groups = [
+        f"CONCAT_WS('|', {', '.join(parts[i:i + _CONCAT_GROUP_SIZE])})"
+        for i in range(0, len(parts), _CONCAT_GROUP_SIZE)
+    ]
+    payload = groups[0] if len(groups) == 1 else f"CONCAT_WS('|', {', '.join(groups)})"
+    return f"HASHBYTES('{HASH_ALGORITHM}', {payload})"
+
+
+def fetch_row_hashes(
+    conn,
+    table_ref: str,
+    key_column: str,
+    hash_expression: str,
+    date_column: str,
+    start_date: str,
+    end_date: str,
+    fetch_size: int = 50000,
+    extra_filter: str = "",
+    extra_params: Sequence = (),
+) -> Dict[object, bytes]:
+    """
+    Return {key: row hash} for rows with start_date <= date_column < end_date
+    (and ``extra_filter``, an AND-ed condition with ``extra_params``).
+    """
+    query = (
+        f"SELECT {key_column}, {hash_expression} FROM {table_ref} "
+        f"WHERE {date_column} >= ? AND {date_column} < ?"
+    )
+    if extra_filter:
+        query += f" AND {extra_filter}"
+    hashes: Dict[object, bytes] = {}
+    cursor = conn.cursor()
+    try:
+        cursor.execute(query, start_date, end_date, *extra_params)
+        while True:
+            rows = cursor.fetchmany(fetch_size)
+            if not rows:
+                break
+            for key, row_hash in rows:
+                hashes[key] = bytes(row_hash) if row_hash is not None else b""
+    finally:
+        cursor.close()
+    return hashes
+
+
+def diff_row_hashes(
+    source: Dict[object, bytes],
+    target: Dict[object, bytes],
+) -> Tuple[List[object], List[object], List[object]]:
+    """
+    Compare two {key: hash} maps.
+
+    Returns:
+        (inserted, updated, deleted) key lists: only on source, on both with a
+        different hash, only on target
+    """
+    inserted = [key for key in source if key not in target]
+    updated = [key for key, row_hash in source.items() if key in target and target[key] != row_hash]
+    deleted = [key for key in target if key not in source]
+    return inserted, updated, deleted
@@ -0,0 +1,192 @@
+"""
+Keyset-ordered extraction with committed watermarks (--keyset-resume).
+
+Without it, a month that fails at 95% is deleted and streamed again from zero.
+With it, the month is read ordered by (date filter column, ID). Whenever rows
+are committed, the key of the last committed row is written to the unit's row
+in dbo.etl_replica_progress, the (table_name, unit_key) row the checkpoint
+store keeps (migration 116), using the columns migration 111 added:
+
+- checkpoint_data: JSON {"range_start", "range_end", "key_date", "key_id",
+  "state"}; state is "running" while the range is being loaded;
+- rows_processed: rows committed up to the key;
+- last_chunk_id: number of commits recorded for the current load.
+
+The status column stays the checkpoint store's. With the sqlite checkpoint
+store the unit has no progress row yet; the first save inserts it as pending.
+
+The watermark is saved
+- for same-session loaders (executemany, tvp): in the same transaction as the
+  rows, so the watermark never runs ahead of the data;
+- for bcp (its own session, commits every chunk): right after each chunk.
+
+A retry, or a later run with --resume, deletes whatever the range holds beyond
+the watermark. That can be a bcp chunk committed just before the failure. It
+then continues reading after the watermark instead of deleting the range.
+
+The key is read as text (CONVERT(..., 121)) next to the data columns, so its
+exact source value survives whatever Arrow type the date column was fetched as
+(datetime's 1/300 s ticks do not round-trip through a Python datetime). ORDER BY
+and the continuation predicate use the native column, and the text key is cast
+back to the column's declared type, so a (date, ID) index serves the seek.
+A watermark only applies to the range it was saved for: a unit re-planned with
+different bounds starts over.
+"""
+
+import json
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Upsert/identity column every keyset-ordered table must have
+KEYSET_ID_COLUMN = "ID"
+# Extra result column carrying the date key in its exact text form
+KEYSET_DATE_COLUMN = "__keyset_date"
+
+PROGRESS_TABLE = "dbo.etl_replica_progress"
+
+# (date key as text, ID)
+Key = Tuple[str, int]
+
+
+def supports_keyset(schema_entry: dict, date_column: Optional[str]) -> bool:
+    names = {col["name"] for col in schema_entry["columns"]}
+    return bool(date_column) and date_column in names and KEYSET_ID_COLUMN in names
+
+
+def date_key_type(schema_entry: dict, date_column: str) -> str:
+    """SQL type the text date key is cast back to (the column's declared type)."""
+    column = next(col for col in schema_entry["columns"] if col["name"] == date_column)
+    declared = column["type"].lower()
+    if declared == "datetime2":
+        return "DATETIME2(7)"
+    if declared in ("char", "varchar", "nchar", "nvarchar"):
+        # Same type as the column: an NVARCHAR parameter would convert a VARCHAR column and lose the seek
+        length = column.get("char_len")
+        return f"{declared.upper()}({'MAX' if length in (None, -1) else length})"
+    return declared.upper()
+
+
+def _after_key_sql(date_column: str, date_type: str) -> str:
+    key = f"CAST(? AS {date_type})"
+    return f"({date_column} > {key} OR ({date_column} = {key} AND {KEYSET_ID_COLUMN} > ?))"
+
+
+def build_keyset_statement(
+    source_table: str,
+    columns: Sequence[str],
+    date_column: str,
+    start: str,
+    end: str,
+    after: Optional[Key] = None,
+    date_type: str = "DATETIME",
+) -> Tuple[str, List]:
+    """SELECT for [start, end) ordered by (date, ID), optionally continuing after a key."""
+    where_sql = f"{date_column} >= ? AND {date_column} < ?"
+    params: List = [start, end]
+    if after is not None:
+        where_sql += f" AND {_after_key_sql(date_column, date_type)}"
+        params.extend([after[0], after[0], after[1]])
+    query = (
+        f"SELECT {', '.join(columns)}, CONVERT(VARCHAR(33), {date_column}, 121) AS {KEYSET_DATE_COLUMN} "
+        f"FROM {source_table} WHERE {where_sql} ORDER BY {date_column}, {KEYSET_ID_COLUMN}"
+    )
+    return query, params
+
+
+def last_key(batch) -> Optional[Key]:
+    """Key of the last row of a keyset-ordered Arrow batch."""
+    if batch.num_rows == 0:
+        return None
+    date_value = batch.column(batch.schema.get_field_index(KEYSET_DATE_COLUMN))[-1].as_py()
+    id_value = batch.column(batch.schema.get_field_index(KEYSET_ID_COLUMN))[-1].as_py()
+    return str(date_value), int(id_value)
+
+
+def delete_after_key(
+    cursor,
+    target_table: str,
+    date_column: str,
+    start: str,
+    end: str,
+    key: Key,
+    date_type: str = "DATETIME",
+) -> int:
+    """Delete rows of [start, end) beyond the watermark (loaded but not covered by it); not committed."""
+    cursor.execute(
+        f"DELETE FROM {target_table} WHERE {date_column} >= ? AND {date_column} < ? "
+        f"AND {_after_key_sql(date_column, date_type)}; SELECT @@ROWCOUNT",
+        start,
+        end,
+        key[0],
+        key[0],
+        key[1],
+    )
+    # Skip the DELETE's row count result (present unless NOCOUNT is on)
+    while cursor.description is None and cursor.nextset():
+        pass
+    return cursor.fetchone()[0]
+
+
+def load_watermark(cursor, table_name: str, unit_key: str, start: str, end: str) -> Optional[Dict]:
+    """Committed watermark of the unit's unfinished [start, end) load: {"key": (date, id), "rows": n}, or None."""
+    cursor.execute(
+        f"SELECT checkpoint_data, rows_processed FROM {PROGRESS_TABLE} WHERE table_name = ? AND unit_key = ?",
+        table_name,
+        unit_key,
+    )
+    row = cursor.fetchone()
+    if row is None or not row[0]:
+        return None
+    data = json.loads(row[0])
+    if (
+        data.get("state") != "running"
+        or (data.get("range_start"), data.get("range_end")) != (start, end)
+        or data.get("key_date") is None
+        or data.get("key_id") is None
+    ):
+        return None
+    return {"key": (data["key_date"], int(data["key_id"])), "rows": int(row[1] or 0)}
+
+
+def save_watermark(
+    cursor,
+    table_name: str,
+    unit_key: str,
+    start: str,
+    end: str,
+    key: Optional[Key],
+    rows_processed: int,
+    state: str = "running",
+) -> None:
+    """
+    Write the unit's watermark to its progress row (inserted as pending if missing); the caller commits.
+
+    state="pending" clears the watermark before a full reload, "done" marks the load finished.
+    """
+    key_date, key_id = key if key else (None, None)
+    checkpoint_data = json.dumps(
+        {"range_start": start, "range_end": end, "key_date": key_date, "key_id": key_id, "state": state}
+    )
+    # last_chunk_id counts the commits of this load; clearing the watermark restarts it
+    chunk_sql = "ISNULL(last_chunk_id, 0) + 1" if state != "pending" else "NULL"
+    cursor.execute(
+        f"UPDATE {PROGRESS_TABLE} SET checkpoint_data = ?, rows_processed = ?, last_chunk_id = {chunk_sql} "
+        "WHERE table_name = ? AND unit_key = ?; SELECT @@ROWCOUNT",
+        checkpoint_data,
+        rows_processed,
+        table_name,
+        unit_key,
+    )
+    while cursor.description is None and cursor.nextset():
+        pass
+    if cursor.fetchone()[0]:
+        return
+    cursor.execute(
+        f"INSERT INTO {PROGRESS_TABLE} "
+        "(table_name, unit_key, job_date, status, checkpoint_data, rows_processed, last_chunk_id) "
+        f"VALUES (?, ?, CAST(? AS DATE), 'pending', ?, ?, {'NULL' if state == 'pending' else '1'})",
+        table_name,
+        unit_key,
+        start[:10],
+        checkpoint_data,
+        rows_processed,
+    )
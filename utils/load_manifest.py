@@ -0,0 +1,239 @@
+"""
+Load manifest: what each target table range holds, recorded when a load commits.
+
+dbo.etl_replica_load_manifest (migration 117) has one row per target table and
+[range_start, range_end). A full-table load uses the sentinel range
+0001-01-01 .. 9999-12-31, so it covers any date range. Each row stores rows
+loaded, source rows read and an ID checksum (SUM(ID) of the rows read from the
+source, summed from the streamed batches with id_checksum(); the target is never
+scanned for it).
+
+- mark_loading(): the reload clears its range and inserts a "loading" row for
+  it. delete_existing_range() does this before it deletes anything, so a
+  crashed reload never leaves a stale "loaded" row behind.
+- record_load(): replaces the range's row with one "loaded" row after the
+  data is committed.
+
+Clearing a range drops the row for exactly that range and the rows inside it
+(their data is being reloaded). A coarser row reaching past the range (the month
+around a one-day repair or an hour partition) is split into the parts outside it,
+so they stay covered; a split part keeps the status of the row it came from, with
+rows_loaded 0 and no source_rows / id_checksum, as those were only known for the
+whole row.
+- find_covering_load(): a range seek on the primary key, used by
+  table_already_loaded instead of COUNT(*) over the target. A range is covered
+  by one "loaded" row or by contiguous ones (a multi-month range loaded month
+  by month).
+
+Without migration 117 every function here is a no-op (find_covering_load returns None).
+"""
+
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+MANIFEST_TABLE = "dbo.etl_replica_load_manifest"
+FULL_RANGE = ("0001-01-01", "9999-12-31")
+ID_COLUMN = "ID"
+
+_AVAILABLE: Dict[str, bool] = {}
+_AVAILABLE_LOCK = threading.Lock()
+
+
+def manifest_available(cursor) -> bool:
+    """True when migration 117 has been applied (checked once per process)."""
+    with _AVAILABLE_LOCK:
+        if MANIFEST_TABLE not in _AVAILABLE:
+            cursor.execute("SELECT OBJECT_ID(?, 'U')", MANIFEST_TABLE)
+            row = cursor.fetchone()
+            _AVAILABLE[MANIFEST_TABLE] = bool(row and row[0])
+        return _AVAILABLE[MANIFEST_TABLE]
+
+
+def manifest_range(full_table: bool, start_date: Optional[str], end_date: Optional[str]) -> Optional[Tuple[str, str]]:
+    """[start, end) a load covers; a start date without end date means that one day."""
+    if full_table:
+        return FULL_RANGE
+    if not start_date:
+        return None
+    if end_date:
+        return start_date, end_date
+    day = datetime.fromisoformat(start_date).date() if not isinstance(start_date, date) else start_date
+    return start_date, (day + timedelta(days=1)).isoformat()
+
+
+def id_checksum(batch) -> int:
+    """SUM(ID) of an Arrow batch (0 without an ID column), for record_load(checksum=...)."""
+    idx = batch.schema.get_field_index(ID_COLUMN)
+    if idx == -1:
+        return 0
+    return column_checksum(batch.column(idx))
+
+
+def column_checksum(values) -> int:
+    """
+    Exact sum of an integral column, as SQL's SUM(CAST(ID AS DECIMAL(38, 0))) would give.
+
+    Summed as decimal128(38, 0): int64 sums wrap around, and a float64 column (a
+    decimal ID fetched as double) would round. Floats are cast through int64, which
+    fails on a fractional value instead of truncating it.
+    """
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks()
+    if pa.types.is_floating(values.type):
+        values = pc.cast(values, pa.int64())
+    total = pc.sum(pc.cast(values, pa.decimal128(38, 0))).as_py()
+    return int(total or 0)
+
+
+def _clear_range(cursor, target_table: str, start: str, end: str) -> None:
+    """Drop the rows for [start, end) and inside it; split rows reaching past it into the parts outside."""
+    cursor.execute(
+        f"SELECT range_start, range_end, status, loaded_at FROM {MANIFEST_TABLE} "
+        "WHERE target_table = ? AND range_start < ? AND range_end > ?",
+        target_table,
+        end,
+        start,
+    )
+    rows = cursor.fetchall()
+    range_start, range_end = _as_datetime(start), _as_datetime(end)
+    for row_start, row_end, status, loaded_at in rows:
+        cursor.execute(
+            f"DELETE FROM {MANIFEST_TABLE} WHERE target_table = ? AND range_start = ? AND range_end = ?",
+            target_table,
+            row_start,
+            row_end,
+        )
+        parts = []
+        if _as_datetime(row_start) < range_start:
+            parts.append((row_start, start))
+        if _as_datetime(row_end) > range_end:
+            parts.append((end, row_end))
+        for part_start, part_end in parts:
+            cursor.execute(
+                f"INSERT INTO {MANIFEST_TABLE} "
+                "(target_table, range_start, range_end, status, rows_loaded, load_mode, loaded_at) "
+                "VALUES (?, ?, ?, ?, 0, 'split', ?)",
+                target_table,
+                part_start,
+                part_end,
+                status,
+                loaded_at,
+            )
+
+
+def mark_loading(cursor, target_table: str, start: str, end: str) -> None:
+    """Clear the range's manifest rows and mark it "loading"; the caller commits."""
+    if not manifest_available(cursor):
+        return
+    _clear_range(cursor, target_table, start, end)
+    cursor.execute(
+        f"INSERT INTO {MANIFEST_TABLE} (target_table, range_start, range_end, status, rows_loaded) "
+        "VALUES (?, ?, ?, 'loading', 0)",
+        target_table,
+        start,
+        end,
+    )
+
+
+def record_load(
+    cursor,
+    target_table: str,
+    start: str,
+    end: str,
+    rows_loaded: int,
+    source_rows: Optional[int],
+    checksum: Optional[int] = None,
+    load_mode: Optional[str] = None,
+) -> None:
+    """
+    Record a committed load of [start, end); the caller commits.
+
+    ``checksum`` is the SUM(ID) the caller accumulated over the streamed batches
+    (id_checksum); None when the table has no ID column or not every row was summed.
+    """
+    if not manifest_available(cursor):
+        return
+    _clear_range(cursor, target_table, start, end)
+    cursor.execute(
+        f"INSERT INTO {MANIFEST_TABLE} "
+        "(target_table, range_start, range_end, status, rows_loaded, source_rows, id_checksum, load_mode) "
+        "VALUES (?, ?, ?, 'loaded', ?, ?, ?, ?)",
+        target_table,
+        start,
+        end,
+        rows_loaded,
+        source_rows,
+        None if checksum is None else str(checksum),
+        load_mode,
+    )
+
+
+def _as_datetime(value) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time())
+    return datetime.fromisoformat(str(value))
+
+
+def find_covering_load(cursor, target_table: str, start: str, end: str) -> Optional[Dict]:
+    """
+    The "loaded" manifest rows covering [start, end) without gaps, merged into one entry; None if any part is missing.
+
+    rows_loaded / source_rows add up every row involved (rows that reach past the
+    range included); source_rows is None if one of them has none (a split part).
+    """
+    if not manifest_available(cursor):
+        return None
+    cursor.execute(
+        f"SELECT range_start, range_end, rows_loaded, source_rows, loaded_at FROM {MANIFEST_TABLE} "
+        "WHERE target_table = ? AND status = 'loaded' AND range_start < ? AND range_end > ? "
+        "ORDER BY range_start, range_end DESC",
+        target_table,
+        end,
+        start,
+    )
+    rows = cursor.fetchall()
+    covered_to = _as_datetime(start)
+    range_end = _as_datetime(end)
+    used = []
+    for row in rows:
+        if covered_to >= range_end:
+            break
+        if _as_datetime(row[0]) > covered_to:
+            return None  # gap
+        if _as_datetime(row[1]) > covered_to:
+            covered_to = _as_datetime(row[1])
+            used.append(row)
+    if covered_to < range_end or not used:
+        return None
+    return {
+        "range_start": used[0][0],
+        "range_end": used[-1][1],
+        "rows_loaded": sum(int(row[2]) for row in used),
+        "source_rows": None if any(row[3] is None for row in used) else sum(int(row[3]) for row in used),
+        "loaded_at": max(row[4] for row in used),
+        "loads": len(used),
+    }
+
+
+def has_manifest_rows(cursor, target_table: str) -> bool:
+    """Whether any load of the table was tracked (otherwise it predates the manifest)."""
+    if not manifest_available(cursor):
+        return False
+    cursor.execute(f"SELECT TOP 1 1 FROM {MANIFEST_TABLE} WHERE target_table = ?", target_table)
+    return cursor.fetchone() is not None
+
+
+def partition_row_count(cursor, target_table: str) -> int:
+    """Row count from sys.dm_db_partition_stats (metadata, no scan)."""
+    cursor.execute(
+        "SELECT SUM(row_count) FROM sys.dm_db_partition_stats WHERE object_id = OBJECT_ID(?) AND index_id IN (0, 1)",
+        target_table,
+    )
+    row = cursor.fetchone()
+    return int(row[0] or 0) if row else 0
@@ -0,0 +1,412 @@
+"""
+Pluggable target loaders.
+
+Every insert path converts a chunk to row tuples (utils/row_converter.py) and
+hands them to a loader:
+
+- ``executemany``: parameterized INSERT with pyodbc ``fast_executemany`` (the
+  original path).
+- ``bcp``: writes each chunk to a local character-mode file and runs the ``bcp``
+  utility against it. The file is deleted after each chunk, so only one chunk
+  is ever on disk. bcp uses its own session and commits each chunk. It logs in
+  with a trusted connection (-T). SQL logins need the explicit opt-in
+  ``bcp_password_on_command_line`` (BCP_PASSWORD_ON_COMMAND_LINE): bcp takes a
+  password only as -P on its command line, where the process list shows it.
+  With the opt-in, a missing username or password fails when the loader is
+  built, since bcp would wait for a password on the console. Each run is
+  killed after a timeout that grows with the chunk's row count.
+- ``tvp``: sends each chunk as one table-valued parameter,
+  ``INSERT ... SELECT ... FROM ?``. The table type is named after the target
+  table and a hash of its column definition (``dbo.tt_<table>_<hash>``), so a
+  schema change creates a new type instead of dropping one another worker may
+  be using. It is created once per target table, under an applock, on a
+  separate connection (``connect``), never in the caller's transaction.
+  Staging tables (partition switch) use their target's type.
+
+Loaders with ``separate_session = True`` (bcp) cannot see uncommitted work on
+the caller's connection. The caller must commit its DELETE/DDL before the first
+load() call, or bcp blocks on the caller's locks.
+
+``BufferedLoader`` wraps any loader and holds rows back until ``min_rows`` have
+accumulated. Clustered columnstore targets use it, so every bulk load is big
+enough to compress directly (utils/columnstore.py). load() may then write
+nothing. Callers must call flush() before their final commit.
+"""
+
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional, Sequence
+
+LOADERS = ("executemany", "bcp", "tvp")
+
+# Character-mode terminators that never occur in replicated text
+BCP_FIELD_TERMINATOR = "\x1f"
+BCP_ROW_TERMINATOR = "\x1e"
+# bcp reads an empty field as NULL; a lone NUL character is an empty string
+_BCP_EMPTY_STRING = "\x00"
+_BCP_ROWS_COPIED = re.compile(r"(\d+) rows copied")
+# bcp run timeout: a fixed allowance for login plus one second per BCP_TIMEOUT_ROWS_PER_SECOND rows
+BCP_TIMEOUT_BASE_SECONDS = 120
+BCP_TIMEOUT_ROWS_PER_SECOND = 2000
+
+
+class Loader(ABC):
+    """Interface for chunk loaders into one target table."""
+
+    name = "base"
+    separate_session = False
+
+    def __init__(self, connection, target_table: str, columns: Sequence[str], table_lock: bool = False):
+        self.connection = connection
+        self.target_table = target_table
+        self.columns = list(columns)
+        self.column_list = ", ".join(self.columns)
+        self.table_lock = table_lock
+
+    @abstractmethod
+    def load(self, rows: List[tuple]) -> int:
+        """Insert one chunk of row tuples; returns rows written."""
+        raise NotImplementedError
+
+    def flush(self) -> int:
+        """Write any rows held back by load(); returns rows written."""
+        return 0
+
+    def close(self) -> None:
+        pass
+
+
+class ExecutemanyLoader(Loader):
+    """Parameterized INSERT through pyodbc fast_executemany."""
+
+    name = "executemany"
+
+    def __init__(self, connection, target_table, columns, table_lock=False):
+        super().__init__(connection, target_table, columns, table_lock)
+        self.cursor = connection.cursor()
+        self.cursor.fast_executemany = True
+        hint = " WITH (TABLOCK)" if table_lock else ""
+        placeholders = ", ".join(["?"] * len(self.columns))
+        self.insert_sql = f"INSERT INTO {target_table}{hint} ({self.column_list}) VALUES ({placeholders})"
+
+    def load(self, rows):
+        if rows:
+            self.cursor.executemany(self.insert_sql, rows)
+        return len(rows)
+
+    def close(self):
+        self.cursor.close()
+
+
+def _bcp_field(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        if BCP_FIELD_TERMINATOR in value or BCP_ROW_TERMINATOR in value:
+            raise ValueError("value contains a bcp terminator character; use --loader executemany for this table")
+        return value or _BCP_EMPTY_STRING
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, datetime):
+        # Milliseconds: SQL Server DATETIME rounds to its 1/300 s ticks on load
+        return f"{value:%Y-%m-%d %H:%M:%S}.{value.microsecond // 1000:03d}"
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+    if isinstance(value, float):
+        # Positional notation: char -> DECIMAL conversion rejects exponents
+        return format(Decimal(repr(value)), "f")
+    if isinstance(value, Decimal):
+        return format(value, "f")
+    return str(value)
+
+
+def write_bcp_file(rows, data_path: str) -> None:
+    """Write row tuples as a character-mode bcp data file (UTF-8, 0x1F/0x1E terminators)."""
+    with open(data_path, "w", encoding="utf-8", newline="") as data_file:
+        for row in rows:
+            data_file.write(BCP_FIELD_TERMINATOR.join(_bcp_field(value) for value in row))
+            data_file.write(BCP_ROW_TERMINATOR)
+
+
+def _bcp_major_version(bcp_path: str) -> int:
+    try:
+        output = subprocess.run([bcp_path, "-v"], capture_output=True, text=True, timeout=30).stdout
+    except (OSError, subprocess.SubprocessError):
+        return 0
+    match = re.search(r"Version\s+(\d+)", output)
+    return int(match.group(1)) if match else 0
+
+
+class BcpLoader(Loader):
+    """Chunk -> local character-mode file -> bcp ... in."""
+
+    name = "bcp"
+    separate_session = True
+
+    def __init__(self, connection, target_table, columns, table_lock=False, db_config: Optional[Dict] = None, bcp_path: str = "bcp"):
+        super().__init__(connection, target_table, columns, table_lock)
+        if not db_config:
+            raise ValueError("bcp loader requires the target database config")
+        self.bcp_path = bcp_path
+        server = db_config.get("server", "")
+        self.base_command = [
+            bcp_path,
+            target_table,
+            "in",
+            "",  # data file, filled per chunk
+            "-S", server,
+            "-d", db_config["database"],
+            "-c", "-C", "65001",
+            "-t", "0x1F",
+            "-r", "0x1E",
+            "-m", "1",  # fail on the first rejected row instead of skipping up to 10
+        ]
+        if db_config.get("bcp_password_on_command_line"):
+            if not (db_config.get("username") and db_config.get("password")):
+                raise ValueError(
+                    "bcp SQL login needs TARGET_USERNAME and TARGET_PASSWORD; "
+                    "unset BCP_PASSWORD_ON_COMMAND_LINE to log in with -T"
+                )
+            self.base_command += ["-U", db_config["username"], "-P", db_config["password"]]
+        else:
+            self.base_command.append("-T")
+        if table_lock:
+            self.base_command += ["-h", "TABLOCK"]
+        # bcp 18 encrypts by default; mirror build_connection_string's trust rule for local servers
+        lowered = server.lower()
+        trust = "localhost" in lowered or "127.0.0.1" in lowered or "." not in lowered
+        if trust and _bcp_major_version(bcp_path) >= 18:
+            self.base_command.append("-u")
+
+    def load(self, rows):
+        if not rows:
+            return 0
+        handle, data_path = tempfile.mkstemp(prefix="bcp_", suffix=".dat")
+        os.close(handle)
+        try:
+            write_bcp_file(rows, data_path)
+        except Exception:
+            os.remove(data_path)
+            raise
+        return self.load_file(data_path, len(rows))
+
+    def load_file(self, data_path: str, row_count: int) -> int:
+        """bcp an already written data file (write_bcp_file format) and delete it."""
+        try:
+            command = list(self.base_command)
+            command[3] = data_path
+            command += ["-b", str(row_count)]
+            timeout = BCP_TIMEOUT_BASE_SECONDS + row_count // BCP_TIMEOUT_ROWS_PER_SECOND
+            result = subprocess.run(
+                command,
+                stdin=subprocess.DEVNULL,
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+            )
+        except subprocess.TimeoutExpired:
+            raise RuntimeError(
+                f"bcp into {self.target_table} did not finish {row_count:,} rows within {timeout}s"
+            ) from None
+        finally:
+            os.remove(data_path)
+
+        output = f"{result.stdout}\n{result.stderr}"
+        match = _BCP_ROWS_COPIED.search(output)
+        copied = int(match.group(1)) if match else 0
+        if result.returncode != 0 or "Error =" in output or copied != row_count:
+            tail = " ".join(output.split())[-500:]
+            raise RuntimeError(f"bcp into {self.target_table} copied {copied:,} of {row_count:,} rows: {tail}")
+        return copied
+
+
+class TvpLoader(Loader):
+    """Each chunk as one table-valued parameter: INSERT ... SELECT ... FROM @tvp."""
+
+    name = "tvp"
+
+    def __init__(
+        self,
+        connection,
+        target_table,
+        columns,
+        table_lock=False,
+        type_table: Optional[str] = None,
+        connect: Optional[Callable[[], object]] = None,
+    ):
+        super().__init__(connection, target_table, columns, table_lock)
+        self.cursor = connection.cursor()
+        self.type_schema = "dbo"
+        self.type_name = ensure_table_type(
+            self.cursor, type_table or target_table, self.columns, self.type_schema, connect
+        )
+        hint = " WITH (TABLOCK)" if table_lock else ""
+        self.insert_sql = f"INSERT INTO {target_table}{hint} ({self.column_list}) SELECT {self.column_list} FROM ?"
+
+    def load(self, rows):
+        if rows:
+            # pyodbc: a list parameter is a TVP; leading strings name the type and its schema
+            self.cursor.execute(self.insert_sql, [[self.type_name, self.type_schema, *rows]])
+        return len(rows)
+
+    def close(self):
+        self.cursor.close()
+
+
+class BufferedLoader(Loader):
+    """Accumulates chunks until at least ``min_rows`` rows, then writes them in one load() of the wrapped loader."""
+
+    def __init__(self, inner: Loader, min_rows: int):
+        super().__init__(inner.connection, inner.target_table, inner.columns, inner.table_lock)
+        self.inner = inner
+        self.name = inner.name
+        self.separate_session = inner.separate_session
+        self.min_rows = min_rows
+        self._buffer: List[tuple] = []
+
+    def load(self, rows):
+        self._buffer.extend(rows)
+        if len(self._buffer) < self.min_rows:
+            return 0
+        return self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return 0
+        rows, self._buffer = self._buffer, []
+        return self.inner.load(rows)
+
+    def close(self):
+        # Unflushed rows are dropped: close() also runs on the error path
+        self._buffer = []
+        self.inner.close()
+
+
+def _column_type_sql(type_name: str, max_length: int, precision: int, scale: int) -> str:
+    if type_name in ("varchar", "char", "varbinary", "binary"):
+        return f"{type_name}({'MAX' if max_length == -1 else max_length})"
+    if type_name in ("nvarchar", "nchar"):
+        return f"{type_name}({'MAX' if max_length == -1 else max_length // 2})"
+    if type_name in ("decimal", "numeric"):
+        return f"{type_name}({precision}, {scale})"
+    if type_name in ("datetime2", "time", "datetimeoffset"):
+        return f"{type_name}({scale})"
+    return type_name
+
+
+# Table types known to exist in this process: (schema, type name)
+_READY_TYPES = set()
+# Wait up to this long for another worker creating the same type
+TYPE_APPLOCK_TIMEOUT_MS = 60000
+
+
+def ensure_table_type(
+    cursor,
+    target_table: str,
+    columns: Sequence[str],
+    type_schema: str = "dbo",
+    connect: Optional[Callable[[], object]] = None,
+) -> str:
+    """
+    Name of a table type matching the target's columns, created if it does not exist yet.
+
+    ``cursor`` (the caller's) is only read from. Creation runs on a connection
+    from ``connect``, under an exclusive applock on the table, and is committed
+    there. Existing types are never dropped: a changed definition gets a new name.
+    """
+    cursor.execute(
+        """
+        SELECT c.name, t.name, c.max_length, c.precision, c.scale
+        FROM sys.columns c
+        JOIN sys.types t ON t.user_type_id = c.user_type_id
+        WHERE c.object_id = OBJECT_ID(?)
+        """,
+        target_table,
+    )
+    target_columns = {row[0]: _column_type_sql(row[1], row[2], row[3], row[4]) for row in cursor.fetchall()}
+    missing = [col for col in columns if col not in target_columns]
+    if missing:
+        raise ValueError(f"{target_table} has no column(s) {missing}")
+    columns_sql = ", ".join(f"{col} {target_columns[col]} NULL" for col in columns)
+    base_name = target_table.split(".")[-1]
+    type_name = f"tt_{base_name}_{hashlib.sha1(columns_sql.encode('utf-8')).hexdigest()[:8]}"
+    qualified = f"{type_schema}.{type_name}"
+    if (type_schema, type_name) in _READY_TYPES:
+        return type_name
+
+    cursor.execute("SELECT TYPE_ID(?)", qualified)
+    if cursor.fetchone()[0] is None:
+        if connect is None:
+            raise ValueError(f"table type {qualified} does not exist and no connection was given to create it")
+        ddl_conn = connect()
+        try:
+            ddl_conn.autocommit = True
+            ddl = ddl_conn.cursor()
+            ddl.execute(
+                "SET NOCOUNT ON; DECLARE @rc INT; "
+                "EXEC @rc = sp_getapplock @Resource = ?, @LockMode = 'Exclusive', @LockOwner = 'Session', "
+                "@LockTimeout = ?; SELECT @rc",
+                f"tt_{base_name}",
+                TYPE_APPLOCK_TIMEOUT_MS,
+            )
+            if ddl.fetchone()[0] < 0:
+                raise RuntimeError(f"timed out waiting for the applock to create {qualified}")
+            try:
+                ddl.execute("SELECT TYPE_ID(?)", qualified)
+                if ddl.fetchone()[0] is None:
+                    ddl.execute(f"CREATE TYPE {qualified} AS TABLE ({columns_sql})")
+            finally:
+                ddl.execute("EXEC sp_releaseapplock @Resource = ?, @LockOwner = 'Session'", f"tt_{base_name}")
+        finally:
+            ddl_conn.close()
+    _READY_TYPES.add((type_schema, type_name))
+    return type_name
+
+
+def create_loader(
+    name: str,
+    connection,
+    target_table: str,
+    columns: Sequence[str],
+    table_lock: bool = False,
+    db_config: Optional[Dict] = None,
+    bcp_path: str = "bcp",
+    type_table: Optional[str] = None,
+    connect: Optional[Callable[[], object]] = None,
+) -> Loader:
+    """
+    Create a loader.
+
+    Args:
+        name: "executemany", "bcp" or "tvp"
+        connection: target pyodbc connection (executemany/tvp)
+        target_table: e.g. "dbo.com_5013_APP_4_SALES"
+        columns: insert column order, matching the row tuples
+        table_lock: request TABLOCK (minimal logging into heaps/empty tables)
+        db_config: target config dict with server/database/username/password (bcp);
+            bcp logs in with -T unless bcp_password_on_command_line=True opts in to
+            -U/-P (ValueError without a username and password)
+        bcp_path: bcp executable; when it is not found, falls back to executemany
+        type_table: table whose columns define the TVP type (a staging table's target)
+        connect: opens a separate, unpooled target connection for creating the TVP type
+    """
+    if name not in LOADERS:
+        raise ValueError(f"Unknown loader {name!r}; expected one of {', '.join(LOADERS)}")
+    if name == "bcp":
+        if shutil.which(bcp_path) is None:
+            print(f"[WARN] {bcp_path} not found on PATH; falling back to executemany loader", file=sys.stderr)
+        else:
+            return BcpLoader(connection, target_table, columns, table_lock, db_config=db_config, bcp_path=bcp_path)
+    if name == "tvp":
+        return TvpLoader(connection, target_table, columns, table_lock, type_table=type_table, connect=connect)
+    return ExecutemanyLoader(connection, target_table, columns, table_lock)
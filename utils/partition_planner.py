@@ -0,0 +1,349 @@
+"""
+Size-aware partition planner for the monthly streaming replicator.
+
+Calendar months make poor units of work: a busy December month and an empty
+credit-note month each become one unit, and the biggest one decides wall-clock
+time. The planner instead:
+
+1. Counts source rows per day on the table's DATE_FILTER_COLUMNS column with a
+   single grouped query, caching the counts in a JSON file. Settled days (old
+   enough that late-arriving rows are unlikely) are never counted again.
+2. Packs consecutive days into ranges of roughly ``target_rows`` rows. For
+   DATETIME columns, a day that alone exceeds the target is split into hour
+   slices using a second grouped query. DATE and VARCHAR columns are never split
+   below one day.
+3. Skips ranges with no source rows. They are returned separately, so the caller
+   can still clear stale target rows there.
+
+Partitions are ``(key, start, end, estimated_rows)`` tuples, where ``start`` and
+``end`` are half-open bounds in the form build_select_statement() and
+delete_existing_range() already accept. A midnight bound is always written as a
+plain date (``YYYY-MM-DD``) and only hour bounds carry a time
+(``YYYY-MM-DDTHH:MM:SS``), so adjacent units share the exact same boundary string
+and VARCHAR date columns still compare correctly against whole-day bounds.
+"""
+
+import json
+import math
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Smallest auto-sized partition; below this, per-partition overhead (delete, index
+# disable/rebuild, connection setup) outweighs the balancing benefit.
+MIN_PARTITION_ROWS = 50000
+# Auto sizing aims for this many partitions per worker so the tail evens out
+PARTITIONS_PER_WORKER = 3
+# Days whose counts are reused from the cache once they are this many days old
+SETTLE_DAYS = 3
+
+# Only these column types can be split below one day
+_SUB_DAY_TYPES = {"datetime", "datetime2", "smalldatetime"}
+
+Partition = Tuple[str, str, str, int]
+
+
+def _boundary(moment: datetime) -> str:
+    """Format a range bound: plain date at midnight, ISO datetime otherwise."""
+    if moment.time() == datetime.min.time():
+        return moment.date().isoformat()
+    return moment.isoformat()
+
+
+def _parse_boundary(value: str) -> datetime:
+    return datetime.fromisoformat(value)
+
+
+def get_count_cache_path(table_name: str, output_dir: Path) -> Path:
+    """Get path to the per-day row count cache for this table."""
+    return output_dir / f"{table_name.lower()}_day_counts.json"
+
+
+def get_plan_path(table_name: str, output_dir: Path) -> Path:
+    """Get path to the saved partition plan for this table (reused on --resume)."""
+    return output_dir / f"{table_name.lower()}_partition_plan.json"
+
+
+def _load_json(path: Path) -> Dict:
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return {}
+
+
+def _day_range(start: date, end: date) -> List[date]:
+    return [start + timedelta(days=offset) for offset in range((end - start).days)]
+
+
+def _is_settled(day_key: str, counted_at: Optional[str], settle_days: int) -> bool:
+    if not counted_at:
+        return False
+    settled_after = date.fromisoformat(day_key) + timedelta(days=settle_days)
+    return datetime.fromisoformat(counted_at).date() > settled_after
+
+
+def day_expression(date_column: str, column_type: str) -> str:
+    """Day key of a row: CAST to date, or the first 10 characters of a VARCHAR date."""
+    if column_type in ("varchar", "nvarchar", "char", "nchar"):
+        return f"LEFT({date_column}, 10)"
+    return f"CAST({date_column} AS date)"
+
+
+def fetch_day_counts(
+    conn,
+    source_table: str,
+    date_column: str,
+    column_type: str,
+    start_day: date,
+    end_day: date,
+) -> Dict[str, int]:
+    """
+    Count source rows per day in [start_day, end_day) with one grouped query.
+
+    VARCHAR date columns are grouped on their first 10 characters and bucketed
+    with the same string comparison the range filters use.
+    """
+    day_expr = day_expression(date_column, column_type)
+    query = (
+        f"SELECT {day_expr} AS day_key, COUNT_BIG(*) AS row_count FROM {source_table} "
+        f"WHERE {date_column} >= ? AND {date_column} < ? GROUP BY {day_expr}"
+    )
+    days = [day.isoformat() for day in _day_range(start_day, end_day)]
+    counts = {day: 0 for day in days}
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute(query, start_day.isoformat(), end_day.isoformat())
+        for day_key, row_count in cursor.fetchall():
+            if day_key is None:
+                continue
+            key = day_key.isoformat() if isinstance(day_key, (date, datetime)) else str(day_key)
+            idx = bisect_right(days, key) - 1
+            if idx >= 0:
+                counts[days[idx]] += int(row_count)
+    finally:
+        cursor.close()
+    return counts
+
+
+def fetch_hour_counts(conn, source_table: str, date_column: str, day: date) -> Dict[int, int]:
+    """Count source rows per hour for one day (DATETIME columns only)."""
+    query = (
+        f"SELECT DATEPART(hour, {date_column}) AS hour_key, COUNT_BIG(*) AS row_count FROM {source_table} "
+        f"WHERE {date_column} >= ? AND {date_column} < ? GROUP BY DATEPART(hour, {date_column})"
+    )
+    cursor = conn.cursor()
+    try:
+        cursor.execute(query, day.isoformat(), (day + timedelta(days=1)).isoformat())
+        return {int(hour): int(row_count) for hour, row_count in cursor.fetchall() if hour is not None}
+    finally:
+        cursor.close()
+
+
+def get_day_counts(
+    conn,
+    source_table: str,
+    date_column: str,
+    column_type: str,
+    start_date: str,
+    end_date: str,
+    cache_path: Path,
+    refresh: bool = False,
+    settle_days: int = SETTLE_DAYS,
+    label: str = "PLAN",
+) -> Dict[str, int]:
+    """
+    Per-day source row counts for [start_date, end_date), served from the cache
+    where possible. Only the span of unsettled or missing days is re-counted.
+    """
+    start = datetime.fromisoformat(start_date).date()
+    end = datetime.fromisoformat(end_date).date()
+
+    cache = {} if refresh else _load_json(cache_path)
+    if cache.get("date_column") != date_column:
+        cache = {}
+    cached_days: Dict[str, int] = cache.get("days", {})
+    counted_at: Dict[str, str] = cache.get("counted_at", {})
+
+    stale = [
+        day
+        for day in _day_range(start, end)
+        if day.isoformat() not in cached_days
+        or not _is_settled(day.isoformat(), counted_at.get(day.isoformat()), settle_days)
+    ]
+    if stale:
+        now = datetime.now().isoformat(timespec="seconds")
+        fresh = fetch_day_counts(conn, source_table, date_column, column_type, stale[0], stale[-1] + timedelta(days=1))
+        cached_days.update(fresh)
+        counted_at.update({day: now for day in fresh})
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(
+            json.dumps({"date_column": date_column, "days": cached_days, "counted_at": counted_at}, indent=2),
+            encoding="utf-8",
+        )
+        print(f"[{label}] {source_table}: counted {len(fresh)} day(s) on source, {len(_day_range(start, end)) - len(fresh)} from cache")
+
+    return {day.isoformat(): cached_days.get(day.isoformat(), 0) for day in _day_range(start, end)}
+
+
+def auto_target_rows(total_rows: int, max_workers: int) -> int:
+    """Rows per partition that gives every worker a few evenly sized units."""
+    return max(MIN_PARTITION_ROWS, math.ceil(total_rows / max(1, max_workers * PARTITIONS_PER_WORKER)))
+
+
+def pack_partitions(
+    day_counts: Dict[str, int],
+    target_rows: int,
+    hour_counts: Optional[Callable[[date], Dict[int, int]]] = None,
+) -> Tuple[List[Partition], List[Tuple[str, str]]]:
+    """
+    Greedily pack consecutive days (or hour slices) into ~target_rows partitions.
+
+    Args:
+        day_counts: ordered {YYYY-MM-DD: rows} covering the whole range
+        target_rows: desired rows per partition
+        hour_counts: optional day -> {hour: rows} lookup; days above target_rows are
+            split into hour slices when given
+
+    Returns:
+        (partitions, empty_ranges) - empty_ranges are the (start, end) gaps between
+        partitions that hold no source rows
+    """
+    # Units are (start, end, rows) slices in order: whole days, or hours of a heavy day
+    units: List[Tuple[str, str, int]] = []
+    for day_key, rows in day_counts.items():
+        day = date.fromisoformat(day_key)
+        next_day = (day + timedelta(days=1)).isoformat()
+        if hour_counts is not None and rows > target_rows:
+            per_hour = hour_counts(day)
+            for hour in range(24):
+                hour_start = datetime.combine(day, datetime.min.time()) + timedelta(hours=hour)
+                hour_end = hour_start + timedelta(hours=1)
+                units.append((_boundary(hour_start), _boundary(hour_end), per_hour.get(hour, 0)))
+        else:
+            units.append((day_key, next_day, rows))
+
+    partitions: List[Partition] = []
+    current_start: Optional[str] = None
+    current_end: Optional[str] = None
+    current_rows = 0
+    for unit_start, unit_end, rows in units:
+        if rows == 0:
+            continue
+        if current_start is not None and current_rows + rows > target_rows:
+            partitions.append((f"{current_start}_{current_end}", current_start, current_end, current_rows))
+            current_start, current_rows = None, 0
+        if current_start is None:
+            current_start = unit_start
+        current_end = unit_end
+        current_rows += rows
+    if current_start is not None:
+        partitions.append((f"{current_start}_{current_end}", current_start, current_end, current_rows))
+
+    # Gaps are found on parsed bounds, so a zero-length range is never emitted
+    empty_ranges: List[Tuple[str, str]] = []
+    if units:
+        cursor = units[0][0]
+        for _, part_start, part_end, _ in partitions:
+            if _parse_boundary(part_start) > _parse_boundary(cursor):
+                empty_ranges.append((cursor, part_start))
+            cursor = part_end
+        if _parse_boundary(cursor) < _parse_boundary(units[-1][1]):
+            empty_ranges.append((cursor, units[-1][1]))
+    return partitions, empty_ranges
+
+
+def plan_partitions(
+    conn,
+    table_name: str,
+    schema_entry: dict,
+    date_column: str,
+    start_date: str,
+    end_date: str,
+    output_dir: Path,
+    max_workers: int,
+    target_rows: Optional[int] = None,
+    refresh: bool = False,
+) -> Tuple[List[Partition], List[Tuple[str, str]]]:
+    """
+    Build size-balanced partitions for one table.
+
+    Returns:
+        (partitions, empty_ranges) as in pack_partitions()
+    """
+    source_table = f"{schema_entry.get('schema', 'COM_5013')}.{table_name}"
+    column_type = next(
+        ((col.get("type") or "").lower() for col in schema_entry["columns"] if col["name"] == date_column),
+        "",
+    )
+    day_counts = get_day_counts(
+        conn,
+        source_table,
+        date_column,
+        column_type,
+        start_date,
+        end_date,
+        get_count_cache_path(table_name, output_dir),
+        refresh=refresh,
+    )
+    total_rows = sum(day_counts.values())
+    target = target_rows or auto_target_rows(total_rows, max_workers)
+
+    hour_lookup = (
+        (lambda day: fetch_hour_counts(conn, source_table, date_column, day))
+        if column_type in _SUB_DAY_TYPES
+        else None
+    )
+
+    partitions, empty_ranges = pack_partitions(day_counts, target, hour_lookup)
+    print(
+        f"[PLAN] {table_name}: {total_rows:,} rows over {len(day_counts)} day(s) -> "
+        f"{len(partitions)} partition(s) of ~{target:,} rows, {len(empty_ranges)} empty range(s) skipped"
+    )
+    return partitions, empty_ranges
+
+
+def save_plan(
+    path: Path,
+    start_date: str,
+    end_date: str,
+    partitions: List[Partition],
+    empty_ranges: List[Tuple[str, str]],
+) -> None:
+    """Persist a plan so --resume keeps the same partition keys."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps(
+            {
+                "start_date": start_date,
+                "end_date": end_date,
+                "partitions": [list(part) for part in partitions],
+                "empty_ranges": [list(gap) for gap in empty_ranges],
+                "planned_at": datetime.now().isoformat(),
+            },
+            indent=2,
+        ),
+        encoding="utf-8",
+    )
+
+
+def load_plan(
+    path: Path,
+    start_date: str,
+    end_date: str,
+) -> Optional[Tuple[List[Partition], List[Tuple[str, str]]]]:
+    """Load a saved plan if it was built for the same date range."""
+    plan = _load_json(path)
+    if plan.get("start_date") != start_date or plan.get("end_date") != end_date:
+        return None
+    partitions = [tuple(part) for part in plan.get("partitions", [])]
+    # Plans saved before bounds were canonical can hold zero-length gaps; drop them
+    empty_ranges = [
+        tuple(gap)
+        for gap in plan.get("empty_ranges", [])
+        if _parse_boundary(gap[0]) < _parse_boundary(gap[1])
+    ]
+    return partitions, empty_ranges
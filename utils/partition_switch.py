@@ -0,0 +1,229 @@
+"""
+Partition-switch loads for date-partitioned replica tables.
+
+Instead of a range DELETE followed by inserts into the shared table, a worker:
+
+1. creates a private staging heap on the filegroup of the target partition, with
+   the same columns and a CHECK constraint on the range;
+2. bulk-loads its rows there (WITH (TABLOCK) only locks the staging table);
+3. rebuilds the target's indexes on the staging table;
+4. in one transaction, truncates the target partition and switches the staging
+   table in (metadata-only operations).
+
+get_switch_plan() only returns a plan when the range is exactly one partition of
+a RANGE RIGHT partition function on the date column, and every index is aligned
+(on the table's partition scheme; SWITCH fails otherwise) and can be cloned.
+Otherwise it returns a reason, and the caller falls back to DELETE + INSERT.
+"""
+
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+# Index types the staging table can mirror (0 heap, 1 clustered, 2 nonclustered rowstore)
+_CLONABLE_INDEX_TYPES = {0, 1, 2}
+
+
+class SwitchPlan:
+    """Where one [start, end) range lives in a partitioned target table."""
+
+    def __init__(
+        self,
+        target_table: str,
+        staging_table: str,
+        partition_number: int,
+        filegroup: str,
+        partition_column: str,
+        start: str,
+        end: str,
+        indexes: List[Dict],
+    ):
+        self.target_table = target_table
+        self.staging_table = staging_table
+        self.partition_number = partition_number
+        self.filegroup = filegroup
+        self.partition_column = partition_column
+        self.start = start
+        self.end = end
+        self.indexes = indexes
+
+
+def _as_datetime(value) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time())
+    try:
+        return datetime.fromisoformat(str(value).strip())
+    except ValueError:
+        return None
+
+
+def _load_indexes(cursor, target_table: str, scheme_id: int) -> Tuple[List[Dict], Optional[str]]:
+    cursor.execute(
+        """
+        SELECT i.index_id, i.name, i.type, i.is_unique, i.has_filter, i.is_disabled, i.data_space_id,
+               c.name, ic.key_ordinal, ic.is_descending_key, ic.is_included_column
+        FROM sys.indexes i
+        LEFT JOIN sys.index_columns ic ON ic.object_id = i.object_id AND ic.index_id = i.index_id
+        LEFT JOIN sys.columns c ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+        WHERE i.object_id = OBJECT_ID(?) AND i.is_hypothetical = 0
+        ORDER BY i.index_id, ic.key_ordinal, ic.index_column_id
+        """,
+        target_table,
+    )
+    indexes: Dict[int, Dict] = {}
+    for (
+        index_id, name, index_type, is_unique, has_filter, is_disabled, data_space_id, col, key_ordinal, desc, included
+    ) in cursor.fetchall():
+        if data_space_id != scheme_id:
+            return [], f"index {name or '(heap)'} is not aligned to the table's partition scheme"
+        if index_type not in _CLONABLE_INDEX_TYPES:
+            return [], f"index {name} has unsupported type {index_type} (columnstore/XML/spatial)"
+        if has_filter:
+            return [], f"filtered index {name} cannot be mirrored"
+        if is_disabled:
+            return [], f"index {name} is disabled"
+        if index_type == 0:
+            continue
+        entry = indexes.setdefault(
+            index_id,
+            {"name": name, "clustered": index_type == 1, "unique": bool(is_unique), "keys": [], "include": []},
+        )
+        if included:
+            entry["include"].append(col)
+        elif key_ordinal:
+            entry["keys"].append(f"{col} {'DESC' if desc else 'ASC'}")
+    # Clustered index first: nonclustered indexes are built on top of it
+    return sorted(indexes.values(), key=lambda idx: not idx["clustered"]), None
+
+
+def get_switch_plan(
+    cursor,
+    target_table: str,
+    start: str,
+    end: str,
+    staging_suffix: str,
+) -> Tuple[Optional[SwitchPlan], Optional[str]]:
+    """
+    Resolve the partition that [start, end) maps to.
+
+    Returns:
+        (plan, None) when the range can be switched, else (None, reason)
+    """
+    cursor.execute(
+        """
+        SELECT pf.function_id, pf.name, pf.boundary_value_on_right, ps.name, ps.data_space_id, c.name
+        FROM sys.indexes i
+        JOIN sys.partition_schemes ps ON ps.data_space_id = i.data_space_id
+        JOIN sys.partition_functions pf ON pf.function_id = ps.function_id
+        JOIN sys.index_columns ic ON ic.object_id = i.object_id AND ic.index_id = i.index_id AND ic.partition_ordinal = 1
+        JOIN sys.columns c ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+        WHERE i.object_id = OBJECT_ID(?) AND i.index_id IN (0, 1)
+        """,
+        target_table,
+    )
+    row = cursor.fetchone()
+    if not row:
+        return None, "table is not partitioned"
+    function_id, function_name, range_right, scheme_name, scheme_id, partition_column = row
+    if not range_right:
+        return None, f"partition function {function_name} is RANGE LEFT (RANGE RIGHT required)"
+
+    cursor.execute(
+        "SELECT boundary_id, value FROM sys.partition_range_values WHERE function_id = ? ORDER BY boundary_id",
+        function_id,
+    )
+    boundaries = [(boundary_id, _as_datetime(value)) for boundary_id, value in cursor.fetchall()]
+    start_dt, end_dt = _as_datetime(start), _as_datetime(end)
+    # RANGE RIGHT: partition N holds [boundary N-1, boundary N)
+    for (lower_id, lower), (_, upper) in zip(boundaries, boundaries[1:]):
+        if lower == start_dt and upper == end_dt:
+            partition_number = lower_id + 1
+            break
+    else:
+        return None, f"range {start}..{end} is not exactly one partition of {function_name}"
+
+    cursor.execute(
+        """
+        SELECT ds.name
+        FROM sys.partition_schemes ps
+        JOIN sys.destination_data_spaces dds ON dds.partition_scheme_id = ps.data_space_id
+        JOIN sys.data_spaces ds ON ds.data_space_id = dds.data_space_id
+        WHERE ps.name = ? AND dds.destination_id = ?
+        """,
+        scheme_name,
+        partition_number,
+    )
+    filegroup_row = cursor.fetchone()
+    if not filegroup_row:
+        return None, f"no filegroup for partition {partition_number} of {scheme_name}"
+
+    indexes, reason = _load_indexes(cursor, target_table, scheme_id)
+    if reason:
+        return None, reason
+
+    staging_table = f"{target_table}__switch_{staging_suffix}"
+    return (
+        SwitchPlan(
+            target_table,
+            staging_table,
+            partition_number,
+            filegroup_row[0],
+            partition_column,
+            start,
+            end,
+            indexes,
+        ),
+        None,
+    )
+
+
+def drop_staging_table(cursor, plan: SwitchPlan) -> None:
+    """Drops the staging table and any tvp table types created for it (tt_<staging>, tt_<staging>_<hash>)."""
+    cursor.execute(f"IF OBJECT_ID('{plan.staging_table}', 'U') IS NOT NULL DROP TABLE {plan.staging_table}")
+    type_prefix = f"tt_{plan.staging_table.split('.')[-1]}"
+    cursor.execute(
+        """
+        SELECT SCHEMA_NAME(schema_id), name FROM sys.types
+        WHERE is_table_type = 1 AND (name = ? OR LEFT(name, LEN(?) + 1) = ? + '_')
+        """,
+        type_prefix,
+        type_prefix,
+        type_prefix,
+    )
+    for schema_name, type_name in cursor.fetchall():
+        cursor.execute(f"DROP TYPE [{schema_name}].[{type_name}]")
+
+
+def create_staging_table(cursor, plan: SwitchPlan, column_list: str) -> None:
+    """Empty heap with the target's columns on the partition's filegroup, constrained to the range."""
+    drop_staging_table(cursor, plan)
+    cursor.execute(
+        f"SELECT TOP 0 {column_list} INTO {plan.staging_table} ON [{plan.filegroup}] FROM {plan.target_table}"
+    )
+    # Literal bounds: constraint definitions cannot be parameterized
+    start_literal = plan.start.replace("'", "''")
+    end_literal = plan.end.replace("'", "''")
+    cursor.execute(
+        f"ALTER TABLE {plan.staging_table} WITH CHECK ADD CONSTRAINT CK_{plan.staging_table.split('.')[-1]}_range "
+        f"CHECK ({plan.partition_column} IS NOT NULL AND {plan.partition_column} >= '{start_literal}' "
+        f"AND {plan.partition_column} < '{end_literal}')"
+    )
+
+
+def build_staging_indexes(cursor, plan: SwitchPlan) -> None:
+    """Create the target's indexes on the loaded staging table (required for SWITCH)."""
+    for index in plan.indexes:
+        kind = "CLUSTERED" if index["clustered"] else "NONCLUSTERED"
+        unique = "UNIQUE " if index["unique"] else ""
+        include = f" INCLUDE ({', '.join(index['include'])})" if index["include"] else ""
+        cursor.execute(
+            f"CREATE {unique}{kind} INDEX {index['name']} ON {plan.staging_table} "
+            f"({', '.join(index['keys'])}){include} ON [{plan.filegroup}]"
+        )
+
+
+def switch_in(cursor, plan: SwitchPlan) -> None:
+    """Replace the target partition with the staging table (caller commits)."""
+    cursor.execute(f"TRUNCATE TABLE {plan.target_table} WITH (PARTITIONS ({plan.partition_number}))")
+    cursor.execute(f"ALTER TABLE {plan.staging_table} SWITCH TO {plan.target_table} PARTITION {plan.partition_number}")
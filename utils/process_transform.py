@@ -0,0 +1,301 @@
+"""
+Process-pool chunk transformation (--transform-mode process).
+
+Threads parallelise the database I/O, but chunk transformation holds the GIL,
+so twelve month workers share one core for it. In process mode each chunk's
+CPU work runs in a shared ProcessPoolExecutor. Threads still own every
+connection.
+
+Chunks cross the process boundary as Arrow IPC streams in shared memory.
+Only segment names and sizes are pickled, never row lists:
+
+1. The parent (the month's transform thread) serialises the fetched Arrow
+   batch into an input segment. It also allocates an output segment, because
+   on Windows a segment disappears when its creator closes it.
+2. The worker maps the input zero-copy and runs the columnar conversion
+   (RowConverter.prepare: datetime clamping/rounding, NaN -> NULL). Then:
+   - for the bcp loader, it renders the character-mode data file itself
+     (write_bcp_file). This is the most CPU-heavy step, and the writer thread
+     only runs bcp on the file;
+   - otherwise, it writes the converted columns back into the output segment.
+     The parent then builds the row tuples pyodbc needs. Those have to exist in
+     the writer's process, so tuple building stays behind the GIL.
+3. If the converted chunk does not fit the output segment, the parent
+   converts that chunk in-thread (counted as a fallback).
+
+Workers are started with the "spawn" method on every platform, so forking a
+process with live pipeline threads and ODBC handles never happens.
+
+Process mode is only used with the bcp loader (resolve_transform_mode). Without
+bcp rendering the IPC round trip plus in-parent tuple building is slower than
+converting in-thread: scripts/benchmark_transform_modes.py measured x0.71
+(process vs thread) without --render-bcp and x1.05 with it.
+"""
+
+import atexit
+import os
+import sys
+import tempfile
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import polars as pl
+import pyarrow as pa
+
+from utils.loaders import write_bcp_file
+from utils.row_converter import RowConverter, compile_row_converter
+
+TRANSFORM_MODES = ("thread", "process")
+# Loaders whose transform stage gains from process mode (the workers render their files)
+PROCESS_TRANSFORM_LOADERS = ("bcp",)
+
+# Output segment = input size * ratio + slack (converted columns rarely grow)
+_OUTPUT_SIZE_RATIO = 1.5
+_OUTPUT_SIZE_SLACK = 1024 * 1024
+
+
+class RenderedBcpChunk:
+    """A chunk a worker already wrote as a bcp data file; the writer passes it to BcpLoader.load_file()."""
+
+    __slots__ = ("path", "row_count")
+
+    def __init__(self, path: str, row_count: int):
+        self.path = path
+        self.row_count = row_count
+
+    def __len__(self) -> int:
+        return self.row_count
+
+    def discard(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+# -- worker process side ---------------------------------------------------------
+
+_WORKER_CONVERTERS: Dict[Tuple[str, Tuple[str, ...]], RowConverter] = {}
+
+
+def _worker_converter(schema_entry: dict) -> RowConverter:
+    key = (schema_entry.get("name", ""), tuple(col["name"] for col in schema_entry["columns"]))
+    converter = _WORKER_CONVERTERS.get(key)
+    if converter is None:
+        converter = _WORKER_CONVERTERS[key] = compile_row_converter(schema_entry)
+    return converter
+
+
+def _close_attached(shm: SharedMemory) -> None:
+    try:
+        shm.close()
+    except BufferError:
+        # An exception traceback still references the mapped Arrow buffers; the parent unlinks it
+        pass
+
+
+def _transform_chunk(
+    schema_entry: dict,
+    columns: List[str],
+    input_name: str,
+    input_size: int,
+    output_name: Optional[str],
+    bcp_dir: Optional[str],
+):
+    """
+    Runs in a worker. Returns ("bcp", path, rows), ("arrow", size, rows) or
+    ("overflow", needed_size, rows).
+    """
+    input_shm = SharedMemory(name=input_name)
+    try:
+        return _transform_mapped(schema_entry, columns, input_shm, input_size, output_name, bcp_dir)
+    finally:
+        _close_attached(input_shm)
+
+
+def _transform_mapped(schema_entry, columns, input_shm, input_size, output_name, bcp_dir):
+    # Separate frame: every Arrow/Polars view of the input is gone when this returns
+    table = pa.ipc.open_stream(pa.py_buffer(input_shm.buf)[:input_size]).read_all()
+    prepared = _worker_converter(schema_entry).prepare(table, columns)
+    row_count = prepared.height
+
+    if bcp_dir:
+        handle, path = tempfile.mkstemp(prefix="bcp_", suffix=".dat", dir=bcp_dir)
+        os.close(handle)
+        try:
+            write_bcp_file(prepared.iter_rows(), path)
+        except Exception:
+            os.remove(path)
+            raise
+        return "bcp", path, row_count
+
+    sink = pa.BufferOutputStream()
+    converted = prepared.to_arrow()
+    with pa.ipc.new_stream(sink, converted.schema) as writer:
+        writer.write_table(converted)
+    payload = sink.getvalue()
+    output_shm = SharedMemory(name=output_name)
+    try:
+        if payload.size > output_shm.size:
+            return "overflow", payload.size, row_count
+        output_shm.buf[: payload.size] = memoryview(payload).cast("B")
+    finally:
+        _close_attached(output_shm)
+    return "arrow", payload.size, row_count
+
+
+# -- parent side -------------------------------------------------------------------
+
+
+def _to_shared_memory(table: pa.Table) -> Tuple[SharedMemory, int]:
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    payload = sink.getvalue()
+    shm = SharedMemory(create=True, size=max(1, payload.size))
+    shm.buf[: payload.size] = memoryview(payload).cast("B")
+    return shm, payload.size
+
+
+def _release(shm: Optional[SharedMemory]) -> None:
+    if shm is not None:
+        shm.close()
+        shm.unlink()
+
+
+class ProcessTransformPool:
+    """Shared ProcessPoolExecutor for chunk transformation, plus handoff statistics."""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=get_context("spawn"))
+        self._lock = threading.Lock()
+        self.chunks = 0
+        self.fallbacks = 0
+        self.bytes_shared = 0
+
+    def submit(self, schema_entry: dict, batch, columns: Sequence[str], render_bcp: bool = False) -> "PendingChunk":
+        """Start transforming one Arrow batch; resolve it with PendingChunk.result()."""
+        table = batch if isinstance(batch, pa.Table) else pa.Table.from_batches([batch])
+        input_shm, input_size = _to_shared_memory(table)
+        output_shm = None
+        try:
+            if not render_bcp:
+                output_shm = SharedMemory(
+                    create=True, size=int(input_size * _OUTPUT_SIZE_RATIO) + _OUTPUT_SIZE_SLACK
+                )
+            future = self._executor.submit(
+                _transform_chunk,
+                schema_entry,
+                list(columns),
+                input_shm.name,
+                input_size,
+                output_shm.name if output_shm else None,
+                tempfile.gettempdir() if render_bcp else None,
+            )
+        except BaseException:
+            _release(input_shm)
+            _release(output_shm)
+            raise
+        with self._lock:
+            self.chunks += 1
+            self.bytes_shared += input_size
+        return PendingChunk(self, schema_entry, table, list(columns), input_shm, output_shm, future)
+
+    def summary(self) -> str:
+        return (
+            f"{self.chunks:,} chunk(s) on {self.max_workers} process(es), "
+            f"{self.bytes_shared / 1048576:,.0f}MB via shared memory, {self.fallbacks} in-thread fallback(s)"
+        )
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+class PendingChunk:
+    """One submitted chunk. result() returns row tuples or a RenderedBcpChunk, and frees the segments."""
+
+    def __init__(self, pool, schema_entry, table, columns, input_shm, output_shm, future: Future):
+        self._pool = pool
+        self._schema_entry = schema_entry
+        self._table = table
+        self._columns = columns
+        self._input_shm = input_shm
+        self._output_shm = output_shm
+        self._future = future
+
+    def _free(self) -> None:
+        self._table = None
+        _release(self._input_shm)
+        _release(self._output_shm)
+        self._input_shm = self._output_shm = None
+
+    def result(self):
+        try:
+            kind, value, row_count = self._future.result()
+            if kind == "bcp":
+                return RenderedBcpChunk(value, row_count)
+            if kind == "arrow":
+                return self._read_rows(value)
+            with self._pool._lock:
+                self._pool.fallbacks += 1
+            return compile_row_converter(self._schema_entry).convert(self._table, self._columns)
+        finally:
+            self._free()
+
+    def _read_rows(self, size: int) -> List[tuple]:
+        # Tuples are plain Python objects; no view of the segment outlives this frame
+        converted = pa.ipc.open_stream(pa.py_buffer(self._output_shm.buf)[:size]).read_all()
+        return pl.from_arrow(converted).rows()
+
+    def cancel(self) -> None:
+        """Drop an unneeded chunk (pipeline shutdown), including a bcp file already rendered for it."""
+        if self._input_shm is None:
+            return
+        if self._future.cancel():
+            self._free()
+            return
+        try:
+            outcome = self.result()
+        except Exception:  # pylint: disable=broad-except
+            return
+        if isinstance(outcome, RenderedBcpChunk):
+            outcome.discard()
+
+
+_POOL: Optional[ProcessTransformPool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def resolve_transform_mode(mode: str, loader: str) -> str:
+    """Process mode only pays off when workers render bcp files; other loaders fall back to threads."""
+    if mode not in TRANSFORM_MODES:
+        raise ValueError(f"Unknown transform mode {mode!r}; expected one of {', '.join(TRANSFORM_MODES)}")
+    if mode == "process" and loader not in PROCESS_TRANSFORM_LOADERS:
+        print(
+            f"[WARN] --transform-mode process needs --loader bcp (got {loader}); converting chunks in threads",
+            file=sys.stderr,
+        )
+        return "thread"
+    return mode
+
+
+def get_transform_pool(max_workers: Optional[int] = None) -> ProcessTransformPool:
+    """Process-wide pool, created on first use (later max_workers values are ignored)."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ProcessTransformPool(max_workers)
+        return _POOL
+
+
+def shutdown_transform_pool() -> None:
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.shutdown()
+
+
+atexit.register(shutdown_transform_pool)
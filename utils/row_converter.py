@@ -0,0 +1,404 @@
+"""
+Precompiled per-table row converters for pyodbc executemany.
+
+compile_row_converter() takes a load_schema() entry and resolves the per-column
+conversion once (datetime clamping/rounding, NaN -> NULL, numpy/pandas scalars ->
+native Python, binary normalisation). The returned RowConverter turns a whole
+batch into insert-ready tuples in a single pass:
+
+- Arrow batches and Polars frames go through native Polars expressions, and
+  Polars builds the tuples.
+- pandas DataFrames go through one specialised function per column, and the
+  tuples are built with zip().
+
+normalize_nulls() is the vectorized NaN/NaT -> NULL stage run before conversion:
+sentinels are folded into Arrow validity bitmaps, so nothing but None reaches
+pyodbc, and the number of values nulled per column is reported.
+"""
+
+import math
+import sys
+import threading
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+import polars as pl
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# SQL Server DATETIME range limits
+DATETIME_MIN = datetime(1753, 1, 1, 0, 0, 0)
+DATETIME_MAX = datetime(9999, 12, 31, 23, 59, 59)
+
+# Only DATETIME/DATE get range clamping and 1/300s rounding (as in prepare_data_for_sql)
+_DATETIME_TYPES = {"datetime", "date"}
+_FLOAT_TYPES = {"decimal", "numeric", "float", "real", "money", "smallmoney"}
+_BINARY_TYPES = {"timestamp", "binary", "varbinary", "image"}
+
+# Polars select plans shared by every converter in the process, keyed by
+# ((column, Polars dtype, SQL type), ...): a converter compiled per month task
+# reuses the plan instead of rebuilding the expressions for its first chunk
+_POLARS_PLANS: Dict[tuple, List[pl.Expr]] = {}
+_POLARS_PLANS_LOCK = threading.Lock()
+
+
+def round_to_datetime_precision(dt: datetime) -> datetime:
+    """
+    Round datetime to SQL Server DATETIME precision.
+
+    DATETIME has precision of 1/300 second (approximately 3.33ms).
+    This function rounds microseconds to the nearest 1/300 second increment.
+
+    Example:
+    - 123456 microseconds → rounds to nearest 3333 microsecond increment
+    - Result: datetime with microseconds rounded to valid DATETIME precision
+    """
+    if dt.microsecond == 0:
+        return dt
+
+    # DATETIME precision: 1/300 second = 3333.33... microseconds
+    # Round to nearest 3333 microsecond increment
+    increment = 1000000 / 300  # Approximately 3333.33 microseconds
+    rounded_microseconds = round(dt.microsecond / increment) * increment
+
+    # Ensure we don't exceed 999999 microseconds
+    if rounded_microseconds >= 1000000:
+        # Round up to next second, reset microseconds to 0
+        return dt.replace(microsecond=0) + timedelta(seconds=1)
+
+    # Round to integer microseconds
+    rounded_microseconds = int(rounded_microseconds)
+
+    return dt.replace(microsecond=rounded_microseconds)
+
+
+def datetime_expr(col_name: str, dtype: pl.DataType, is_date: bool) -> pl.Expr:
+    """
+    Native-expression datetime conversion for a whole column.
+
+    Strings are parsed with the same format precedence as the row helpers, values
+    outside the SQL Server DATETIME range become null, and datetimes are rounded
+    to 1/300s using integer arithmetic so results match Python's round() exactly.
+    """
+    col = pl.col(col_name)
+    if dtype == pl.Utf8:
+        s_val = col.str.strip_chars()
+        dt = (
+            pl.when(s_val.str.len_chars() == 0)
+            .then(None)
+            .when((s_val.str.len_chars() == 19) & (s_val.str.slice(10, 1) == " "))
+            .then(s_val.str.strptime(pl.Datetime("us"), "%Y-%m-%d %H:%M:%S", strict=False))
+            .when((s_val.str.len_chars() == 10) & s_val.str.contains("-", literal=True))
+            .then(s_val.str.strptime(pl.Datetime("us"), "%Y-%m-%d", strict=False))
+            .otherwise(s_val.str.to_datetime(time_unit="us", strict=False))
+        )
+    elif dtype == pl.Date or isinstance(dtype, pl.Datetime):
+        dt = col.cast(pl.Datetime("us"))
+    else:
+        # Anything else (numbers, NaN, binary) has no datetime meaning -> NULL
+        return pl.lit(None, dtype=pl.Date if is_date else pl.Datetime("us"))
+
+    dt = pl.when((dt < DATETIME_MIN) | (dt > DATETIME_MAX)).then(None).otherwise(dt)
+    if is_date:
+        return dt.dt.date()
+
+    # Round microseconds to the nearest 1/300s tick (round-half-even, like round()).
+    # tick = us * 300 / 1e6 = us * 3 / 10000; tick * 1e6 / 300 = tick * 10000 // 3
+    micros = dt.dt.microsecond().cast(pl.Int64)
+    scaled = micros * 3
+    base_tick = scaled // 10000
+    remainder = scaled % 10000
+    round_up = (remainder > 5000) | ((remainder == 5000) & (base_tick % 2 == 1))
+    tick = base_tick + round_up.cast(pl.Int64)
+    rounded_micros = tick * 10000 // 3
+    return dt - pl.duration(microseconds=micros) + pl.duration(microseconds=rounded_micros)
+
+
+def polars_column_expr(col_name: str, dtype: pl.DataType, sql_type: str) -> pl.Expr:
+    """Expression that makes one Polars column insert-ready for its SQL type."""
+    if sql_type in _DATETIME_TYPES:
+        return datetime_expr(col_name, dtype, sql_type == "date").alias(col_name)
+    if dtype in (pl.Float32, pl.Float64):
+        # sanitize NaN -> None
+        return pl.col(col_name).fill_nan(None).alias(col_name)
+    # Polars already yields native Python scalars (and bytes for Binary) on .rows()
+    return pl.col(col_name)
+
+
+def _is_missing(val) -> bool:
+    """True for None, float NaN and pandas NaT/NA."""
+    if val is None or val is pd.NaT or val is pd.NA:
+        return True
+    try:
+        return bool(val != val)
+    except (TypeError, ValueError):
+        return False
+
+
+def _parse_datetime_string(s_val: str) -> Optional[datetime]:
+    s_val = s_val.strip()
+    if not s_val:
+        return None
+    try:
+        if len(s_val) == 19 and s_val[10] == " ":
+            return datetime.strptime(s_val, "%Y-%m-%d %H:%M:%S")
+        if len(s_val) == 10 and "-" in s_val:
+            return datetime.strptime(s_val, "%Y-%m-%d")
+        parsed = pd.to_datetime(s_val)
+        if pd.isna(parsed):
+            return None
+        return parsed.to_pydatetime()
+    except (ValueError, TypeError):
+        return None
+
+
+def _arrow_nan_to_null(column, counts: Dict[str, int], col_name: str):
+    """Replace float NaN with null in one Arrow column (validity bitmap, no Python loop)."""
+    if not pa.types.is_floating(column.type):
+        return column
+    nan_mask = pc.is_nan(column)
+    nan_count = pc.sum(nan_mask).as_py() or 0
+    if not nan_count:
+        return column
+    counts[col_name] = counts.get(col_name, 0) + nan_count
+    return pc.if_else(nan_mask, pa.scalar(None, type=column.type), column)
+
+
+def _pandas_sentinel_counts(frame: pd.DataFrame) -> Dict[str, int]:
+    """Count NaN/NaT/NA per column (None in object columns is already NULL and not counted)."""
+    counts: Dict[str, int] = {}
+    for col_name in frame.columns:
+        series = frame[col_name]
+        missing = series.isna().to_numpy()
+        if series.dtype == object:
+            values = series.to_numpy()
+            missing &= ~(values == None)  # noqa: E711 (elementwise identity test on object arrays)
+        count = int(missing.sum())
+        if count:
+            counts[col_name] = count
+    return counts
+
+
+def normalize_nulls(
+    data: Union[pa.RecordBatch, pa.Table, pd.DataFrame],
+) -> Tuple[Union[pa.RecordBatch, pa.Table, pd.DataFrame], Dict[str, int]]:
+    """
+    Vectorized NaN/NaT -> NULL normalization.
+
+    Arrow input: NaN in floating columns is moved into the validity bitmap
+    (Arrow temporal columns cannot hold NaT).
+    pandas input: converted to an Arrow table, which maps NaN/NaT/NA to nulls; if
+    the frame cannot be represented in Arrow (mixed object columns), sentinels are
+    replaced with None column-wise instead and a pandas frame is returned.
+
+    Returns:
+        (normalized data, {column: values nulled}) - only columns with nulled values
+    """
+    if isinstance(data, pd.DataFrame):
+        counts = _pandas_sentinel_counts(data)
+        try:
+            table = pa.Table.from_pandas(data, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError, TypeError, ValueError):
+            if not counts:
+                return data, counts
+            frame = data.copy()
+            for col_name in counts:
+                frame[col_name] = frame[col_name].astype(object).where(frame[col_name].notna(), None)
+            return frame, counts
+        # from_pandas already nulls NaN; this only guards float columns it passed through
+        return _normalize_arrow(table, {})[0], counts
+
+    if isinstance(data, (pa.RecordBatch, pa.Table)):
+        return _normalize_arrow(data, {})
+    raise TypeError(f"Unsupported batch type for null normalization: {type(data).__name__}")
+
+
+def _normalize_arrow(data, counts: Dict[str, int]):
+    names = data.schema.names
+    columns = [_arrow_nan_to_null(column, counts, name) for name, column in zip(names, data.columns)]
+    if not counts:
+        return data, counts
+    if isinstance(data, pa.Table):
+        return pa.Table.from_arrays(columns, names=names), counts
+    return pa.RecordBatch.from_arrays(columns, names=names), counts
+
+
+def merge_null_counts(total: Dict[str, int], counts: Dict[str, int]) -> None:
+    """Accumulate per-batch normalize_nulls() counters into a running total."""
+    for col_name, count in counts.items():
+        total[col_name] = total.get(col_name, 0) + count
+
+
+def report_null_counts(table_name: str, counts: Dict[str, int]) -> None:
+    """Print the per-column NaN/NaT -> NULL counters collected by normalize_nulls()."""
+    if not counts:
+        return
+    total = sum(counts.values())
+    detail = ", ".join(f"{col_name}={count:,}" for col_name, count in sorted(counts.items()))
+    print(f"[INFO] {table_name}: normalized {total:,} NaN/NaT value(s) to NULL ({detail})", file=sys.stderr)
+
+
+class RowConverter:
+    """Insert-ready tuple builder for one table, compiled from its schema entry."""
+
+    def __init__(self, schema_entry: dict):
+        self.table_name = schema_entry.get("name", "")
+        self.columns: List[str] = [col["name"] for col in schema_entry["columns"]]
+        self.column_types: Dict[str, str] = {
+            col["name"]: (col.get("type") or "").lower() for col in schema_entry["columns"]
+        }
+        # Values nulled because they fell outside the DATETIME range (pandas path)
+        self.out_of_range_nulled: Dict[str, int] = {}
+        self._cell_converters: Dict[str, Callable] = {
+            col_name: self._build_cell_converter(col_name, col_type)
+            for col_name, col_type in self.column_types.items()
+        }
+
+    # -- per-cell converters (pandas path), resolved once per column ---------------
+
+    def _build_cell_converter(self, col_name: str, col_type: str) -> Callable:
+        if col_type in _DATETIME_TYPES:
+            is_date = col_type == "date"
+            counts = self.out_of_range_nulled
+
+            def convert_datetime(val):
+                if _is_missing(val):
+                    return None
+                if isinstance(val, pd.Timestamp):
+                    dt = val.to_pydatetime()
+                elif isinstance(val, datetime):
+                    dt = val
+                elif isinstance(val, date):
+                    dt = datetime.combine(val, datetime.min.time())
+                elif isinstance(val, str):
+                    dt = _parse_datetime_string(val)
+                    if dt is None:
+                        return None
+                else:
+                    return None
+                if dt < DATETIME_MIN or dt > DATETIME_MAX:
+                    counts[col_name] = counts.get(col_name, 0) + 1
+                    return None
+                if is_date:
+                    return dt.date()
+                return round_to_datetime_precision(dt)
+
+            return convert_datetime
+
+        if col_type in _FLOAT_TYPES:
+
+            def convert_number(val):
+                if val is None or val is pd.NA:
+                    return None
+                if hasattr(val, "item"):
+                    val = val.item()
+                if isinstance(val, float) and math.isnan(val):
+                    return None
+                return val
+
+            return convert_number
+
+        if col_type in _BINARY_TYPES:
+
+            def convert_binary(val):
+                if _is_missing(val):
+                    return None
+                if isinstance(val, (memoryview, bytearray)):
+                    return bytes(val)
+                return val
+
+            return convert_binary
+
+        def convert_plain(val):
+            if val is None or val is pd.NaT or val is pd.NA:
+                return None
+            if hasattr(val, "item"):
+                try:
+                    val = val.item()
+                except (ValueError, TypeError):
+                    pass
+            if isinstance(val, float) and math.isnan(val):
+                return None
+            return val
+
+        return convert_plain
+
+    # -- batch conversion ------------------------------------------------------------
+
+    def _polars_prepare(self, frame: pl.DataFrame, columns: Sequence[str]) -> pl.DataFrame:
+        plan_key = tuple((name, frame.schema[name], self.column_types.get(name, "")) for name in columns)
+        with _POLARS_PLANS_LOCK:
+            exprs = _POLARS_PLANS.get(plan_key)
+            if exprs is None:
+                exprs = _POLARS_PLANS[plan_key] = [
+                    polars_column_expr(name, dtype, sql_type) for name, dtype, sql_type in plan_key
+                ]
+        return frame.select(exprs)
+
+    def _polars_rows(self, frame: pl.DataFrame, columns: Sequence[str]) -> List[tuple]:
+        return self._polars_prepare(frame, columns).rows()
+
+    def prepare(self, batch, columns: Optional[Sequence[str]] = None) -> pl.DataFrame:
+        """
+        Columnar half of convert(): the insert-ready columns as a Polars frame, before
+        tuples are built (convert(batch) == prepare(batch).rows() for Arrow/Polars input).
+        """
+        columns = list(columns) if columns is not None else self.columns
+        frame = pl.from_arrow(batch) if isinstance(batch, (pa.RecordBatch, pa.Table)) else batch
+        if not isinstance(frame, pl.DataFrame):
+            raise TypeError(f"Unsupported batch type for columnar preparation: {type(batch).__name__}")
+        return self._polars_prepare(frame, columns)
+
+    def _pandas_rows(self, frame: pd.DataFrame, columns: Sequence[str]) -> List[tuple]:
+        converted = []
+        for name in columns:
+            series = frame[name]
+            values = series.tolist()
+            kind = series.dtype.kind
+            col_type = self.column_types.get(name, "")
+            # Integer/bool numpy columns already become native ints/bools via tolist()
+            if kind in "iub" and col_type not in _DATETIME_TYPES:
+                converted.append(values)
+                continue
+            converter = self._cell_converters.get(name) or self._build_cell_converter(name, col_type)
+            converted.append([converter(v) for v in values])
+        return list(zip(*converted))
+
+    def convert(self, batch, columns: Optional[Sequence[str]] = None) -> List[tuple]:
+        """
+        Convert a batch to tuples in insert column order.
+
+        Args:
+            batch: pyarrow RecordBatch/Table, Polars DataFrame or pandas DataFrame
+            columns: column order for the tuples (defaults to the schema order)
+        """
+        columns = list(columns) if columns is not None else self.columns
+        if isinstance(batch, (pa.RecordBatch, pa.Table)):
+            if batch.num_rows == 0:
+                return []
+            return self._polars_rows(pl.from_arrow(batch), columns)
+        if isinstance(batch, pl.DataFrame):
+            if batch.is_empty():
+                return []
+            return self._polars_rows(batch, columns)
+        if isinstance(batch, pd.DataFrame):
+            if batch.empty:
+                return []
+            return self._pandas_rows(batch, columns)
+        raise TypeError(f"Unsupported batch type for row conversion: {type(batch).__name__}")
+
+    def report_out_of_range(self) -> None:
+        """Print (and reset) the out-of-range datetime counters, like prepare_data_for_sql did."""
+        for col_name, count in sorted(self.out_of_range_nulled.items()):
+            print(
+                f"[WARN] {col_name}: Converted {count} placeholder date(s) "
+                f"(out of DATETIME range {DATETIME_MIN.date()} to {DATETIME_MAX.date()}) to NULL",
+                file=sys.stderr,
+            )
+        self.out_of_range_nulled.clear()
+
+
+def compile_row_converter(schema_entry: dict) -> RowConverter:
+    """Compile the insert-ready row converter for a load_schema() entry."""
+    return RowConverter(schema_entry)
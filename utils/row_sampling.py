@@ -0,0 +1,111 @@
+"""
+Row sampling and batched fetch for source vs replica spot checks.
+
+``ORDER BY NEWID()`` scans and sorts the whole table to draw a handful of keys,
+and fetching each sampled row with its own query costs one round trip per key
+and side. Here:
+
+- sample_keys() draws keys without a sort:
+  - "modulo": ``(CHECKSUM(key) & 0x7fffffff) % m = r`` for a random residue r,
+    with m sized from the row count so that the filter alone lets about
+    OVERSAMPLE * ``sample_size`` rows through. For int IDs CHECKSUM is the
+    value itself, so this is an ID-modulo sample spread evenly over the table.
+    The mask keeps the value non-negative; ABS() overflows on -2147483648.
+  - "tablesample": ``TABLESAMPLE SYSTEM (p PERCENT)``, which reads only a
+    random set of pages. It is cheaper on huge tables, but the rows come in
+    page-sized clusters.
+
+  There is no TOP: without ORDER BY it would keep the first rows in scan
+  order, i.e. the low end of the clustered key. The qualifying keys are all
+  fetched and ``sample_size`` of them are drawn at random in Python.
+- fetch_rows_by_keys() reads all sampled rows of one side in one statement: an
+  IN list for up to KEY_BATCH_SIZE keys, otherwise a #temp key table joined on
+  the key column.
+"""
+
+import random
+from typing import Any, Dict, List, Optional, Sequence
+
+SAMPLE_METHODS = ("modulo", "tablesample")
+# Keys per IN list (SQL Server allows 2100 parameters); larger samples use a #temp join
+KEY_BATCH_SIZE = 1000
+# Let this many times the wanted rows through the filter so a skewed residue or page sample still
+# fills the sample; the surplus is dropped at random
+OVERSAMPLE = 2.0
+
+
+def _range_filter(date_column: Optional[str], start_date: Optional[str], end_date: Optional[str]):
+    if not date_column or not start_date:
+        return "", []
+    return f"[{date_column}] >= ? AND [{date_column}] < ?", [start_date, end_date]
+
+
+def sample_keys(
+    cursor,
+    table_sql: str,
+    key_col: str,
+    sample_size: int,
+    row_count: int,
+    date_column: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    method: str = "modulo",
+    seed: Optional[int] = None,
+) -> List[Any]:
+    """Up to ``sample_size`` distinct keys of [start_date, end_date) (whole table without a date column)."""
+    if sample_size <= 0 or row_count <= 0:
+        return []
+    rng = random.Random(seed)
+    where, params = _range_filter(date_column, start_date, end_date)
+    sample_from = table_sql
+    if method == "tablesample":
+        percent = min(100.0, 100.0 * sample_size * OVERSAMPLE / row_count)
+        sample_from = f"{table_sql} TABLESAMPLE SYSTEM ({percent:.6f} PERCENT) REPEATABLE ({rng.randint(1, 2**31 - 1)})"
+    elif method == "modulo":
+        modulus = max(1, int(row_count / (sample_size * OVERSAMPLE)))
+        if modulus > 1:
+            residue = f"(CHECKSUM([{key_col}]) & 0x7fffffff) % {modulus} = {rng.randrange(modulus)}"
+            where = f"{where} AND {residue}" if where else residue
+    else:
+        raise ValueError(f"Unknown sample method {method!r} (expected one of {SAMPLE_METHODS})")
+
+    query = f"SELECT [{key_col}] FROM {sample_from}"
+    if where:
+        query += f" WHERE {where}"
+    cursor.execute(query, *params)
+    keys = list(dict.fromkeys(row[0] for row in cursor.fetchall()))
+    if len(keys) > sample_size:
+        keys = rng.sample(keys, sample_size)
+    return keys
+
+
+def fetch_rows_by_keys(cursor, table_sql: str, key_col: str, keys: Sequence[Any]) -> Dict[Any, Dict[str, Any]]:
+    """{key: {column: value}} for the given keys, in one statement per side."""
+    keys = list(keys)
+    if not keys:
+        return {}
+    if len(keys) <= KEY_BATCH_SIZE:
+        cursor.execute(
+            f"SELECT * FROM {table_sql} WHERE [{key_col}] IN ({', '.join(['?'] * len(keys))})",
+            *keys,
+        )
+    else:
+        # Typed like the key column, so the join compares without conversions
+        # (GROUP BY keeps an IDENTITY property from being copied)
+        cursor.execute("IF OBJECT_ID('tempdb..#sample_keys') IS NOT NULL DROP TABLE #sample_keys")
+        cursor.execute(
+            f"SELECT TOP 0 [{key_col}] AS sample_key INTO #sample_keys FROM {table_sql} GROUP BY [{key_col}]"
+        )
+        cursor.fast_executemany = True
+        cursor.executemany("INSERT INTO #sample_keys (sample_key) VALUES (?)", [(key,) for key in keys])
+        cursor.execute(
+            f"SELECT t.* FROM {table_sql} AS t JOIN #sample_keys AS k ON t.[{key_col}] = k.sample_key"
+        )
+    columns = [col[0] for col in cursor.description]
+    rows = {}
+    for row in cursor.fetchall():
+        record = dict(zip(columns, row))
+        rows[record[key_col]] = record
+    if len(keys) > KEY_BATCH_SIZE:
+        cursor.execute("DROP TABLE #sample_keys")
+    return rows
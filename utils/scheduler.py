@@ -0,0 +1,150 @@
+"""
+Cross-table scheduler for source read streams.
+
+Every (table, range) unit of work goes into one queue. The scheduler caps:
+
+- the total number of units running at once, i.e. concurrent source streams
+  against Xilnex;
+- optionally, the units per table. Target inserts into the same table deadlock
+  above ~2 writers.
+
+When a table is at its cap, the next queued unit from another table takes the
+free slot, so small tables fill idle slots while big ones run. After run(),
+report() prints queue wait and slot utilization. Queue wait runs from the start
+of run(), when every queued unit becomes eligible, to the unit's start; time
+spent planning before run() is not counted.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional
+
+
+class ScheduledTask:
+    """One queued unit of work plus its timing."""
+
+    def __init__(self, group: str, key: str, func: Callable, args: tuple, kwargs: Optional[dict] = None):
+        self.group = group
+        self.key = key
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs or {}
+        # Set by run(): when the task became eligible for a slot
+        self.queued_at: Optional[float] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def queue_wait(self) -> float:
+        if self.queued_at is None or self.started_at is None:
+            return 0.0
+        return self.started_at - self.queued_at
+
+    @property
+    def run_time(self) -> float:
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+
+class StreamScheduler:
+    """
+    Single queue with a global concurrency cap and optional per-group caps.
+
+    Args:
+        max_streams: global cap on tasks running at once
+        group_limits: per-group caps, e.g. {"APP_4_SALESITEM": 2}
+        default_group_limit: cap for groups not in group_limits (None = global cap only)
+    """
+
+    def __init__(
+        self,
+        max_streams: int,
+        group_limits: Optional[Dict[str, int]] = None,
+        default_group_limit: Optional[int] = None,
+    ):
+        self.max_streams = max(1, max_streams)
+        self.group_limits = dict(group_limits or {})
+        self.default_group_limit = default_group_limit
+        self.pending: List[ScheduledTask] = []
+        self.completed: List[ScheduledTask] = []
+        self.running_by_group: Dict[str, int] = {}
+        self.peak_running = 0
+        self.wall_time = 0.0
+
+    def submit(self, group: str, key: str, func: Callable, *args, **kwargs) -> ScheduledTask:
+        """Queue func(*args, **kwargs) under a group (table) name."""
+        task = ScheduledTask(group, key, func, args, kwargs)
+        self.pending.append(task)
+        return task
+
+    def _group_limit(self, group: str) -> int:
+        limit = self.group_limits.get(group, self.default_group_limit)
+        return self.max_streams if limit is None else max(1, limit)
+
+    def _next_runnable(self) -> Optional[ScheduledTask]:
+        for idx, task in enumerate(self.pending):
+            if self.running_by_group.get(task.group, 0) < self._group_limit(task.group):
+                return self.pending.pop(idx)
+        return None
+
+    def run(self, on_done: Callable[[ScheduledTask, Any, Optional[BaseException]], None]) -> None:
+        """
+        Run all queued tasks, calling on_done(task, result, error) in this thread
+        as each finishes (so callers can update checkpoints without locking).
+        """
+        start = time.perf_counter()
+        for task in self.pending:
+            task.queued_at = start
+        running: Dict[Any, ScheduledTask] = {}
+
+        def execute(task: ScheduledTask):
+            task.started_at = time.perf_counter()
+            try:
+                return task.func(*task.args, **task.kwargs)
+            finally:
+                task.finished_at = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_streams) as executor:
+            while self.pending or running:
+                while len(running) < self.max_streams:
+                    task = self._next_runnable()
+                    if task is None:
+                        break
+                    self.running_by_group[task.group] = self.running_by_group.get(task.group, 0) + 1
+                    running[executor.submit(execute, task)] = task
+                    self.peak_running = max(self.peak_running, len(running))
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    self.running_by_group[task.group] -= 1
+                    self.completed.append(task)
+                    error = future.exception()
+                    on_done(task, None if error else future.result(), error)
+
+        self.wall_time = time.perf_counter() - start
+
+    def report(self) -> None:
+        """Print queue wait and slot utilization for the last run()."""
+        if not self.completed:
+            return
+        waits = [task.queue_wait for task in self.completed]
+        busy = sum(task.run_time for task in self.completed)
+        capacity = self.max_streams * self.wall_time
+        utilization = (busy / capacity * 100) if capacity else 0.0
+
+        print(f"\n{'='*70}")
+        print("[SCHEDULER] Source stream usage")
+        print(f"{'='*70}")
+        print(f"  Tasks: {len(self.completed)} | Wall time: {self.wall_time:.1f}s | Peak streams: {self.peak_running}/{self.max_streams}")
+        print(f"  Queue wait: avg {sum(waits) / len(waits):.1f}s | max {max(waits):.1f}s")
+        print(f"  Slot utilization: {utilization:.1f}% ({busy:.1f}s busy of {capacity:.1f}s)")
+        groups: Dict[str, List[ScheduledTask]] = {}
+        for task in self.completed:
+            groups.setdefault(task.group, []).append(task)
+        for group, tasks in groups.items():
+            group_busy = sum(task.run_time for task in tasks)
+            group_wait = sum(task.queue_wait for task in tasks) / len(tasks)
+            print(f"    {group:<28} {len(tasks):>4} task(s)  busy {group_busy:8.1f}s  avg wait {group_wait:6.1f}s")
+        print(f"{'='*70}")
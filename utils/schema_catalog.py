@@ -0,0 +1,218 @@
+"""
+Compiled schema catalog: the replica tables' column metadata, parsed once.
+
+load_schema() used to parse the 2.6 MB docs/xilnex_full_schema.json (598
+tables) plus docs/replica_schema.json on every call. Every replicate script,
+verifier and debug tool does that at least once per table. Each month task then
+rebuilt its column list and Arrow schema again. The catalog:
+
+1. compiles the replica tables' entries into a pickle (``cache_path``),
+   together with per-table artifacts (TableArtifacts): column order, column
+   list and the Arrow schema the row converter's Polars plan is prepared for;
+2. validates the pickle against the source files: equal mtime and size is a
+   cache hit; otherwise their SHA-256 is compared, so a touched but unchanged
+   file (git checkout) does not force a rebuild;
+3. keeps the loaded catalog in memory, so later calls in the same process only
+   stat the two files.
+
+A missing, corrupt or stale cache is rebuilt from the JSON. Failing to write it
+(read-only checkout) only costs the parse on the next run.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import sys
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from utils.arrow_fetch import arrow_schema_for
+from utils.row_converter import RowConverter, compile_row_converter
+
+# Bump when the pickled layout or the compiled artifacts change; older caches are then rebuilt
+CATALOG_VERSION = 3
+
+
+@dataclass
+class TableArtifacts:
+    """Everything derived from one table's schema entry, computed at compile time."""
+
+    name: str
+    schema_entry: dict
+    columns: List[str]
+    column_list: str
+    arrow_schema: object
+
+    @classmethod
+    def compile(cls, schema_entry: dict) -> "TableArtifacts":
+        columns = [col["name"] for col in schema_entry["columns"]]
+        return cls(
+            name=schema_entry["name"],
+            schema_entry=schema_entry,
+            columns=columns,
+            column_list=", ".join(columns),
+            arrow_schema=arrow_schema_for(schema_entry),
+        )
+
+    def converter(self) -> RowConverter:
+        """
+        A new RowConverter (its own NULL / out-of-range counters). Its Polars
+        plan for the conformed fetch schema is built once per process and shared.
+        """
+        row_converter = compile_row_converter(self.schema_entry)
+        row_converter.prepare(self.arrow_schema.empty_table())
+        return row_converter
+
+
+def _file_signature(path: Path) -> Tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def parse_schema_files(replica_schema_path: Path, full_schema_path: Path) -> Dict[str, dict]:
+    """Schema entries of the replica tables, read from the JSON files (the slow path)."""
+    # Get table names from replica_schema.json
+    replica_data = json.loads(replica_schema_path.read_text(encoding="utf-8"))
+    table_names = [t["name"] for t in replica_data["tables"]]
+
+    # Load full Xilnex schema
+    full_schema = json.loads(full_schema_path.read_text(encoding="utf-8"))
+
+    # Extract schemas for our tables
+    result = {}
+    for table_name in table_names:
+        full_table_key = f"COM_5013.{table_name}"
+        if full_table_key not in full_schema:
+            # Try to find it
+            for key in full_schema.keys():
+                if key.endswith(f".{table_name}"):
+                    full_table_key = key
+                    break
+            else:
+                print(f"[WARN] Table {table_name} not found in {full_schema_path.name}", file=sys.stderr)
+                continue
+
+        schema_entry = full_schema[full_table_key]
+        # Convert to format expected by rest of code
+        result[table_name] = {
+            "name": table_name,
+            "schema": schema_entry.get("schema", "COM_5013"),
+            "columns": sorted(schema_entry["columns"], key=lambda x: x.get("ordinal_position", 999)),
+        }
+    return result
+
+
+class SchemaCatalog:
+    """Compiled, cached view of the replica schema files."""
+
+    def __init__(self, replica_schema_path: Path, full_schema_path: Path, cache_path: Optional[Path] = None):
+        self.sources = (Path(replica_schema_path), Path(full_schema_path))
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.tables: Dict[str, TableArtifacts] = {}
+        self._signatures: Dict[str, Tuple[int, int]] = {}
+        self._hashes: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def _current(self) -> bool:
+        """Whether the in-memory catalog still matches the source files (stat only)."""
+        return self._loaded and all(
+            self._signatures.get(str(path)) == _file_signature(path) for path in self.sources
+        )
+
+    def _read_cache(self) -> bool:
+        if self.cache_path is None or not self.cache_path.exists():
+            return False
+        try:
+            with self.cache_path.open("rb") as handle:
+                cached = pickle.load(handle)
+        except Exception:  # pylint: disable=broad-except
+            return False
+        if cached.get("version") != CATALOG_VERSION or cached.get("sources") != [str(p) for p in self.sources]:
+            return False
+        rewrite = False
+        for path in self.sources:
+            key = str(path)
+            if cached["signatures"].get(key) == _file_signature(path):
+                continue
+            # Touched (checkout, copy): only a content change invalidates the cache
+            if cached["hashes"].get(key) != _file_hash(path):
+                return False
+            cached["signatures"][key] = _file_signature(path)
+            rewrite = True
+        self.tables = cached["tables"]
+        self._signatures = cached["signatures"]
+        self._hashes = cached["hashes"]
+        if rewrite:
+            self._write_cache()
+        return True
+
+    def _write_cache(self) -> None:
+        if self.cache_path is None:
+            return
+        payload = {
+            "version": CATALOG_VERSION,
+            "sources": [str(p) for p in self.sources],
+            "signatures": self._signatures,
+            "hashes": self._hashes,
+            "tables": self.tables,
+        }
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+            with tmp_path.open("wb") as handle:
+                pickle.dump(payload, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as exc:
+            print(f"[WARN] Could not write schema cache {self.cache_path}: {exc}", file=sys.stderr)
+
+    def _compile(self) -> None:
+        # Signatures first: a file edited during the parse then just looks stale next time
+        self._signatures = {str(path): _file_signature(path) for path in self.sources}
+        self._hashes = {str(path): _file_hash(path) for path in self.sources}
+        entries = parse_schema_files(*self.sources)
+        self.tables = {name: TableArtifacts.compile(entry) for name, entry in entries.items()}
+        self._write_cache()
+
+    def refresh(self) -> "SchemaCatalog":
+        """Make sure the catalog matches the source files (cache, then JSON)."""
+        with self._lock:
+            if not self._current():
+                if not self._read_cache():
+                    self._compile()
+                self._loaded = True
+        return self
+
+    def schema(self) -> Dict[str, dict]:
+        """{table: schema entry}, the load_schema() format (entries are shared; do not mutate)."""
+        self.refresh()
+        return {name: artifacts.schema_entry for name, artifacts in self.tables.items()}
+
+    def table(self, table_name: str) -> TableArtifacts:
+        self.refresh()
+        return self.tables[table_name]
+
+
+_CATALOGS: Dict[Tuple[str, str], SchemaCatalog] = {}
+_CATALOGS_LOCK = threading.Lock()
+
+
+def get_catalog(replica_schema_path: Path, full_schema_path: Path, cache_path: Optional[Path] = None) -> SchemaCatalog:
+    """Process-wide catalog for these schema files (loaded or compiled on first use)."""
+    key = (str(replica_schema_path), str(full_schema_path))
+    with _CATALOGS_LOCK:
+        catalog = _CATALOGS.get(key)
+        if catalog is None:
+            catalog = _CATALOGS[key] = SchemaCatalog(replica_schema_path, full_schema_path, cache_path)
+    return catalog.refresh()